@@ -1,6 +1,7 @@
 from SBMLModel.util import makeSimulationTimes
 from SBMLModel.plotting import plotOneTS, plotManyTS, plotMat
 from SBMLModel.timeseries import Timeseries
+from SBMLModel.simulation_result import SimulationResult
 from SBMLModel.model import Model
 from SBMLModel.rpickle import load, dump
 from SBMLModel.option_manager import OptionManager
@@ -0,0 +1,101 @@
+"""
+Runs simulations from asyncio code without blocking the event loop.
+
+An AsyncSimulator runs functions in a thread or process executor and limits
+the number of concurrent runs with a semaphore. Callers are responsible for
+not sharing a roadrunner between concurrent runs (Model.asimulate runs a copy
+of the model). Cancelling the awaiting task cancels a run that has not
+started; a run that has started completes in its worker and its result is
+discarded.
+
+Usage:
+    simulator = AsyncSimulator(max_concurrency=4)
+    ts = await model.asimulate(0, 10, 100, simulator=simulator)
+"""
+
+import SBMLModel.constants as cn
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+import weakref
+
+
+class AsyncSimulator(object):
+
+    def __init__(self, max_concurrency=cn.ASYNC_MAX_CONCURRENCY,
+          is_process=False):
+        """
+        Parameters
+        ----------
+        max_concurrency: int (maximum number of concurrent runs)
+        is_process: bool (run in processes instead of threads; functions and
+            arguments must be picklable)
+        """
+        self.max_concurrency = max_concurrency
+        self.is_process = is_process
+        self._executor = None
+        # Semaphores are bound to an event loop
+        self._semaphore_dct = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "AsyncSimulator(max_concurrency=%d, is_process=%s)"  \
+              % (self.max_concurrency, str(self.is_process))
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.is_process:
+                    self._executor = concurrent.futures.ProcessPoolExecutor(
+                          max_workers=self.max_concurrency)
+                else:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                          max_workers=self.max_concurrency)
+            return self._executor
+
+    def _getSemaphore(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not loop in self._semaphore_dct:
+                self._semaphore_dct[loop] = asyncio.Semaphore(
+                      self.max_concurrency)
+            return self._semaphore_dct[loop]
+
+    async def run(self, function, *pargs, **kwargs):
+        """
+        Runs a function in the executor.
+
+        Parameters
+        ----------
+        function: Function
+        pargs: list (positional arguments of function)
+        kwargs: dict (keyword arguments of function)
+
+        Returns
+        -------
+        object (value of function)
+        """
+        async with self._getSemaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor,
+                  functools.partial(function, *pargs, **kwargs))
+
+    def shutdown(self, wait=True):
+        """
+        Releases the executor. A later run creates a new executor.
+
+        Parameters
+        ----------
+        wait: bool (wait for runs in progress to complete)
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+# Simulator used by Model if none is specified
+DEFAULT_SIMULATOR = AsyncSimulator()
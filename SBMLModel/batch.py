@@ -0,0 +1,140 @@
+"""
+Simulation of a model for many sets of parameter values.
+
+The model is compiled once. Parameter values are assigned by index into the
+global parameters of the roadrunner, and results are written into a
+preallocated array of shape (num_parameter_set, num_time, num_variable).
+Parameter sets may be divided among processes; each process restores a
+roadrunner from the saved state instead of compiling the model.
+"""
+
+from SBMLModel.make_roadrunner import cloneRoadrunner, callWithClone
+from SBMLModel import parallel
+
+import collections
+import functools
+import numpy as np
+
+BatchResult = collections.namedtuple("BatchResult",
+      ["values", "is_failed", "times", "names", "parameter_names"])
+BatchResult.__doc__ = """
+Result of simulating a batch of parameter sets.
+
+values: np.ndarray (num_parameter_set, num_time, num_variable); nan if failed
+is_failed: np.ndarray-bool (num_parameter_set)
+times: np.ndarray (simulation times)
+names: list-str (variable names)
+parameter_names: list-str
+"""
+
+
+def getParameterIndices(roadrunner, parameter_names):
+    """
+    Finds the indices of global parameters.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    parameter_names: list-str
+
+    Returns
+    -------
+    np.ndarray-int
+    """
+    all_names = list(roadrunner.model.getGlobalParameterIds())
+    missing_names = set(parameter_names).difference(all_names)
+    if len(missing_names) > 0:
+        raise ValueError("Not global parameters: %s" % str(missing_names))
+    return np.array([all_names.index(n) for n in parameter_names],
+          dtype=np.int32)
+
+def simulateParameterSets(roadrunner, parameter_indices, parameter_mat, times,
+      selections, values=None):
+    """
+    Simulates each row of parameter values. The roadrunner is reset
+    before each simulation. Parameters and selections of the roadrunner
+    are changed.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    parameter_indices: np.ndarray-int (indices of global parameters)
+    parameter_mat: np.ndarray (num_parameter_set, num_parameter)
+    times: np.ndarray (times of the results; first is the start time)
+    selections: list-str (roadrunner selections, excluding time)
+    values: np.ndarray (num_parameter_set, num_time, num_selection)
+        array in which results are written
+
+    Returns
+    -------
+    np.ndarray (values)
+    np.ndarray-bool (True if the simulation failed)
+    """
+    parameter_mat = np.asarray(parameter_mat, dtype=float)
+    num_set = parameter_mat.shape[0]
+    if values is None:
+        values = np.empty((num_set, len(times), len(selections)))
+    is_failed = np.repeat(False, num_set)
+    roadrunner.timeCourseSelections = list(selections)
+    for idx in range(num_set):
+        roadrunner.model.setGlobalParameterValues(parameter_indices,
+              parameter_mat[idx, :])
+        roadrunner.reset()
+        try:
+            values[idx, :, :] = roadrunner.simulate(times=times)
+        except RuntimeError:
+            values[idx, :, :] = np.nan
+            is_failed[idx] = True
+    return values, is_failed
+
+def simulateBatch(roadrunner, parameter_names, parameter_mat, times, selections,
+      num_process=1):
+    """
+    Simulates each row of parameter values, optionally in multiple
+    processes. The roadrunner is not changed.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    parameter_names: list-str
+    parameter_mat: np.ndarray (num_parameter_set, num_parameter)
+    times: np.ndarray (times of the results; first is the start time)
+    selections: list-str (roadrunner selections, excluding time)
+    num_process: int (number of processes; None is the number of CPUs)
+
+    Returns
+    -------
+    np.ndarray (num_parameter_set, num_time, num_selection)
+    np.ndarray-bool (num_parameter_set)
+    """
+    parameter_mat = np.array(parameter_mat, dtype=float)
+    if parameter_mat.ndim != 2:
+        raise ValueError("parameter_mat must have 2 dimensions.")
+    if parameter_mat.shape[1] != len(parameter_names):
+        raise ValueError("parameter_mat has %d columns for %d parameters."
+              % (parameter_mat.shape[1], len(parameter_names)))
+    times = np.array(times, dtype=float)
+    parameter_indices = getParameterIndices(roadrunner, parameter_names)
+    num_set = parameter_mat.shape[0]
+    num_process = min(parallel.getNumProcess(num_process), max(1, num_set))
+    state = roadrunner.saveStateS()
+    if num_process == 1:
+        return simulateParameterSets(cloneRoadrunner(None, state=state),
+              parameter_indices, parameter_mat, times, selections)
+    # Divide the parameter sets among processes
+    values = np.empty((num_set, len(times), len(selections)))
+    is_failed = np.repeat(False, num_set)
+    chunk_indices = np.array_split(np.arange(num_set), num_process)
+    function = functools.partial(callWithClone,
+          function=simulateParameterSets, argument_name="parameter_mat",
+          state=state, parameter_indices=parameter_indices, times=times,
+          selections=selections)
+    chunks = [parameter_mat[c, :] for c in chunk_indices]
+    for result in parallel.runTasks(function, chunks, num_process=num_process):
+        indices = chunk_indices[result.index]
+        if result.status == parallel.STATUS_OK:
+            values[indices], is_failed[indices] = result.value
+        else:
+            values[indices] = np.nan
+            is_failed[indices] = True
+    return values, is_failed
@@ -0,0 +1,174 @@
+"""
+Access to the archive of BioModels.
+
+The archive is a zip file of SBML models named by PREFIX. The archive is
+memory mapped and opened once. An index from model number to zip member
+is constructed on open, and the list of excluded models is kept as a set.
+
+Usage:
+    archive = BiomodelArchive()
+    model_str = archive.getModelString(12)
+"""
+
+import SBMLModel.constants as cn
+
+import mmap
+import os
+import pandas as pd
+import re
+import threading
+import zipfile
+
+PREFIX = "BIOMD000000%04d.xml"
+MEMBER_PATTERN = re.compile(r"^BIOMD(\d{10})\.xml$")
+ARCHIVE_PATH = os.path.join(cn.DATA_DIR, cn.BIOMODELS_ZIP_FILENAME)
+EXCLUDE_PATH = os.path.join(cn.DATA_DIR, "biomodels_exclude.csv")
+
+
+class _ArchiveMap(mmap.mmap):
+    # Memory map that zipfile accepts as a file object
+
+    def seekable(self):
+        return True
+
+
+class BiomodelArchive(object):
+
+    def __init__(self, archive_path=ARCHIVE_PATH, exclude_path=EXCLUDE_PATH):
+        """
+        Parameters
+        ----------
+        archive_path: str (path to the zip file of models)
+        exclude_path: str (CSV file whose first column is excluded model numbers)
+        """
+        self.archive_path = archive_path
+        self.exclude_path = exclude_path
+        if exclude_path is None:
+            self.exclude_set = set([])
+        else:
+            exclude_df = pd.read_csv(exclude_path)
+            column = list(exclude_df)[0]
+            self.exclude_set = set([int(v) for v in exclude_df[column].values])
+        self._zipfile = None
+        self._mmap = None
+        self._fd = None
+        self._index_dct = None  # key: model number, value: member name
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "BiomodelArchive(%s)" % self.archive_path
+
+    def _open(self):
+        """
+        Opens the archive and constructs the index if this has not been done.
+        """
+        if self._zipfile is not None:
+            return
+        fd = open(self.archive_path, "rb")
+        try:
+            self._mmap = _ArchiveMap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be memory mapped
+            fd.close()
+            raise
+        self._fd = fd
+        self._zipfile = zipfile.ZipFile(self._mmap)
+        index_dct = {}
+        for name in self._zipfile.namelist():
+            result = MEMBER_PATTERN.match(os.path.basename(name))
+            if result is not None:
+                index_dct[int(result.group(1))] = name
+        self._index_dct = index_dct
+
+    def close(self):
+        """
+        Releases the resources of the archive.
+        """
+        with self._lock:
+            if self._zipfile is not None:
+                self._zipfile.close()
+                self._mmap.close()
+                self._fd.close()
+            self._zipfile = None
+            self._mmap = None
+            self._fd = None
+            self._index_dct = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *pargs):
+        self.close()
+
+    @property
+    def model_nums(self):
+        """
+        Numbers of the models in the archive, including excluded models.
+
+        Returns
+        -------
+        sorted list-int
+        """
+        with self._lock:
+            self._open()
+            return sorted(self._index_dct.keys())
+
+    def isExcluded(self, model_num):
+        return model_num in self.exclude_set
+
+    def getModelBytes(self, model_num):
+        """
+        Provides the content of a model.
+
+        Parameters
+        ----------
+        model_num: int
+
+        Returns
+        -------
+        bytes (None if the model is excluded or not present)
+        """
+        if self.isExcluded(model_num):
+            return None
+        with self._lock:
+            self._open()
+            name = self._index_dct.get(model_num)
+            if name is None:
+                return None
+            return self._zipfile.read(name)
+
+    def getModelString(self, model_num):
+        """
+        Provides the SBML string of a model.
+
+        Parameters
+        ----------
+        model_num: int
+
+        Returns
+        -------
+        str (None if the model is excluded or not present)
+        """
+        model_bytes = self.getModelBytes(model_num)
+        if model_bytes is None:
+            return None
+        if len(model_bytes) == 0:
+            return None
+        return model_bytes.decode()
+
+
+_DEFAULT_ARCHIVE = None
+
+def getDefaultArchive():
+    """
+    Provides the archive of the BioModels in the data directory. The archive
+    is opened once per process.
+
+    Returns
+    -------
+    BiomodelArchive
+    """
+    global _DEFAULT_ARCHIVE
+    if _DEFAULT_ARCHIVE is None:
+        _DEFAULT_ARCHIVE = BiomodelArchive()
+    return _DEFAULT_ARCHIVE
@@ -0,0 +1,100 @@
+"""
+Store of model states at simulation times.
+
+A CheckpointStore holds RoadrunnerState objects keyed by their time so that
+a simulation to a later time can resume from the nearest earlier checkpoint
+instead of simulating from zero. The store is bounded by the number of
+checkpoints and their total size; the least recently used checkpoint is
+evicted first. Checkpoints are only valid for the parameter values with
+which they were simulated, so the owner must clear the store when values change.
+
+Usage:
+    store = CheckpointStore()
+    store.add(RoadrunnerState.capture(roadrunner))
+    state = store.find(time)
+"""
+
+import SBMLModel.constants as cn
+
+import bisect
+import collections
+
+
+class CheckpointStore(object):
+
+    def __init__(self, max_count=cn.CHECKPOINT_MAX_COUNT,
+          max_size=cn.CHECKPOINT_MAX_SIZE):
+        """
+        Parameters
+        ----------
+        max_count: int (maximum number of checkpoints)
+        max_size: int (maximum number of bytes in checkpoints)
+        """
+        self.max_count = max_count
+        self.max_size = max_size
+        # key: time, value: RoadrunnerState (in order of use)
+        self._state_dct = collections.OrderedDict()
+        self._times = []  # sorted times of checkpoints
+        self.size = 0
+
+    def __len__(self):
+        return len(self._state_dct)
+
+    def __repr__(self):
+        return "CheckpointStore(%s)" % str(self._times)
+
+    @property
+    def times(self):
+        return list(self._times)
+
+    def add(self, state):
+        """
+        Adds a checkpoint, replacing a checkpoint at the same time.
+
+        Parameters
+        ----------
+        state: RoadrunnerState
+        """
+        if self.max_count <= 0:
+            return
+        if state.time in self._state_dct:
+            self._remove(state.time)
+        self._state_dct[state.time] = state
+        bisect.insort(self._times, state.time)
+        self.size += state.size
+        while (len(self._state_dct) > self.max_count)  \
+              or ((self.size > self.max_size) and (len(self._state_dct) > 0)):
+            time = next(iter(self._state_dct))
+            self._remove(time)
+
+    def _remove(self, time):
+        state = self._state_dct.pop(time)
+        self._times.remove(time)
+        self.size -= state.size
+
+    def find(self, time):
+        """
+        Finds the checkpoint with the largest time that does not exceed time.
+
+        Parameters
+        ----------
+        time: float
+
+        Returns
+        -------
+        RoadrunnerState (None if there is no such checkpoint)
+        """
+        idx = bisect.bisect_right(self._times, time)
+        if idx == 0:
+            return None
+        found_time = self._times[idx - 1]
+        self._state_dct.move_to_end(found_time)
+        return self._state_dct[found_time]
+
+    def clear(self):
+        """
+        Deletes all checkpoints.
+        """
+        self._state_dct.clear()
+        self._times = []
+        self.size = 0
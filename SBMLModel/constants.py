@@ -151,3 +151,46 @@ for kwargs in [SIM_KWARGS, PLOT_KWARGS, FIG_KWARGS]:
 MS_IN_SEC = 1000
 SEC_IN_MS = 1.0/MS_IN_SEC
 TIMESERIES_INDEX_NAME = "milliseconds"
+# Files in the directory of a saved Timeseries
+TIMESERIES_INDEX_FILE = "index.npy"
+TIMESERIES_VALUES_FILE = "values.npy"
+TIMESERIES_COLUMNS_FILE = "columns.npy"
+
+# Roadrunner cache
+ROADRUNNER_CACHE_DIR = os.environ.get("SBMLMODEL_CACHE_DIR",
+      os.path.join(os.path.expanduser("~"), ".cache", "SBMLModel"))
+ROADRUNNER_CACHE_MAX_SIZE = int(1e9)  # bytes
+IS_ROADRUNNER_CACHE = os.environ.get("SBMLMODEL_CACHE_DISABLE") is None
+ROADRUNNER_CACHE_INTEGRATOR = "cvode"
+
+# Roadrunner pool
+ROADRUNNER_POOL_MAX_SIZE = 20  # Number of models
+IS_ROADRUNNER_POOL = True
+
+# Checkpoints of Model.setTime
+CHECKPOINT_MAX_COUNT = 20
+CHECKPOINT_MAX_SIZE = int(1e8)  # bytes
+
+# Cache of simulation results
+RESULT_CACHE_MAX_SIZE = int(1e8)  # bytes
+
+# Asynchronous simulation
+ASYNC_MAX_CONCURRENCY = os.cpu_count() or 1
+
+# Stochastic ensembles
+ENSEMBLE_CHUNK_SIZE = 100  # Trajectories simulated by a task
+ENSEMBLE_MAX_SAMPLE = 1000  # Trajectories kept to estimate quantiles
+ENSEMBLE_PROBABILITIES = [0.05, 0.5, 0.95]
+
+# Steady states
+STEADY_STATE_TOLERANCE = 1e-6  # Maximum norm of rates of change
+STEADY_STATE_INTEGRATION_TIME = 1000  # Simulation time of the fallback
+
+# Local sensitivities
+SENSITIVITY_RELATIVE_STEP = 1e-2  # Fraction of the parameter value
+SENSITIVITY_ABSOLUTE_STEP = 1e-6  # Minimum step
+
+# Global sensitivity analysis
+GLOBAL_SENSITIVITY_BLOCK_SIZE = 64  # Samples simulated by a task
+GLOBAL_SENSITIVITY_NUM_SAMPLE = 1024  # Base samples for Sobol indices
+GLOBAL_SENSITIVITY_NUM_TRAJECTORY = 20  # Trajectories for Morris effects
@@ -0,0 +1,222 @@
+"""
+Ensembles of stochastic (Gillespie) simulations.
+
+Each trajectory has its own seed, derived from the seed of the ensemble with
+np.random.SeedSequence, so that the ensemble is reproducible regardless of
+how trajectories are divided among processes. Trajectories are simulated in
+chunks; the statistics of the ensemble are updated as each chunk completes.
+Means and variances are exact. Quantiles are calculated from a uniform
+sample of at most max_sample trajectories, and so are exact if the ensemble
+has no more trajectories than that. Keeping all trajectories is optional.
+
+Usage:
+    result = simulateEnsemble(roadrunner, 100, times, selections, seed=1)
+    result.mean  # (num_time, num_variable)
+"""
+
+import SBMLModel.constants as cn
+from SBMLModel.make_roadrunner import cloneRoadrunner, callWithClone
+from SBMLModel import parallel
+
+import collections
+import functools
+import numpy as np
+
+INTEGRATOR = "gillespie"
+
+EnsembleResult = collections.namedtuple("EnsembleResult",
+      ["values", "mean", "variance", "quantiles", "probabilities", "times",
+      "names", "seeds"])
+EnsembleResult.__doc__ = """
+Result of simulating an ensemble of stochastic trajectories.
+
+values: np.ndarray (num_trajectory, num_time, num_variable); None if not kept
+mean: np.ndarray (num_time, num_variable)
+variance: np.ndarray (num_time, num_variable; sample variance)
+quantiles: np.ndarray (num_probability, num_time, num_variable)
+probabilities: list-float (probabilities of the quantiles)
+times: np.ndarray (simulation times)
+names: list-str (variable names)
+seeds: np.ndarray-int (seed of each trajectory)
+"""
+
+
+def makeSeeds(num_trajectory, seed=None):
+    """
+    Constructs the seeds of trajectories.
+
+    Parameters
+    ----------
+    num_trajectory: int
+    seed: int (seed of the ensemble; None is not reproducible)
+
+    Returns
+    -------
+    np.ndarray-int
+    """
+    sequences = np.random.SeedSequence(seed).spawn(num_trajectory)
+    return np.array([s.generate_state(1, dtype=np.uint32)[0]
+          for s in sequences], dtype=np.int64)
+
+
+class EnsembleStatistics(object):
+
+    def __init__(self, probabilities=cn.ENSEMBLE_PROBABILITIES,
+          max_sample=cn.ENSEMBLE_MAX_SAMPLE, rng=None):
+        """
+        Parameters
+        ----------
+        probabilities: list-float (probabilities of the quantiles)
+        max_sample: int (maximum number of trajectories used for quantiles)
+        rng: int/np.random.Generator (selects the trajectories sampled)
+        """
+        self.probabilities = list(probabilities)
+        self.max_sample = max_sample
+        self.num_trajectory = 0
+        self.mean = None
+        self._sum_square = None  # sum of squared deviations from the mean
+        self._sample_arr = None
+        self._rng = np.random.default_rng(rng)
+
+    def __repr__(self):
+        return "EnsembleStatistics(trajectory=%d)" % self.num_trajectory
+
+    @property
+    def variance(self):
+        if self.num_trajectory < 2:
+            return np.zeros_like(self.mean)
+        return self._sum_square/(self.num_trajectory - 1)
+
+    @property
+    def quantiles(self):
+        num_sample = min(self.num_trajectory, self.max_sample)
+        return np.quantile(self._sample_arr[:num_sample], self.probabilities,
+              axis=0)
+
+    def add(self, values):
+        """
+        Updates the statistics with trajectories.
+
+        Parameters
+        ----------
+        values: np.ndarray (num_trajectory, num_time, num_variable)
+        """
+        num_new = values.shape[0]
+        if num_new == 0:
+            return
+        # Combine means and squared deviations of the old and new trajectories
+        new_mean = values.mean(axis=0)
+        new_sum_square = ((values - new_mean)**2).sum(axis=0)
+        if self.mean is None:
+            self.mean = new_mean
+            self._sum_square = new_sum_square
+            self._sample_arr = np.empty((self.max_sample,) + values.shape[1:])
+        else:
+            num_total = self.num_trajectory + num_new
+            delta = new_mean - self.mean
+            self.mean = self.mean + delta*num_new/num_total
+            self._sum_square = self._sum_square + new_sum_square  \
+                  + delta**2*self.num_trajectory*num_new/num_total
+        # Reservoir sample of trajectories
+        for values_arr in values:
+            if self.num_trajectory < self.max_sample:
+                self._sample_arr[self.num_trajectory] = values_arr
+            else:
+                idx = self._rng.integers(0, self.num_trajectory + 1)
+                if idx < self.max_sample:
+                    self._sample_arr[idx] = values_arr
+            self.num_trajectory += 1
+
+
+def simulateTrajectories(roadrunner, seeds, times, selections, values=None):
+    """
+    Simulates a stochastic trajectory for each seed. The integrator,
+    selections, and state of the roadrunner are changed.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    seeds: np.ndarray-int
+    times: np.ndarray (times of the results; first is the start time)
+    selections: list-str (roadrunner selections, excluding time)
+    values: np.ndarray (num_trajectory, num_time, num_selection)
+        array in which results are written
+
+    Returns
+    -------
+    np.ndarray (values)
+    """
+    if values is None:
+        values = np.empty((len(seeds), len(times), len(selections)))
+    roadrunner.setIntegrator(INTEGRATOR)
+    roadrunner.integrator.setValue("variable_step_size", False)
+    roadrunner.timeCourseSelections = list(selections)
+    for idx, seed in enumerate(seeds):
+        roadrunner.reset()
+        roadrunner.integrator.setValue("seed", int(seed))
+        values[idx, :, :] = roadrunner.simulate(times=times)
+    return values
+
+def simulateEnsemble(roadrunner, num_trajectory, times, selections, seed=None,
+      num_process=1, is_keep=True, probabilities=cn.ENSEMBLE_PROBABILITIES,
+      max_sample=cn.ENSEMBLE_MAX_SAMPLE, chunk_size=cn.ENSEMBLE_CHUNK_SIZE):
+    """
+    Simulates an ensemble of stochastic trajectories, optionally in multiple
+    processes. The roadrunner is not changed.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    num_trajectory: int
+    times: np.ndarray (times of the results; first is the start time)
+    selections: list-str (roadrunner selections, excluding time)
+    seed: int (seed of the ensemble; None is not reproducible)
+    num_process: int (number of processes; None is the number of CPUs)
+    is_keep: bool (keep all trajectories in the result)
+    probabilities: list-float (probabilities of the quantiles)
+    max_sample: int (maximum number of trajectories used for quantiles)
+    chunk_size: int (maximum number of trajectories simulated by a task)
+
+    Returns
+    -------
+    EnsembleResult
+    """
+    if num_trajectory < 1:
+        raise ValueError("num_trajectory must be positive.")
+    times = np.array(times, dtype=float)
+    seeds = makeSeeds(num_trajectory, seed=seed)
+    statistics = EnsembleStatistics(probabilities=probabilities,
+          max_sample=max_sample, rng=seed)
+    values = None
+    if is_keep:
+        values = np.empty((num_trajectory, len(times), len(selections)))
+    state = roadrunner.saveStateS()
+    num_process = min(parallel.getNumProcess(num_process), num_trajectory)
+    num_chunk = max(num_process, int(np.ceil(num_trajectory/chunk_size)))
+    chunk_indices = np.array_split(np.arange(num_trajectory), num_chunk)
+    if num_process == 1:
+        clone = cloneRoadrunner(None, state=state)
+        for indices in chunk_indices:
+            chunk_values = simulateTrajectories(clone, seeds[indices], times,
+                  selections)
+            statistics.add(chunk_values)
+            if is_keep:
+                values[indices] = chunk_values
+    else:
+        function = functools.partial(callWithClone,
+              function=simulateTrajectories, argument_name="seeds",
+              state=state, times=times, selections=selections)
+        chunk_seeds = [seeds[i] for i in chunk_indices]
+        # Ordered so that the quantile sample is reproducible
+        for result in parallel.runTasks(function, chunk_seeds,
+              num_process=num_process, is_ordered=True):
+            if result.status != parallel.STATUS_OK:
+                raise RuntimeError("Ensemble simulation failed: %s"
+                      % str(result.error))
+            statistics.add(result.value)
+            if is_keep:
+                values[chunk_indices[result.index]] = result.value
+    return EnsembleResult(values=values, mean=statistics.mean,
+          variance=statistics.variance, quantiles=statistics.quantiles,
+          probabilities=list(probabilities), times=times,
+          names=list(selections), seeds=seeds)
@@ -0,0 +1,253 @@
+"""
+Fitting of model parameters to observed data with lmfit.
+
+The alignment of simulated and observed values is calculated once: the
+model is simulated at the times of the observations, and residuals are
+calculated on numpy arrays by indexing the simulated values with the rows
+of the observations. Parameter values are assigned by index into the
+global parameters of the roadrunner. Optimizations may be started from
+multiple points in the parameter bounds, and the starts may be divided
+among processes; each process restores a roadrunner from the saved state
+instead of compiling the model.
+
+Usage:
+    fitter = Fitter(model, observed_ts, {"k1": (0, 10), "k2": (0, 10)})
+    result = fitter.fit(num_start=10, num_process=4, seed=1)
+    model.set(result.parameter_dct)
+"""
+
+from SBMLModel import batch
+from SBMLModel.make_roadrunner import cloneRoadrunner, callWithClone
+from SBMLModel import parallel
+
+import collections
+import functools
+import lmfit
+import numpy as np
+
+METHOD_LEASTSQ = "leastsq"
+# Residual of a simulation that fails
+LARGE_RESIDUAL = 1e10
+
+FitResult = collections.namedtuple("FitResult",
+      ["parameters", "parameter_dct", "rssq", "starts", "rssqs"])
+FitResult.__doc__ = """
+Result of fitting parameters.
+
+parameters: lmfit.Parameters (best fit)
+parameter_dct: dict (key: parameter name, value: best fit value)
+rssq: float (residual sum of squares of the best fit)
+starts: np.ndarray (num_start, num_parameter; initial values)
+rssqs: np.ndarray (num_start; residual sum of squares from each start)
+"""
+
+
+def makeParameters(parameters, model):
+    """
+    Constructs lmfit parameters.
+
+    Parameters
+    ----------
+    parameters: lmfit.Parameters/dict
+        key: parameter name
+        value: (lower, upper) or (lower, initial, upper)
+          default initial value is the value in the model
+    model: Model
+
+    Returns
+    -------
+    lmfit.Parameters
+    """
+    if isinstance(parameters, lmfit.Parameters):
+        return parameters.copy()
+    lmfit_parameters = lmfit.Parameters()
+    for name, bounds in parameters.items():
+        if len(bounds) == 2:
+            lower, upper = bounds
+            value = model.get(name)
+        else:
+            lower, value, upper = bounds
+        value = min(max(value, lower), upper)
+        lmfit_parameters.add(name, value=value, min=lower, max=upper)
+    return lmfit_parameters
+
+def _fitStarts(roadrunner, start_mat=None, fitter=None):
+    # Fits from starting values with the roadrunner of a worker process
+    fitter._setRoadrunner(roadrunner)
+    return fitter.fitStarts(start_mat)
+
+
+class Fitter(object):
+
+    def __init__(self, model, observed_ts, parameters, method=METHOD_LEASTSQ):
+        """
+        Parameters
+        ----------
+        model: Model (not changed)
+        observed_ts: Timeseries (columns are model variables; nan is missing)
+        parameters: lmfit.Parameters/dict (see makeParameters)
+        method: str (lmfit minimization method)
+        """
+        self.parameters = makeParameters(parameters, model)
+        self.parameter_names = list(self.parameters.keys())
+        self.method = method
+        self.variables = list(observed_ts.columns)
+        # Simulation times include the observation times and time 0
+        observed_times = np.array(observed_ts.times, dtype=float)
+        if np.any(observed_times < 0):
+            raise ValueError("Observation times must not be negative.")
+        self.times = np.unique(np.append(observed_times, 0.0))
+        self._row_indices = np.searchsorted(self.times, observed_times)
+        self._observed_arr = np.array(observed_ts.values, dtype=float)
+        self._is_valid = ~np.isnan(self._observed_arr)
+        self.num_residual = int(self._is_valid.sum())
+        self._selections = model._makeSelections(self.variables)
+        self._parameter_indices = batch.getParameterIndices(model.roadrunner,
+              self.parameter_names)
+        self._state = model.roadrunner.saveStateS()
+        self._roadrunner = None
+
+    def __getstate__(self):
+        # The roadrunner is restored from its saved state
+        dct = dict(self.__dict__)
+        dct["_roadrunner"] = None
+        return dct
+
+    @property
+    def roadrunner(self):
+        if self._roadrunner is None:
+            self._setRoadrunner(cloneRoadrunner(None, state=self._state))
+        return self._roadrunner
+
+    def _setRoadrunner(self, roadrunner):
+        # Uses a roadrunner cloned from the saved state
+        roadrunner.timeCourseSelections = list(self._selections)
+        self._roadrunner = roadrunner
+
+    def calculateResiduals(self, values):
+        """
+        Calculates the differences between simulated and observed values.
+
+        Parameters
+        ----------
+        values: np.ndarray (values of parameters in parameter_names)
+
+        Returns
+        -------
+        np.ndarray (num_residual)
+        """
+        roadrunner = self.roadrunner
+        roadrunner.model.setGlobalParameterValues(self._parameter_indices,
+              np.array(values, dtype=float))
+        roadrunner.reset()
+        try:
+            simulated_arr = np.array(roadrunner.simulate(times=self.times))
+        except RuntimeError:
+            return np.repeat(LARGE_RESIDUAL, self.num_residual)
+        residual_arr = simulated_arr[self._row_indices] - self._observed_arr
+        return residual_arr[self._is_valid]
+
+    def _calculateLmfitResiduals(self, parameters):
+        values = [parameters[n].value for n in self.parameter_names]
+        return self.calculateResiduals(values)
+
+    def makeStarts(self, num_start=1, seed=None):
+        """
+        Constructs starting values. The first start is the initial values of
+        the parameters; the others are uniformly distributed in the bounds.
+        Parameters without finite bounds start at their initial values.
+
+        Parameters
+        ----------
+        num_start: int
+        seed: int (seed of the random starting values)
+
+        Returns
+        -------
+        np.ndarray (num_start, num_parameter)
+        """
+        rng = np.random.default_rng(seed)
+        initial_arr = np.array([self.parameters[n].value
+              for n in self.parameter_names])
+        lower_arr = np.array([self.parameters[n].min
+              for n in self.parameter_names])
+        upper_arr = np.array([self.parameters[n].max
+              for n in self.parameter_names])
+        is_bounded = np.isfinite(lower_arr) & np.isfinite(upper_arr)
+        lower_arr = np.where(is_bounded, lower_arr, initial_arr)
+        upper_arr = np.where(is_bounded, upper_arr, initial_arr)
+        start_mat = rng.uniform(lower_arr, upper_arr,
+              size=(num_start, len(initial_arr)))
+        start_mat[0, :] = initial_arr
+        return start_mat
+
+    def fitStarts(self, start_mat):
+        """
+        Minimizes the residuals from each row of starting values.
+
+        Parameters
+        ----------
+        start_mat: np.ndarray (num_start, num_parameter)
+
+        Returns
+        -------
+        np.ndarray (num_start, num_parameter; fitted values)
+        np.ndarray (num_start; residual sum of squares)
+        """
+        value_mat = np.array(start_mat, dtype=float)
+        rssqs = np.repeat(np.nan, len(value_mat))
+        for idx, start_arr in enumerate(start_mat):
+            parameters = self.parameters.copy()
+            for name, value in zip(self.parameter_names, start_arr):
+                parameters[name].set(value=value)
+            result = lmfit.minimize(self._calculateLmfitResiduals, parameters,
+                  method=self.method)
+            value_mat[idx, :] = [result.params[n].value
+                  for n in self.parameter_names]
+            rssqs[idx] = np.sum(self.calculateResiduals(value_mat[idx, :])**2)
+        return value_mat, rssqs
+
+    def fit(self, num_start=1, num_process=1, seed=None):
+        """
+        Fits the parameters from multiple starting values, optionally
+        in multiple processes. Raises RuntimeError if a process fails.
+
+        Parameters
+        ----------
+        num_start: int (number of starting values)
+        num_process: int (number of processes; None is the number of CPUs)
+        seed: int (seed of the random starting values)
+
+        Returns
+        -------
+        FitResult
+        """
+        start_mat = self.makeStarts(num_start=num_start, seed=seed)
+        num_process = min(parallel.getNumProcess(num_process), num_start)
+        if num_process == 1:
+            value_mat, rssqs = self.fitStarts(start_mat)
+        else:
+            value_mat = np.array(start_mat)
+            rssqs = np.repeat(np.nan, num_start)
+            chunk_indices = np.array_split(np.arange(num_start), num_process)
+            function = functools.partial(callWithClone, function=_fitStarts,
+                  argument_name="start_mat", state=self._state, fitter=self)
+            chunks = [start_mat[c, :] for c in chunk_indices]
+            for result in parallel.runTasks(function, chunks,
+                  num_process=num_process):
+                if result.status != parallel.STATUS_OK:
+                    raise RuntimeError("Fit of %d starts failed (%s): %s"
+                          % (len(chunk_indices[result.index]), result.status,
+                          str(result.error)))
+                indices = chunk_indices[result.index]
+                value_mat[indices], rssqs[indices] = result.value
+        if np.all(np.isnan(rssqs)):
+            raise RuntimeError("No fit succeeded.")
+        best_idx = int(np.nanargmin(rssqs))
+        parameters = self.parameters.copy()
+        for name, value in zip(self.parameter_names, value_mat[best_idx]):
+            parameters[name].set(value=value)
+        return FitResult(parameters=parameters,
+              parameter_dct=dict(zip(self.parameter_names,
+              value_mat[best_idx].tolist())),
+              rssq=rssqs[best_idx], starts=start_mat, rssqs=rssqs)
@@ -0,0 +1,415 @@
+"""
+Global sensitivity analysis of scalar features of simulations.
+
+A feature is a function of the simulated values of one parameter set
+(np.ndarray of shape (num_time, num_variable)) that returns a float, such
+as the final value of a species. Parameter designs are generated in blocks:
+Saltelli designs from a scrambled Sobol' sequence for Sobol indices, and
+one-at-a-time trajectories on a grid for Morris screening. Each block is
+simulated in a worker process that restores a roadrunner from its saved
+state and reduces the simulations to features, so that only features are
+returned. Indices are calculated from running sums of the features, so
+memory does not grow with the number of samples.
+
+Sobol indices use the estimators of Saltelli (2010) for first order indices
+and Jansen (1999) for total indices. Samples with a failed simulation
+are excluded.
+
+Usage:
+    analyzer = GlobalSensitivity(roadrunner, {"k1": (0.5, 2)}, times,
+          ["[A]"], {"final_A": lambda v: v[-1, 0]})
+    result = analyzer.calculateSobol(num_sample=1024, num_process=4)
+    result.first_order  # (num_feature, num_parameter)
+"""
+
+import SBMLModel.constants as cn
+from SBMLModel import batch
+from SBMLModel.make_roadrunner import cloneRoadrunner, callWithClone
+from SBMLModel import parallel
+
+import collections
+import functools
+import numpy as np
+from scipy.stats import qmc
+
+SobolResult = collections.namedtuple("SobolResult",
+      ["first_order", "total_order", "variance", "feature_names",
+      "parameter_names", "num_sample", "num_failed"])
+SobolResult.__doc__ = """
+Sobol indices.
+
+first_order: np.ndarray (num_feature, num_parameter)
+total_order: np.ndarray (num_feature, num_parameter)
+variance: np.ndarray (num_feature; variance of the feature)
+feature_names: list-str
+parameter_names: list-str
+num_sample: int (number of base samples used)
+num_failed: int (number of base samples excluded)
+"""
+
+MorrisResult = collections.namedtuple("MorrisResult",
+      ["mu", "mu_star", "sigma", "feature_names", "parameter_names",
+      "num_trajectory", "num_failed"])
+MorrisResult.__doc__ = """
+Morris elementary effects, calculated for parameters scaled to [0, 1].
+
+mu: np.ndarray (num_feature, num_parameter; mean of effects)
+mu_star: np.ndarray (num_feature, num_parameter; mean of absolute effects)
+sigma: np.ndarray (num_feature, num_parameter; standard deviation of effects)
+feature_names: list-str
+parameter_names: list-str
+num_trajectory: int (number of trajectories used)
+num_failed: int (number of trajectories excluded)
+"""
+
+
+def evaluateFeatures(roadrunner, parameter_indices, parameter_mat, times,
+      selections, functions):
+    """
+    Simulates parameter sets and calculates their features. The
+    roadrunner is changed.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    parameter_indices: np.ndarray-int (indices of global parameters)
+    parameter_mat: np.ndarray (num_parameter_set, num_parameter)
+    times: np.ndarray (times of the results; first is the start time)
+    selections: list-str (roadrunner selections, excluding time)
+    functions: list-Function
+        np.ndarray (num_time, num_selection)
+        returns: float
+
+    Returns
+    -------
+    np.ndarray (num_parameter_set, num_feature); nan if the simulation failed
+    """
+    values, is_failed = batch.simulateParameterSets(roadrunner,
+          parameter_indices, parameter_mat, times, selections)
+    feature_mat = np.repeat(np.nan, len(parameter_mat)*len(functions)).reshape(
+          len(parameter_mat), len(functions))
+    for idx in np.flatnonzero(~is_failed):
+        feature_mat[idx, :] = [f(values[idx]) for f in functions]
+    return feature_mat
+
+
+class SobolAccumulator(object):
+    # Running sums for Sobol indices
+
+    def __init__(self, num_parameter, num_feature):
+        self.num_parameter = num_parameter
+        self.num_sample = 0
+        self.num_failed = 0
+        shape = (num_feature, num_parameter)
+        self._sum = np.zeros(num_feature)  # of features of A and B
+        self._sum_square = np.zeros(num_feature)
+        self._first_sum = np.zeros(shape)
+        self._total_sum = np.zeros(shape)
+
+    def add(self, feature_arr):
+        """
+        Updates the sums with features of Saltelli samples.
+
+        Parameters
+        ----------
+        feature_arr: np.ndarray (num_sample, num_parameter + 2, num_feature)
+            rows of a sample are A, B, AB_1, ..., AB_num_parameter
+        """
+        is_valid = ~np.any(np.isnan(feature_arr), axis=(1, 2))
+        self.num_failed += int(np.sum(~is_valid))
+        feature_arr = feature_arr[is_valid]
+        self.num_sample += len(feature_arr)
+        a_mat = feature_arr[:, 0, :]
+        b_mat = feature_arr[:, 1, :]
+        ab_arr = feature_arr[:, 2:, :]
+        self._sum += a_mat.sum(axis=0) + b_mat.sum(axis=0)
+        self._sum_square += (a_mat**2).sum(axis=0) + (b_mat**2).sum(axis=0)
+        # Sums over samples of (num_parameter, num_feature) terms
+        self._first_sum += np.einsum("sf,spf->fp", b_mat,
+              ab_arr - a_mat[:, None, :])
+        self._total_sum += np.sum((a_mat[:, None, :] - ab_arr)**2, axis=0).T
+
+    @property
+    def variance(self):
+        num_value = 2*self.num_sample
+        mean = self._sum/num_value
+        return self._sum_square/num_value - mean**2
+
+    def makeIndices(self):
+        """
+        Returns
+        -------
+        np.ndarray (first order indices)
+        np.ndarray (total order indices)
+        """
+        variance = self.variance[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            first_order = self._first_sum/self.num_sample/variance
+            total_order = 0.5*self._total_sum/self.num_sample/variance
+        return first_order, total_order
+
+
+class MorrisAccumulator(object):
+    # Running sums for Morris elementary effects
+
+    def __init__(self, num_parameter, num_feature, delta):
+        self.delta = delta
+        self.num_trajectory = 0
+        self.num_failed = 0
+        shape = (num_feature, num_parameter)
+        self._sum = np.zeros(shape)
+        self._abs_sum = np.zeros(shape)
+        self._sum_square = np.zeros(shape)
+
+    def add(self, feature_arr, orders):
+        """
+        Updates the sums with features of trajectories.
+
+        Parameters
+        ----------
+        feature_arr: np.ndarray (num_trajectory, num_parameter + 1, num_feature)
+        orders: np.ndarray-int (num_trajectory, num_parameter)
+            parameter changed at each step of a trajectory
+        """
+        is_valid = ~np.any(np.isnan(feature_arr), axis=(1, 2))
+        self.num_failed += int(np.sum(~is_valid))
+        feature_arr = feature_arr[is_valid]
+        orders = orders[is_valid]
+        self.num_trajectory += len(feature_arr)
+        # Effects of steps, placed in the columns of the parameters changed
+        step_arr = np.diff(feature_arr, axis=1)/self.delta
+        effect_arr = np.empty_like(step_arr)
+        rows = np.arange(len(orders))[:, None]
+        effect_arr[rows, orders, :] = step_arr
+        self._sum += effect_arr.sum(axis=0).T
+        self._abs_sum += np.abs(effect_arr).sum(axis=0).T
+        self._sum_square += (effect_arr**2).sum(axis=0).T
+
+    def makeStatistics(self):
+        """
+        Returns
+        -------
+        np.ndarray (mu)
+        np.ndarray (mu_star)
+        np.ndarray (sigma)
+        """
+        num = self.num_trajectory
+        mu = self._sum/num
+        mu_star = self._abs_sum/num
+        variance = np.zeros_like(mu)
+        if num > 1:
+            variance = (self._sum_square - num*mu**2)/(num - 1)
+        return mu, mu_star, np.sqrt(np.maximum(variance, 0))
+
+
+class GlobalSensitivity(object):
+
+    def __init__(self, roadrunner, parameter_dct, times, selections,
+          feature_dct):
+        """
+        Parameters
+        ----------
+        roadrunner: ExtendedRoadrunner (not changed)
+        parameter_dct: dict
+            key: name of a global parameter
+            value: (lower, upper)
+        times: np.ndarray (times of the results; first is the start time)
+        selections: list-str (roadrunner selections, excluding time)
+        feature_dct: dict
+            key: feature name
+            value: Function (must be picklable if processes are not forked)
+                np.ndarray (num_time, num_selection)
+                returns: float
+        """
+        self.parameter_names = list(parameter_dct.keys())
+        bounds = np.array([parameter_dct[n] for n in self.parameter_names],
+              dtype=float)
+        self.lower_arr = bounds[:, 0]
+        self.upper_arr = bounds[:, 1]
+        self.times = np.array(times, dtype=float)
+        self.selections = list(selections)
+        self.feature_names = list(feature_dct.keys())
+        self.functions = [feature_dct[n] for n in self.feature_names]
+        self._parameter_indices = batch.getParameterIndices(roadrunner,
+              self.parameter_names)
+        self._state = roadrunner.saveStateS()
+
+    @property
+    def num_parameter(self):
+        return len(self.parameter_names)
+
+    def _scale(self, unit_mat):
+        # Converts values in [0, 1] to parameter values
+        return self.lower_arr + unit_mat*(self.upper_arr - self.lower_arr)
+
+    def _evaluate(self, blocks, num_process):
+        """
+        Calculates the features of blocks of parameter sets.
+
+        Parameters
+        ----------
+        blocks: iterable-np.ndarray (num_parameter_set, num_parameter)
+        num_process: int
+
+        Returns
+        -------
+        generator of (int, np.ndarray)
+            index of the block
+            features (num_parameter_set, num_feature)
+        """
+        kwargs = dict(parameter_indices=self._parameter_indices,
+              times=self.times, selections=self.selections,
+              functions=self.functions)
+        if num_process == 1:
+            roadrunner = cloneRoadrunner(None, state=self._state)
+            for index, parameter_mat in enumerate(blocks):
+                yield index, evaluateFeatures(roadrunner,
+                      parameter_mat=parameter_mat, **kwargs)
+            return
+        function = functools.partial(callWithClone,
+              function=evaluateFeatures, argument_name="parameter_mat",
+              state=self._state, **kwargs)
+        for result in parallel.runTasks(function, blocks,
+              num_process=num_process, is_ordered=True):
+            if result.status != parallel.STATUS_OK:
+                raise RuntimeError("Feature calculation failed: %s"
+                      % str(result.error))
+            yield result.index, result.value
+
+    def makeSobolBlocks(self, num_sample, block_size=cn.GLOBAL_SENSITIVITY_BLOCK_SIZE,
+          seed=None):
+        """
+        Generates Saltelli designs in blocks.
+
+        Parameters
+        ----------
+        num_sample: int (number of base samples)
+        block_size: int (number of base samples in a block)
+        seed: int
+
+        Returns
+        -------
+        generator of np.ndarray (block_size*(num_parameter + 2), num_parameter)
+            rows of a sample are A, B, AB_1, ..., AB_num_parameter
+        """
+        num_parameter = self.num_parameter
+        sampler = qmc.Sobol(d=2*num_parameter, scramble=True, seed=seed)
+        for start in range(0, num_sample, block_size):
+            size = min(block_size, num_sample - start)
+            unit_mat = sampler.random(size)
+            a_mat = unit_mat[:, :num_parameter]
+            b_mat = unit_mat[:, num_parameter:]
+            design_arr = np.repeat(a_mat[:, None, :], num_parameter + 2, axis=1)
+            design_arr[:, 1, :] = b_mat
+            for idx in range(num_parameter):
+                design_arr[:, idx + 2, idx] = b_mat[:, idx]
+            yield self._scale(design_arr.reshape(-1, num_parameter))
+
+    def calculateSobol(self, num_sample=cn.GLOBAL_SENSITIVITY_NUM_SAMPLE,
+          num_process=1, block_size=cn.GLOBAL_SENSITIVITY_BLOCK_SIZE, seed=None):
+        """
+        Calculates Sobol indices with num_sample*(num_parameter + 2)
+        simulations.
+
+        Parameters
+        ----------
+        num_sample: int (number of base samples; a power of 2 is best)
+        num_process: int (number of processes; None is the number of CPUs)
+        block_size: int (number of base samples simulated by a task)
+        seed: int
+
+        Returns
+        -------
+        SobolResult
+        """
+        num_process = parallel.getNumProcess(num_process)
+        accumulator = SobolAccumulator(self.num_parameter,
+              len(self.feature_names))
+        blocks = self.makeSobolBlocks(num_sample, block_size=block_size,
+              seed=seed)
+        for _, feature_mat in self._evaluate(blocks, num_process):
+            accumulator.add(feature_mat.reshape(-1, self.num_parameter + 2,
+                  len(self.feature_names)))
+        first_order, total_order = accumulator.makeIndices()
+        return SobolResult(first_order=first_order, total_order=total_order,
+              variance=accumulator.variance,
+              feature_names=list(self.feature_names),
+              parameter_names=list(self.parameter_names),
+              num_sample=accumulator.num_sample,
+              num_failed=accumulator.num_failed)
+
+    def makeMorrisBlocks(self, num_trajectory, num_level, orders_dct,
+          block_size=cn.GLOBAL_SENSITIVITY_BLOCK_SIZE, seed=None):
+        """
+        Generates Morris trajectories in blocks. Each trajectory starts at
+        a random point of the grid and increases one parameter at a time
+        by delta, in random order.
+
+        Parameters
+        ----------
+        num_trajectory: int
+        num_level: int (even number of grid levels in [0, 1])
+        orders_dct: dict (updated with the orders of each block)
+            key: index of the block
+            value: np.ndarray-int (num_trajectory, num_parameter)
+        block_size: int (number of trajectories in a block)
+        seed: int
+
+        Returns
+        -------
+        generator of np.ndarray (block_size*(num_parameter + 1), num_parameter)
+        """
+        num_parameter = self.num_parameter
+        rng = np.random.default_rng(seed)
+        delta = num_level/(2*(num_level - 1))
+        # Starting levels allow an increase of delta
+        start_levels = np.arange(num_level)/(num_level - 1)
+        start_levels = start_levels[start_levels + delta <= 1 + 1e-12]
+        for index, start in enumerate(range(0, num_trajectory, block_size)):
+            size = min(block_size, num_trajectory - start)
+            start_mat = rng.choice(start_levels, size=(size, num_parameter))
+            orders = np.array([rng.permutation(num_parameter)
+                  for _ in range(size)], dtype=int).reshape(size, num_parameter)
+            design_arr = np.repeat(start_mat[:, None, :], num_parameter + 1,
+                  axis=1)
+            for step in range(num_parameter):
+                rows = np.arange(size)
+                design_arr[rows, step + 1:, orders[:, step]] += delta
+            orders_dct[index] = orders
+            yield self._scale(design_arr.reshape(-1, num_parameter))
+
+    def calculateMorris(self, num_trajectory=cn.GLOBAL_SENSITIVITY_NUM_TRAJECTORY,
+          num_level=4, num_process=1,
+          block_size=cn.GLOBAL_SENSITIVITY_BLOCK_SIZE, seed=None):
+        """
+        Calculates Morris elementary effects with
+        num_trajectory*(num_parameter + 1) simulations.
+
+        Parameters
+        ----------
+        num_trajectory: int
+        num_level: int (even number of grid levels)
+        num_process: int (number of processes; None is the number of CPUs)
+        block_size: int (number of trajectories simulated by a task)
+        seed: int
+
+        Returns
+        -------
+        MorrisResult
+        """
+        num_process = parallel.getNumProcess(num_process)
+        delta = num_level/(2*(num_level - 1))
+        accumulator = MorrisAccumulator(self.num_parameter,
+              len(self.feature_names), delta)
+        orders_dct = {}
+        blocks = self.makeMorrisBlocks(num_trajectory, num_level, orders_dct,
+              block_size=block_size, seed=seed)
+        for index, feature_mat in self._evaluate(blocks, num_process):
+            accumulator.add(feature_mat.reshape(-1, self.num_parameter + 1,
+                  len(self.feature_names)), orders_dct.pop(index))
+        mu, mu_star, sigma = accumulator.makeStatistics()
+        return MorrisResult(mu=mu, mu_star=mu_star, sigma=sigma,
+              feature_names=list(self.feature_names),
+              parameter_names=list(self.parameter_names),
+              num_trajectory=accumulator.num_trajectory,
+              num_failed=accumulator.num_failed)
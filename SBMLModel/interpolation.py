@@ -0,0 +1,79 @@
+"""
+Interpolation of trajectories onto new times.
+
+Values are arrays whose second to last axis is time and whose last axis is
+variables, so that a single trajectory (num_time, num_variable) and a stack
+of trajectories (num_trajectory, num_time, num_variable) are interpolated
+in one vectorized call. Methods are:
+    linear: straight line between neighboring times
+    cubic: cubic spline through all times
+    nearest: value at the nearest time
+    previous: value at the largest time that does not exceed the new time
+New times outside the range of the times have nan values.
+
+Usage:
+    new_values = interpolate(times, values, new_times, method=METHOD_CUBIC)
+"""
+
+import numpy as np
+from scipy import interpolate as scipy_interpolate
+
+METHOD_LINEAR = "linear"
+METHOD_CUBIC = "cubic"
+METHOD_NEAREST = "nearest"
+METHOD_PREVIOUS = "previous"
+METHODS = [METHOD_LINEAR, METHOD_CUBIC, METHOD_NEAREST, METHOD_PREVIOUS]
+TIME_AXIS = -2
+
+
+def interpolate(times, values, new_times, method=METHOD_LINEAR):
+    """
+    Interpolates values at new times.
+
+    Parameters
+    ----------
+    times: np.ndarray (num_time; increasing)
+    values: np.ndarray (..., num_time, num_variable)
+    new_times: np.ndarray (num_new_time)
+    method: str (in METHODS)
+
+    Returns
+    -------
+    np.ndarray (..., num_new_time, num_variable)
+    """
+    if not method in METHODS:
+        raise ValueError("method must be one of %s" % str(METHODS))
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    new_times = np.asarray(new_times, dtype=float)
+    if values.ndim < 2 or values.shape[TIME_AXIS] != len(times):
+        raise ValueError("values must have %d times on the second to last axis."
+              % len(times))
+    if np.any(np.diff(times) <= 0):
+        raise ValueError("times must be increasing.")
+    is_outside = (new_times < times[0]) | (new_times > times[-1])
+    if len(times) == 1:
+        new_values = np.take(values, np.zeros(len(new_times), dtype=int),
+              axis=TIME_AXIS)
+    elif method == METHOD_CUBIC:
+        spline = scipy_interpolate.CubicSpline(times, values, axis=TIME_AXIS)
+        new_values = spline(np.clip(new_times, times[0], times[-1]))
+    else:
+        # Position of the interval that contains each new time
+        positions = np.searchsorted(times, new_times, side="right") - 1
+        positions = np.clip(positions, 0, len(times) - 2)
+        lower_times = times[positions]
+        upper_times = times[positions + 1]
+        if method == METHOD_LINEAR:
+            weights = ((new_times - lower_times)/(upper_times - lower_times))
+            weights = weights[:, None]
+            new_values = np.take(values, positions, axis=TIME_AXIS)*(1 - weights)  \
+                  + np.take(values, positions + 1, axis=TIME_AXIS)*weights
+        else:
+            if method == METHOD_NEAREST:
+                is_upper = (upper_times - new_times) < (new_times - lower_times)
+            else:
+                is_upper = new_times >= upper_times
+            new_values = np.take(values, positions + is_upper, axis=TIME_AXIS)
+    new_values[..., is_outside, :] = np.nan
+    return new_values
@@ -1,12 +1,44 @@
 """Creates a Roadrunner instance from a model reference."""
 
+from SBMLModel import roadrunner_cache
+
 
 ANT = "ant"
 XML = "xml"
 
-def makeRoadrunner(model_reference):
+def _getModelString(model_reference):
+    """
+    Finds the kind and text of a model reference that is not a URL.
+
+    Parameters
+    ----------
+    model_reference: str
+
+    Returns
+    -------
+    str: kind of model (ANT, XML)
+    str: text of the model (None if it cannot be read)
+    """
+    parts = model_reference.split(".")
+    if len(parts) == 2:
+        if parts[1] in [XML, ANT]:
+            try:
+                with open(model_reference, "r") as fd:
+                    model_str = fd.read()
+            except (OSError, UnicodeDecodeError):
+                model_str = None
+            return parts[1], model_str
+        else:
+            return ANT, model_reference
+    if XML in model_reference[0:10]:
+        return XML, model_reference
+    return ANT, model_reference
+
+def makeRoadrunner(model_reference, cache=None):
     """
     Creates a roadrunner instance from a model reference.
+    Compiled models are saved in a RoadrunnerCache so that
+    models with the same text are not recompiled.
 
     Parameters
     ----------
@@ -17,7 +49,8 @@ def makeRoadrunner(model_reference):
         XML file (extension is .xml)
         XML string
         Antimony string
-    
+    cache: RoadrunnerCache (default is roadrunner_cache.DEFAULT_CACHE)
+
     Returns
     -------
     ExtendedRoadrunner object
@@ -31,7 +64,36 @@ def makeRoadrunner(model_reference):
     #
     if model_reference[0:4] == "http":
         return te.loadSBMLModel(model_reference)
+    # Look for a compiled model
+    if cache is None:
+        cache = roadrunner_cache.DEFAULT_CACHE
+    key = None
+    if cache.is_enabled:
+        kind, model_str = _getModelString(model_reference)
+        if model_str is not None:
+            key = cache.makeKey(model_str, kind=kind)
+            roadrunner = cache.get(key)
+            if roadrunner is not None:
+                return roadrunner
     #
+    roadrunner = _compileRoadrunner(model_reference)
+    if key is not None:
+        cache.put(key, roadrunner)
+    return roadrunner
+
+def _compileRoadrunner(model_reference):
+    """
+    Creates a roadrunner for a model reference that is a file or a string.
+
+    Parameters
+    ----------
+    model_reference: str
+
+    Returns
+    -------
+    ExtendedRoadrunner object
+    """
+    import tellurium as te
     parts = model_reference.split(".")
     if len(parts) == 2:
         if parts[1] == XML:
@@ -55,3 +117,55 @@ def makeRoadrunner(model_reference):
                 raise ValueError("Cannot create model %s"
                       % model_descriptor)
         return te.loada(model_reference)
+
+def cloneRoadrunner(roadrunner, state=None):
+    """
+    Creates an independent roadrunner from the saved state of a roadrunner.
+    This avoids compiling the model. Values and the current
+    simulation time are preserved.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner (may be None if state is provided)
+    state: bytes (saved state of the roadrunner)
+
+    Returns
+    -------
+    ExtendedRoadrunner object
+    """
+    # tellurium replaces RoadRunner with ExtendedRoadRunner
+    import tellurium
+    import roadrunner as rr_module
+    if state is None:
+        state = roadrunner.saveStateS()
+    new_roadrunner = rr_module.RoadRunner()
+    new_roadrunner.loadStateS(state)
+    # The saved state does not include the simulation time
+    if roadrunner is not None:
+        new_roadrunner.model.setTime(roadrunner.model.getTime())
+    return new_roadrunner
+
+def callWithClone(argument, function=None, argument_name=None, state=None,
+      **kwargs):
+    """
+    Calls a function with a roadrunner cloned from a saved state. Used in
+    worker processes, which run a function of one argument
+    (see parallel.runTasks).
+
+    Parameters
+    ----------
+    argument: object (value of the keyword argument argument_name)
+    function: Function
+        roadrunner: ExtendedRoadrunner (first positional argument)
+        returns: object
+    argument_name: str (keyword of function that receives argument)
+    state: bytes (saved state of a roadrunner)
+    kwargs: dict (other keyword arguments of function)
+
+    Returns
+    -------
+    object (value of function)
+    """
+    roadrunner = cloneRoadrunner(None, state=state)
+    kwargs[argument_name] = argument
+    return function(roadrunner, **kwargs)
@@ -14,6 +14,10 @@ Usage example:
     parameter_value = model.get(parameter_name)
     model.set({"k1": 1, "k2": 2})
     ts = model.simulate(0, 10, 100)
+    # Reuse the results of simulations with the same values
+    model.result_cache = ResultCache()
+    # Share the model among threads
+    model.is_thread_safe = True
     # Save model to a file
     with open(path_to_file, "wb") as fd:
         rpickle.dump(model, fd)
@@ -23,32 +27,99 @@ Usage example:
 """
 
 import SBMLModel.constants as cn
+from SBMLModel import async_simulation
 from SBMLModel import rpickle
-from SBMLModel.make_roadrunner import makeRoadrunner
+from SBMLModel.make_roadrunner import makeRoadrunner, cloneRoadrunner
+from SBMLModel import batch
+from SBMLModel import biomodel_archive
+from SBMLModel import noise
+from SBMLModel.checkpoint import CheckpointStore
+from SBMLModel import ensemble
+from SBMLModel import fitter
+from SBMLModel.global_sensitivity import GlobalSensitivity
+from SBMLModel import parallel
+from SBMLModel import result_cache
+from SBMLModel import roadrunner_pool
+from SBMLModel.roadrunner_threads import RoadrunnerThreads
+from SBMLModel.roadrunner_state import RoadrunnerState
+from SBMLModel import sensitivity
+from SBMLModel import steady_state
+from SBMLModel.simulation_result import SimulationResult
 from SBMLModel.timeseries import Timeseries
 import SBMLModel as mdl
 from SBMLModel import util
 
 import copy
+import functools
+import hashlib
 import lmfit
 import numpy as np
-import os
 import pandas as pd
+import threading
 import typing
-import zipfile
 
 # Attributes
 MODEL_REFERENCE = "model_reference"
 ANTIMONY = "antimony"
+ROADRUNNER = "roadrunner"
+PRIVATE_ROADRUNNER = "_roadrunner"
+ROADRUNNER_THREADS = "_roadrunner_threads"
+RESULT_CACHE = "result_cache"
 PARAMETER_DCT = "parameter_dct"
 
 DESERIALIZATION_DCT = "deserialization_dct"
 CURRENT_TIME = "current_time"
+ROADRUNNER_STATE = "roadrunner_state"
+ROADRUNNER_VERSION = "roadrunner_version"
 IS_DEBUG = True
-PREFIX = "BIOMD000000%04d.xml"
-BIOMODEL_EXCLUDE_PATH = os.path.join(cn.DATA_DIR, "biomodels_exclude.csv")
-BIOMODEL_EXCLUDE_DF = pd.read_csv(BIOMODEL_EXCLUDE_PATH)
-MODEL_NUM = list(BIOMODEL_EXCLUDE_DF)[0]
+# Serializes copies of models made in executor threads
+_COPY_LOCK = threading.Lock()
+
+
+def _processBiomodel(model_num, function=None):
+    """
+    Loads a BioModel and applies a function to it. Used in worker processes.
+
+    Parameters
+    ----------
+    model_num: int
+    function: Function
+        Model
+        returns: object
+
+    Returns
+    -------
+    bool: model is present
+    object: value of the function (Model if function is None)
+    """
+    model = Model.getBiomodel(model_num)
+    if model is None:
+        return False, None
+    if function is None:
+        return True, model
+    return True, function(model)
+
+
+def _callModel(model, method_name, pargs, kwargs, is_copy=False):
+    """
+    Calls a method of a model. Used in executors.
+
+    Parameters
+    ----------
+    model: Model
+    method_name: str
+    pargs: list (positional arguments)
+    kwargs: dict (keyword arguments)
+    is_copy: bool (call the method of a copy of the model)
+
+    Returns
+    -------
+    object
+    """
+    if is_copy:
+        with _COPY_LOCK:
+            model = model.copy()
+    return getattr(model, method_name)(*pargs, **kwargs)
 
 
 class Model(rpickle.RPickler):
@@ -59,8 +130,11 @@ class Model(rpickle.RPickler):
     # Attributes checked for equality betweeen objects
     ISEQUAL_ATRS = [ANTIMONY, "species_names", "parameter_names", "reaction_names",
           "kinetic_dct"]
+    # Include the saved state of the roadrunner on serialization.
+    # Override for an instance by assigning is_serialize_state.
+    IS_SERIALIZE_STATE = False
 
-    def __init__(self, model_reference=None, biomodel_num=None):
+    def __init__(self, model_reference=None, biomodel_num=None, pool=None):
         """
         Abstraction for analysis of an SBML model.
 
@@ -73,11 +147,15 @@ class Model(rpickle.RPickler):
             String
           Model reference is None to construct a default object
           for serialization
+        biomodel_num: int (number of the BioModels model)
+        pool: RoadrunnerPool (default is roadrunner_pool.DEFAULT_POOL)
         """
         if model_reference is not None:
+            if pool is None:
+                pool = roadrunner_pool.DEFAULT_POOL
             self.biomodel_num = biomodel_num
             self.model_reference = model_reference
-            self.roadrunner = makeRoadrunner(self.model_reference)
+            self.roadrunner = pool.checkout(self.model_reference)
             self.deserialization_dct = None
             self._initialize()
         else:
@@ -85,12 +163,116 @@ class Model(rpickle.RPickler):
             pass
 
     def _initialize(self):
-        self.antimony = self.roadrunner.getAntimony()
-        self.species_names = self.roadrunner.getFloatingSpeciesIds()
-        self.parameter_names = self.roadrunner.getGlobalParameterIds()
-        self.reaction_names = self.roadrunner.getReactionIds()
-        self.kinetic_dct = {n: self.roadrunner.getKineticLaw(n)
-              for n in self.reaction_names}
+        # Model metadata is calculated on first access
+        self._metadata_dct = {}
+        # States at times visited by setTime
+        self._checkpoint_store = CheckpointStore()
+        # Optional ResultCache used by simulate
+        self.result_cache = None
+        # Roadrunners of threads if the model is thread safe
+        self._roadrunner_threads = None
+
+    @property
+    def roadrunner(self):
+        roadrunner_threads = self.__dict__.get(ROADRUNNER_THREADS)
+        if roadrunner_threads is not None:
+            return roadrunner_threads.getRoadrunner()
+        return self.__dict__.get(PRIVATE_ROADRUNNER)
+
+    @roadrunner.setter
+    def roadrunner(self, roadrunner):
+        self._roadrunner = roadrunner
+
+    @property
+    def is_thread_safe(self):
+        return self._roadrunner_threads is not None
+
+    @is_thread_safe.setter
+    def is_thread_safe(self, is_thread_safe):
+        """
+        A thread safe model provides each thread with its own roadrunner,
+        so that threads can simulate concurrently. Values set in one thread
+        are applied to the roadrunners of all threads; the simulation time is
+        specific to a thread. On becoming not thread safe, the model has
+        the values set but is at the time it had on becoming thread safe.
+        """
+        if is_thread_safe == self.is_thread_safe:
+            return
+        if is_thread_safe:
+            self._roadrunner_threads = RoadrunnerThreads(self._roadrunner)
+        else:
+            self._roadrunner_threads = None
+            self._checkpoint_store.clear()
+
+    def _getCheckpointStore(self):
+        """
+        Provides the checkpoints for the roadrunner in use.
+
+        Returns
+        -------
+        CheckpointStore
+        """
+        if self._roadrunner_threads is not None:
+            return self._roadrunner_threads.getCheckpointStore()
+        return self._checkpoint_store
+
+    def _getMetadata(self, name, function):
+        """
+        Provides a metadata value, calculating it if it is not present.
+
+        Parameters
+        ----------
+        name: str (name of the metadata)
+        function: Function (no argument, calculates the value)
+
+        Returns
+        -------
+        object
+        """
+        if not name in self._metadata_dct:
+            self._metadata_dct[name] = function()
+        return self._metadata_dct[name]
+
+    @property
+    def antimony(self):
+        return self._getMetadata(ANTIMONY, self.roadrunner.getAntimony)
+
+    @property
+    def species_names(self):
+        return self._getMetadata("species_names",
+              self.roadrunner.getFloatingSpeciesIds)
+
+    @property
+    def parameter_names(self):
+        return self._getMetadata("parameter_names",
+              self.roadrunner.getGlobalParameterIds)
+
+    @property
+    def reaction_names(self):
+        return self._getMetadata("reaction_names",
+              self.roadrunner.getReactionIds)
+
+    @property
+    def kinetic_dct(self):
+        def calculate():
+            return {n: self.roadrunner.getKineticLaw(n)
+                  for n in self.reaction_names}
+        #
+        return self._getMetadata("kinetic_dct", calculate)
+
+    @property
+    def fingerprint(self):
+        # Hash of the structure of the model
+        def calculate():
+            return hashlib.sha256(self.roadrunner.getSBML().encode()).hexdigest()
+        #
+        return self._getMetadata("fingerprint", calculate)
+
+    @property
+    def state_index_dct(self):
+        # Indices used to capture a RoadrunnerState
+        return self._getMetadata("state_index_dct",
+              lambda: RoadrunnerState.makeIndexDct(self.roadrunner))
 
     def isEqual(self, other):
         """
@@ -128,10 +310,18 @@ class Model(rpickle.RPickler):
         for key, value in old_dct.items():
             if not key in self.SERIALIZATION_ATRS:
                 del dct[key]
+        # Metadata are properties that are not in the instance dictionary
+        for key in self.SERIALIZATION_ATRS:
+            if not key in dct:
+                dct[key] = self.__getattribute__(key)
         # Record deserialization information
         parameter_dct = self.get(self.parameter_names)
         deserialization_dct = {CURRENT_TIME: self.getTime(),
               PARAMETER_DCT: parameter_dct}
+        if self.__dict__.get("is_serialize_state", self.IS_SERIALIZE_STATE):
+            import roadrunner
+            deserialization_dct[ROADRUNNER_STATE] = self.roadrunner.saveStateS()
+            deserialization_dct[ROADRUNNER_VERSION] = roadrunner.__version__
         dct[DESERIALIZATION_DCT] = deserialization_dct
 
     @classmethod
@@ -150,12 +340,45 @@ class Model(rpickle.RPickler):
         Provides a hook to modify instance variables after they have
         been initialized by RPickle.
         """
-        import tellurium as te
         deserialization_dct = dict(self.deserialization_dct)  # DESERIALIZAITON_DCT
-        self.roadrunner = te.loada(self.antimony)
+        antimony = self.__dict__.pop(ANTIMONY)
+        state = self.deserialization_dct.pop(ROADRUNNER_STATE, None)
+        self.roadrunner = None
+        if state is not None:
+            self.roadrunner = self._restoreRoadrunner(state,
+                  deserialization_dct[ROADRUNNER_VERSION],
+                  deserialization_dct[CURRENT_TIME])
         self._initialize()
-        self.set(deserialization_dct[PARAMETER_DCT])
-        self.setTime(deserialization_dct[CURRENT_TIME])
+        self._metadata_dct[ANTIMONY] = antimony
+        if self.roadrunner is None:
+            self.roadrunner = makeRoadrunner(antimony)
+            self.set(deserialization_dct[PARAMETER_DCT])
+            self.setTime(deserialization_dct[CURRENT_TIME])
+
+    @staticmethod
+    def _restoreRoadrunner(state, version, time):
+        """
+        Restores a roadrunner from its saved state.
+
+        Parameters
+        ----------
+        state: bytes (saved state)
+        version: str (roadrunner version that saved the state)
+        time: float (simulation time)
+
+        Returns
+        -------
+        ExtendedRoadrunner (None if the state cannot be restored)
+        """
+        import roadrunner as rr_module
+        if version != rr_module.__version__:
+            return None
+        try:
+            roadrunner = cloneRoadrunner(None, state=state)
+        except Exception:
+            return None
+        roadrunner.model.setTime(time)
+        return roadrunner
 
     def set(self, name_dct):
         """
@@ -167,7 +390,13 @@ class Model(rpickle.RPickler):
             key: str
             value: value
         """
+        if self._roadrunner_threads is not None:
+            # Roadrunners of threads are changed when next used
+            self._roadrunner_threads.set(name_dct)
+            return
         util.setRoadrunnerValue(self.roadrunner, name_dct)
+        # Checkpoints were simulated with the old values
+        self._checkpoint_store.clear()
 
     def get(self, names=None):
         """
@@ -198,21 +427,66 @@ class Model(rpickle.RPickler):
 
     def setTime(self, time):
         """
+        Sets the model to its state at a simulation time. The simulation
+        resumes from the checkpoint of the nearest earlier time visited,
+        if any; otherwise, it starts at time 0.
         
         Parameters
         ----------
+        time: float
+        """
+        roadrunner = self.roadrunner
+        if time <= 0.01:
+            roadrunner.reset()
+            return
+        checkpoint_store = self._getCheckpointStore()
+        state = checkpoint_store.find(time)
+        if state is None:
+            roadrunner.reset()
+            start_time = 0.0
+        else:
+            state.restore(roadrunner)
+            start_time = state.time
+        if time - start_time > 0.01:
+            _ = roadrunner.simulate(start_time, time)
+            checkpoint_store.add(RoadrunnerState.capture(
+                  roadrunner, index_dct=self.state_index_dct))
+
+    def copy(self):
+        """
+        Creates a copy of the model. Preserves the model parameters
+        and curent time. The roadrunner is cloned from its saved state
+        so that the model is neither recompiled nor re-simulated.
+        The copy of a thread safe model is thread safe and has the
+        time of the calling thread.
         
         Returns
         -------
+        Model
         """
-        self.roadrunner.reset()
-        if time > 0.01:
-            _ = self.roadrunner.simulate(0.0, time)
+        try:
+            roadrunner = cloneRoadrunner(self.roadrunner)
+        except Exception:
+            # Saved state is not supported
+            return self._copySerialized()
+        new_model = self.__class__.rpConstruct()
+        for key, value in self.__dict__.items():
+            if key in [PRIVATE_ROADRUNNER, ROADRUNNER_THREADS]:
+                continue
+            if key == RESULT_CACHE:
+                # Results are valid for all copies
+                new_model.__dict__[key] = value
+                continue
+            new_model.__dict__[key] = copy.deepcopy(value)
+        new_model.roadrunner = roadrunner
+        new_model._roadrunner_threads = None
+        new_model.is_thread_safe = self.is_thread_safe
+        return new_model
 
-    def copy(self):
+    def _copySerialized(self):
         """
-        Creates a copy of the model. Preserves the model parameters
-        and curent time.
+        Creates a copy of the model by serializing and deserializing it.
+        This recompiles the model and simulates to the current time.
         
         Returns
         -------
@@ -241,46 +515,570 @@ class Model(rpickle.RPickler):
             return None
         return ts.std()
  
-    def simulate(self, *pargs, noise_mag=0, std_ser=None, **kwargs):
+    def simulate(self, *pargs, noise_mag=0, std_ser=None, is_continue=False,
+          noise_model=noise.NOISE_UNIFORM, rng=None, variables=None,
+          is_simulation_result=False, **kwargs):
         """
         Runs a simulation. Defaults to parameter values in the simulation.
  
         Parameters
         ----------
+        variables: list-str (variables recorded; default is all species)
         noise_mag: positive float (max magnitude of noise added)
         std_ser: pd.Series (standard deviations)
+        is_continue: bool (simulate from the current state instead of
+            resetting the model; the start time should be the current time)
+        noise_model: str (see noise.NOISE_MODELS)
+        rng: int/np.random.Generator (seed or generator for noise)
+        is_simulation_result: bool (return a SimulationResult)
 
         Return
         ------
-        Timeseries (or None if fail to converge)
+        Timeseries/SimulationResult (or None if fail to converge)
         """
+        if variables is not None:
+            # Only record the requested variables
+            old_selections = list(self.roadrunner.timeCourseSelections)
+            self.roadrunner.timeCourseSelections = [cn.TIME]  \
+                  + self._makeSelections(variables)
+            try:
+                return self.simulate(*pargs, noise_mag=noise_mag,
+                      std_ser=std_ser, is_continue=is_continue,
+                      noise_model=noise_model, rng=rng,
+                      is_simulation_result=is_simulation_result, **kwargs)
+            finally:
+                self.roadrunner.timeCourseSelections = old_selections
         noise_mag = np.abs(noise_mag)
+        if is_simulation_result and (self.result_cache is None)  \
+              and (noise_mag == 0):
+            # Avoid constructing a Timeseries
+            if not is_continue:
+                self.roadrunner.reset()
+            try:
+                data = self.roadrunner.simulate(*pargs)
+            except RuntimeError:
+                return None
+            return SimulationResult.fromNamedArray(data)
         data_ts = None
-        self.roadrunner.reset()
-        try:
-            data = self.roadrunner.simulate(*pargs)
-            is_done = True
-        except RuntimeError:
-            is_done = False
-        if is_done:
-            columns = [c[1:-1] if c[0] =="[" else c for c in data.colnames]
-            data_ts = mdl.Timeseries(data, columns=columns)
+        key = None
+        if (self.result_cache is not None) and (not is_continue):
+            key = self._makeResultKey(pargs)
+            entry = self.result_cache.get(key)
+            if entry is not None:
+                data_ts, state = entry
+                # Leave the model in the state at the end of the simulation
+                state.restore(self.roadrunner)
+        if data_ts is None:
+            if not is_continue:
+                self.roadrunner.reset()
+            try:
+                data = self.roadrunner.simulate(*pargs)
+                is_done = True
+            except RuntimeError:
+                is_done = False
+            if is_done:
+                columns = [c[1:-1] if c[0] =="[" else c for c in data.colnames]
+                data_ts = mdl.Timeseries(data, columns=columns)
+                if key is not None:
+                    self.result_cache.put(key, data_ts, RoadrunnerState.capture(
+                          self.roadrunner, index_dct=self.state_index_dct))
+        if data_ts is not None:
             if noise_mag > 0:
-                nrow = len(data_ts)
-                ncol = len(data_ts.columns)
-                random_arr = np.random.rand(nrow*ncol)
-                random_arr += -0.5
-                random_arr = noise_mag*random_arr
-                random_arr = np.reshape(random_arr, (nrow, ncol))
-                random_df = pd.DataFrame(random_arr, columns=data_ts.columns,
-                    index=data_ts.index)
+                std_arr = None
                 if std_ser is not None:
-                    for column in random_df.columns:
-                        random_df[column] = random_df[column]*std_ser.loc[column]
-                data_df = pd.DataFrame(data_ts) + random_df
+                    std_arr = std_ser.loc[data_ts.columns].values
+                noisy_arr = noise.makeNoisyReplicates(data_ts.values,
+                      noise_mag=noise_mag, std_arr=std_arr,
+                      noise_model=noise_model, rng=rng)[0]
+                data_df = pd.DataFrame(noisy_arr, columns=data_ts.columns,
+                    index=data_ts.index)
                 data_ts = Timeseries(data_df)
+        if is_simulation_result and (data_ts is not None):
+            return SimulationResult.fromTimeseries(data_ts)
         return data_ts
 
+    def _makeResultKey(self, pargs):
+        """
+        Constructs the key of a simulation in the result cache from the
+        structure of the model, the values that determine the simulation
+        after a reset, and the simulation arguments.
+
+        Parameters
+        ----------
+        pargs: list (positional arguments for simulation)
+
+        Returns
+        -------
+        str
+        """
+        model = self.roadrunner.model
+        integrator = self.roadrunner.getIntegrator()
+        integrator_settings = [(n, integrator.getValue(n))
+              for n in integrator.getSettings()]
+        pargs = [np.array(a) if isinstance(a, (list, np.ndarray)) else a
+              for a in pargs]
+        return result_cache.makeKey(self.fingerprint, integrator.getName(),
+              integrator_settings, list(self.roadrunner.timeCourseSelections),
+              model.getGlobalParameterValues(),
+              model.getFloatingSpeciesInitConcentrations(),
+              model.getBoundarySpeciesAmounts(),
+              model.getCompartmentVolumes(), *pargs)
+
+    def simulateReplicates(self, *pargs, num_replicate=1, noise_mag=1.0,
+          std_ser=None, noise_model=noise.NOISE_UNIFORM, rng=None,
+          variables=None):
+        """
+        Simulates once and constructs noisy replicates of the result.
+
+        Parameters
+        ----------
+        pargs: list (positional arguments for simulation)
+        variables: list-str (variables recorded; default is all species)
+        num_replicate: int
+        noise_mag: positive float (magnitude of noise added)
+        std_ser: pd.Series (standard deviations)
+        noise_model: str (see noise.NOISE_MODELS)
+        rng: int/np.random.Generator (seed or generator for noise)
+
+        Returns
+        -------
+        noise.ReplicateResult (or None if fail to converge)
+            values: np.ndarray (num_replicate, num_time, num_variable)
+        """
+        data_ts = self.simulate(*pargs, variables=variables)
+        if data_ts is None:
+            return None
+        std_arr = None
+        if std_ser is not None:
+            std_arr = std_ser.loc[data_ts.columns].values
+        values = noise.makeNoisyReplicates(data_ts.values,
+              num_replicate=num_replicate, noise_mag=noise_mag,
+              std_arr=std_arr, noise_model=noise_model, rng=rng)
+        return noise.ReplicateResult(values=values, times=data_ts.times,
+              names=list(data_ts.columns))
+
+    def _makeSelections(self, names):
+        """
+        Constructs roadrunner selections for variable names. Species are
+        selected as concentrations, consistent with simulate.
+
+        Parameters
+        ----------
+        names: list-str
+
+        Returns
+        -------
+        list-str
+        """
+        species_names = set(self.species_names).union(
+              self.roadrunner.getBoundarySpeciesIds())
+        return ["[%s]" % n if n in species_names else n for n in names]
+
+    def simulateBatch(self, parameter_matrix, times, selections=None,
+          parameter_names=None, num_process=1):
+        """
+        Simulates the model for each set of parameter values. The model
+        is not changed.
+
+        Parameters
+        ----------
+        parameter_matrix: np.ndarray/pd.DataFrame (num_parameter_set, num_parameter)
+            columns of a DataFrame are parameter names
+        times: list-float (times of the results; first is the start time)
+        selections: list-str (variables in the result; default is species)
+        parameter_names: list-str (names of the columns of parameter_matrix)
+            default is the DataFrame columns or parameter_names of the model
+        num_process: int (number of processes; None is the number of CPUs)
+
+        Returns
+        -------
+        batch.BatchResult
+            values: np.ndarray (num_parameter_set, num_time, num_selection)
+            is_failed: np.ndarray-bool (num_parameter_set)
+        """
+        if parameter_names is None:
+            if isinstance(parameter_matrix, pd.DataFrame):
+                parameter_names = list(parameter_matrix.columns)
+            else:
+                parameter_names = self.parameter_names
+        if selections is None:
+            selections = self.species_names
+        selections = list(selections)
+        values, is_failed = batch.simulateBatch(self.roadrunner,
+              list(parameter_names), np.array(parameter_matrix), times,
+              self._makeSelections(selections), num_process=num_process)
+        return batch.BatchResult(values=values, is_failed=is_failed,
+              times=np.array(times, dtype=float), names=selections,
+              parameter_names=list(parameter_names))
+
+    def calculateSensitivities(self, start_time, end_time, num_point,
+          parameter_names=None, variables=None, method=sensitivity.METHOD_AUTO,
+          relative_step=cn.SENSITIVITY_RELATIVE_STEP,
+          absolute_step=cn.SENSITIVITY_ABSOLUTE_STEP, is_central=True,
+          num_process=1):
+        """
+        Calculates the local sensitivities of variables to parameters
+        for a simulation from time 0 values. The model is not changed.
+
+        Parameters
+        ----------
+        start_time: float
+        end_time: float
+        num_point: int
+        parameter_names: list-str (default is parameter_names of the model)
+        variables: list-str (default is all species)
+        method: str (see sensitivity.METHODS)
+        relative_step: float (finite difference step as a fraction of the value)
+        absolute_step: float (minimum finite difference step)
+        is_central: bool (central differences; otherwise, forward differences)
+        num_process: int (number of processes for finite differences)
+
+        Returns
+        -------
+        sensitivity.SensitivityResult
+            values: np.ndarray (num_time, num_variable, num_parameter)
+        """
+        if parameter_names is None:
+            parameter_names = self.parameter_names
+        parameter_names = list(parameter_names)
+        if variables is None:
+            variables = self.species_names
+        variables = list(variables)
+        times = np.linspace(start_time, end_time, num_point)
+        values, method = sensitivity.calculateSensitivities(self.roadrunner,
+              parameter_names, times, self._makeSelections(variables),
+              method=method, relative_step=relative_step,
+              absolute_step=absolute_step, is_central=is_central,
+              num_process=num_process)
+        return sensitivity.SensitivityResult(values=values, times=times,
+              names=variables, parameter_names=parameter_names, method=method)
+
+    def makeGlobalSensitivity(self, parameter_dct, feature_dct, start_time,
+          end_time, num_point, variables=None):
+        """
+        Constructs a global sensitivity analysis of features of simulations
+        from time 0 values. Use calculateSobol or calculateMorris of the
+        result to calculate indices. The model is not changed.
+
+        Parameters
+        ----------
+        parameter_dct: dict
+            key: parameter name
+            value: (lower, upper)
+        feature_dct: dict
+            key: feature name
+            value: Function
+                np.ndarray (num_time, num_variable; columns are variables)
+                returns: float
+        start_time: float
+        end_time: float
+        num_point: int
+        variables: list-str (default is all species)
+
+        Returns
+        -------
+        GlobalSensitivity
+        """
+        if variables is None:
+            variables = self.species_names
+        times = np.linspace(start_time, end_time, num_point)
+        return GlobalSensitivity(self.roadrunner, parameter_dct, times,
+              self._makeSelections(list(variables)), feature_dct)
+
+    def steadyStateBatch(self, parameter_matrix, selections=None,
+          parameter_names=None, is_warm_start=True,
+          tolerance=cn.STEADY_STATE_TOLERANCE,
+          integration_time=cn.STEADY_STATE_INTEGRATION_TIME):
+        """
+        Finds the steady state for each set of parameter values. Sets are
+        solved in an order in which each set is near the previous one,
+        starting from the previous steady state. The model is not changed.
+
+        Parameters
+        ----------
+        parameter_matrix: np.ndarray/pd.DataFrame (num_parameter_set, num_parameter)
+            columns of a DataFrame are parameter names
+        selections: list-str (variables in the result; default is species)
+        parameter_names: list-str (names of the columns of parameter_matrix)
+            default is the DataFrame columns or parameter_names of the model
+        is_warm_start: bool (start from the previous steady state if initial
+            values are unchanged)
+        tolerance: float (maximum norm of rates of change at a steady state)
+        integration_time: float (simulation time if the solver fails)
+
+        Returns
+        -------
+        steady_state.SteadyStateResult
+            values: np.ndarray (num_parameter_set, num_selection)
+            is_converged: np.ndarray-bool (num_parameter_set)
+        """
+        if parameter_names is None:
+            if isinstance(parameter_matrix, pd.DataFrame):
+                parameter_names = list(parameter_matrix.columns)
+            else:
+                parameter_names = self.parameter_names
+        if selections is None:
+            selections = self.species_names
+        selections = list(selections)
+        parameter_matrix = np.array(parameter_matrix, dtype=float)
+        if parameter_matrix.ndim != 2:
+            raise ValueError("parameter_matrix must have 2 dimensions.")
+        parameter_indices = batch.getParameterIndices(self.roadrunner,
+              list(parameter_names))
+        roadrunner = cloneRoadrunner(self.roadrunner)
+        values, is_converged, residuals, methods, order =  \
+              steady_state.solveSteadyStates(roadrunner, parameter_indices,
+              parameter_matrix, self._makeSelections(selections),
+              is_warm_start=is_warm_start, tolerance=tolerance,
+              integration_time=integration_time)
+        return steady_state.SteadyStateResult(values=values,
+              is_converged=is_converged, residuals=residuals, methods=methods,
+              order=order, names=selections,
+              parameter_names=list(parameter_names))
+
+    def simulateEnsemble(self, start_time, end_time, num_point, num_trajectory,
+          variables=None, seed=None, num_process=1, is_keep=True,
+          probabilities=cn.ENSEMBLE_PROBABILITIES,
+          max_sample=cn.ENSEMBLE_MAX_SAMPLE):
+        """
+        Simulates an ensemble of stochastic (Gillespie) trajectories
+        from time 0 values. The model is not changed.
+
+        Parameters
+        ----------
+        start_time: float
+        end_time: float
+        num_point: int (number of points in a trajectory)
+        num_trajectory: int
+        variables: list-str (variables recorded; default is all species)
+        seed: int (seed of the ensemble; None is not reproducible)
+        num_process: int (number of processes; None is the number of CPUs)
+        is_keep: bool (keep all trajectories; otherwise, only statistics)
+        probabilities: list-float (probabilities of the quantiles)
+        max_sample: int (maximum number of trajectories used for quantiles)
+
+        Returns
+        -------
+        ensemble.EnsembleResult
+            values: np.ndarray (num_trajectory, num_time, num_variable)
+            mean, variance: np.ndarray (num_time, num_variable)
+            quantiles: np.ndarray (num_probability, num_time, num_variable)
+        """
+        if variables is None:
+            variables = self.species_names
+        variables = list(variables)
+        times = np.linspace(start_time, end_time, num_point)
+        result = ensemble.simulateEnsemble(self.roadrunner, num_trajectory,
+              times, self._makeSelections(variables), seed=seed,
+              num_process=num_process, is_keep=is_keep,
+              probabilities=probabilities, max_sample=max_sample)
+        return result._replace(names=variables)
+
+    def fit(self, observed_ts, parameters, num_start=1, num_process=1, seed=None,
+          method=fitter.METHOD_LEASTSQ):
+        """
+        Fits parameters to observed values. The model is not changed; use
+        set(result.parameter_dct) to assign the fitted values.
+
+        Parameters
+        ----------
+        observed_ts: Timeseries (columns are model variables; nan is missing)
+        parameters: lmfit.Parameters/dict
+            key: parameter name
+            value: (lower, upper) or (lower, initial, upper)
+        num_start: int (number of starting values for the optimization)
+        num_process: int (number of processes; None is the number of CPUs)
+        seed: int (seed of the random starting values)
+        method: str (lmfit minimization method)
+
+        Returns
+        -------
+        fitter.FitResult
+            parameter_dct: dict (fitted values)
+            rssq: float (residual sum of squares)
+        """
+        model_fitter = fitter.Fitter(self, observed_ts, parameters,
+              method=method)
+        return model_fitter.fit(num_start=num_start, num_process=num_process,
+              seed=seed)
+
+    def continueSimulation(self, duration, num_point, ts=None, variables=None):
+        """
+        Simulates from the current time for a duration. The result
+        does not include the current time.
+
+        Parameters
+        ----------
+        duration: float (simulation time)
+        num_point: int (number of points in the result)
+        ts: Timeseries (result of previous simulation)
+        variables: list-str (variables recorded; default is all species)
+
+        Returns
+        -------
+        Timeseries (or None if fail to converge)
+            new points if ts is None; otherwise, ts with the new points appended
+        """
+        start_time = self.getTime()
+        segment_ts = self._simulateSegment(start_time, start_time + duration,
+              num_point, variables=variables)
+        if segment_ts is None:
+            return None
+        if ts is None:
+            return segment_ts
+        return Timeseries(pd.concat([ts, segment_ts]))
+
+    def _simulateSegment(self, start_time, end_time, num_point,
+          variables=None):
+        """
+        Simulates from the current state, which is at start_time.
+
+        Parameters
+        ----------
+        start_time: float (current time)
+        end_time: float
+        num_point: int (number of points, excluding start_time)
+        variables: list-str (variables recorded; default is all species)
+
+        Returns
+        -------
+        Timeseries (or None if fail to converge; excludes start_time)
+        """
+        segment_ts = self.simulate(start_time, end_time, num_point + 1,
+              is_continue=True, variables=variables)
+        if segment_ts is None:
+            return None
+        return Timeseries(segment_ts.iloc[1:])
+
+    def iterateSimulation(self, end_time, segment_duration, num_point,
+          variables=None):
+        """
+        Simulates from the current time to end_time in segments. Segments
+        are produced as they are simulated so that long simulations
+        can be processed in bounded memory. Segment boundaries are on a
+        fixed grid from the current time so that the times of points do
+        not accumulate rounding errors.
+
+        Parameters
+        ----------
+        end_time: float
+        segment_duration: float (simulation time of a segment)
+        num_point: int (number of points in a segment)
+        variables: list-str (variables recorded; default is all species)
+
+        Returns
+        -------
+        Timeseries (segment that does not include its start time)
+        """
+        if segment_duration <= 0:
+            raise ValueError("segment_duration must be positive.")
+        origin_time = self.getTime()
+        tolerance = 1e-9*max(1.0, np.abs(end_time))
+        num_segment = int(np.ceil((end_time - origin_time - tolerance)
+              /segment_duration))
+        for segment_idx in range(num_segment):
+            # Boundaries are computed from the segment number
+            start_time = origin_time + segment_idx*segment_duration
+            segment_end_time = min(origin_time
+                  + (segment_idx + 1)*segment_duration, end_time)
+            duration = segment_end_time - start_time
+            # Keep the same spacing of points in a partial segment
+            segment_num_point = max(1,
+                  int(np.round(num_point*duration/segment_duration)))
+            segment_ts = self._simulateSegment(start_time, segment_end_time,
+                  segment_num_point, variables=variables)
+            if segment_ts is None:
+                raise RuntimeError("Simulation failed at time %f."
+                      % start_time)
+            yield segment_ts
+
+    def _makeProcessModel(self):
+        """
+        Creates a model to send to another process. It shares the
+        roadrunner of this model, which is pickled by the executor; so,
+        the process has its own copy. Locks cannot be pickled, and so
+        the model has no result cache and is not thread safe.
+
+        Returns
+        -------
+        Model
+        """
+        model = copy.copy(self)
+        model.__dict__[PRIVATE_ROADRUNNER] = self.roadrunner
+        model.__dict__[ROADRUNNER_THREADS] = None
+        model.__dict__[RESULT_CACHE] = None
+        return model
+
+    async def _arun(self, method_name, pargs, kwargs, simulator,
+          is_copy=True):
+        """
+        Runs a method in an AsyncSimulator. The event loop is not blocked
+        by copying the model.
+
+        Parameters
+        ----------
+        method_name: str
+        pargs: list (positional arguments)
+        kwargs: dict (keyword arguments)
+        simulator: AsyncSimulator (default is async_simulation.DEFAULT_SIMULATOR)
+        is_copy: bool (the method changes the model and so runs on a copy)
+
+        Returns
+        -------
+        object
+        """
+        if simulator is None:
+            simulator = async_simulation.DEFAULT_SIMULATOR
+        model = self
+        if simulator.is_process:
+            model = self._makeProcessModel()
+            is_copy = False
+        elif self.is_thread_safe:
+            # Each thread of the executor has its own roadrunner
+            is_copy = False
+        # Concurrent runs do not share a roadrunner; the copy is made
+        # in the executor
+        return await simulator.run(_callModel, model, method_name, pargs,
+              kwargs, is_copy=is_copy)
+
+    async def asimulate(self, *pargs, simulator=None, **kwargs):
+        """
+        Coroutine that runs simulate on a copy of the model in an executor.
+        The copy is made in the executor, and so the model should not be
+        changed until the coroutine completes. The state of this model is
+        not changed.
+
+        Parameters
+        ----------
+        pargs: list (positional arguments for simulate)
+        simulator: AsyncSimulator (default is async_simulation.DEFAULT_SIMULATOR)
+        kwargs: dict (keyword arguments for simulate)
+
+        Returns
+        -------
+        Timeseries (or None if fail to converge)
+        """
+        return await self._arun("simulate", pargs, kwargs, simulator)
+
+    async def asimulateBatch(self, *pargs, simulator=None, **kwargs):
+        """
+        Coroutine that runs simulateBatch in an executor. The model is not
+        copied since simulateBatch does not change it; the model should not
+        be changed until the coroutine completes.
+
+        Parameters
+        ----------
+        pargs: list (positional arguments for simulateBatch)
+        simulator: AsyncSimulator (default is async_simulation.DEFAULT_SIMULATOR)
+        kwargs: dict (keyword arguments for simulateBatch)
+
+        Returns
+        -------
+        batch.BatchResult
+        """
+        return await self._arun("simulateBatch", pargs, kwargs, simulator,
+              is_copy=False)
+
     @classmethod
     def getBiomodel(cls, model_num):
         """
@@ -294,23 +1092,11 @@ class Model(rpickle.RPickler):
         -------
         Model
         """
-        if model_num in BIOMODEL_EXCLUDE_DF[MODEL_NUM].values:
+        archive = biomodel_archive.getDefaultArchive()
+        model_str = archive.getModelString(model_num)
+        if model_str is None:
             return None
-        ffile = PREFIX % model_num
-        archive_path = os.path.join(cn.DATA_DIR, "biomodels.zip")
-        with zipfile.ZipFile(archive_path) as myzip:
-            try:
-                with myzip.open(ffile) as myfile:
-                    byte_lines = (myfile.readlines())
-            except KeyError:
-                    byte_lines = []
-        if len(byte_lines) > 0:
-            lines = [l.decode() for l in byte_lines]
-            model_str = "\n".join(lines)
-            model = Model(model_str, biomodel_num=model_num)
-        else:
-            model = None
-        return model
+        return Model(model_str, biomodel_num=model_num)
 
     @classmethod
     def iterateBiomodels(cls, start_num=1, num_model=1, is_allerror=False):
@@ -339,3 +1125,42 @@ class Model(rpickle.RPickler):
                 yield model_num, model
             except exceptions:
                 yield model_num, None
+
+    @classmethod
+    def iterateBiomodelsParallel(cls, start_num=1, num_model=1, function=None,
+          num_process=None, timeout=None, is_ordered=False):
+        """
+        Loads BioModels in parallel processes and optionally applies a function
+        to each model in the worker process. A model that exceeds the timeout
+        has its worker killed. num_model is the total number of models attempted.
+
+        Parameters
+        ----------
+        start_num: int (number of the starting model)
+        num_model: int (number of models to provide)
+        function: Function (must be picklable)
+            Model
+            returns: object (must be picklable)
+        num_process: int (maximum number of concurrent workers; default is CPUs)
+        timeout: float (seconds allowed for one model)
+        is_ordered: bool (provide results in order of model number)
+
+        Returns
+        -------
+        parallel.TaskResult
+            argument: int (biomodel number)
+            status: str (ok, error, timeout, skipped if no model)
+            value: value of function (Model if function is None)
+        """
+        process_func = functools.partial(_processBiomodel, function=function)
+        model_nums = range(start_num, start_num + num_model)
+        for result in parallel.runTasks(process_func, model_nums,
+              num_process=num_process, timeout=timeout, is_ordered=is_ordered):
+            if result.status == parallel.STATUS_OK:
+                is_present, value = result.value
+                if is_present:
+                    result = result._replace(value=value)
+                else:
+                    result = result._replace(value=None,
+                          status=parallel.STATUS_SKIPPED)
+            yield result
@@ -0,0 +1,87 @@
+"""
+Noise added to simulation results.
+
+Replicates of a noisy trajectory are constructed in one broadcasted
+operation on an array of shape (num_replicate, num_time, num_variable).
+Noise models are:
+    uniform: value + noise_mag*std*U(-0.5, 0.5)
+    gaussian: value + noise_mag*std*N(0, 1)
+    multiplicative: value*(1 + noise_mag*std*N(0, 1))
+std is 1 for variables without a standard deviation.
+"""
+
+import collections
+import numpy as np
+
+NOISE_UNIFORM = "uniform"
+NOISE_GAUSSIAN = "gaussian"
+NOISE_MULTIPLICATIVE = "multiplicative"
+NOISE_MODELS = [NOISE_UNIFORM, NOISE_GAUSSIAN, NOISE_MULTIPLICATIVE]
+
+ReplicateResult = collections.namedtuple("ReplicateResult",
+      ["values", "times", "names"])
+ReplicateResult.__doc__ = """
+Noisy replicates of a simulation.
+
+values: np.ndarray (num_replicate, num_time, num_variable)
+times: np.ndarray (simulation times)
+names: list-str (variable names)
+"""
+
+
+def getRandomGenerator(rng=None):
+    """
+    Provides the source of random numbers.
+
+    Parameters
+    ----------
+    rng: int/np.random.Generator
+        None uses the global numpy random state
+
+    Returns
+    -------
+    np.random.Generator or np.random module
+    """
+    if rng is None:
+        return np.random
+    return np.random.default_rng(rng)
+
+def makeNoisyReplicates(values, num_replicate=1, noise_mag=1.0, std_arr=None,
+      noise_model=NOISE_UNIFORM, rng=None):
+    """
+    Constructs noisy replicates of a simulation result.
+
+    Parameters
+    ----------
+    values: np.ndarray (num_time, num_variable)
+    num_replicate: int
+    noise_mag: float (magnitude of the noise)
+    std_arr: np.ndarray (num_variable; standard deviation of each variable)
+    noise_model: str (in NOISE_MODELS)
+    rng: int/np.random.Generator (seed or generator of random numbers)
+
+    Returns
+    -------
+    np.ndarray (num_replicate, num_time, num_variable)
+    """
+    if not noise_model in NOISE_MODELS:
+        raise ValueError("noise_model must be one of %s" % str(NOISE_MODELS))
+    values = np.asarray(values, dtype=float)
+    generator = getRandomGenerator(rng)
+    size = (num_replicate,) + values.shape
+    if noise_model == NOISE_UNIFORM:
+        noise_arr = generator.random(size)
+        noise_arr -= 0.5
+    else:
+        noise_arr = generator.standard_normal(size)
+    scale = np.abs(noise_mag)
+    if std_arr is not None:
+        scale = scale*np.asarray(std_arr, dtype=float)
+    # Broadcast over replicates and times
+    noise_arr *= scale
+    if noise_model == NOISE_MULTIPLICATIVE:
+        noise_arr += 1.0
+        noise_arr *= values
+    else:
+        noise_arr += values
+    return noise_arr
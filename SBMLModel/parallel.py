@@ -0,0 +1,202 @@
+"""
+Runs tasks in parallel processes with per-task timeouts.
+
+Each task runs in its own worker process so that a task that exceeds its
+timeout can be killed without affecting other tasks. At most num_process
+workers run at the same time. Results are yielded as TaskResult records
+as they complete or in the order of the arguments.
+
+Usage:
+    for result in runTasks(function, arguments, num_process=4, timeout=60):
+        if result.status == STATUS_OK:
+            print(result.argument, result.value)
+"""
+
+import collections
+import multiprocessing
+from multiprocessing import connection as mp_connection
+import time
+import traceback
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_SKIPPED = "skipped"
+POLL_INTERVAL = 0.1  # seconds between checks of timeouts
+
+TaskResult = collections.namedtuple("TaskResult",
+      ["index", "argument", "status", "value", "error", "elapsed"])
+TaskResult.__doc__ = """
+Result of a task.
+
+index: int (position of the argument)
+argument: object (argument of the task)
+status: str (STATUS_OK, STATUS_ERROR, STATUS_TIMEOUT, STATUS_SKIPPED)
+value: object (value returned by the task; None if not STATUS_OK)
+error: str (description of the failure; None if no failure)
+elapsed: float (seconds)
+"""
+
+
+def getNumProcess(num_process=None):
+    """
+    Provides the number of processes to use.
+
+    Parameters
+    ----------
+    num_process: int (None means the number of CPUs)
+
+    Returns
+    -------
+    int
+    """
+    if num_process is None:
+        num_process = multiprocessing.cpu_count()
+    return max(1, int(num_process))
+
+def _runTask(function, argument, conn):
+    """
+    Runs a task in a worker process and sends the result to the parent.
+
+    Parameters
+    ----------
+    function: Function
+    argument: object
+    conn: Connection
+    """
+    try:
+        value = function(argument)
+        message = (STATUS_OK, value, None)
+    except Exception:
+        message = (STATUS_ERROR, None, traceback.format_exc())
+    try:
+        conn.send(message)
+    except Exception:
+        # The value cannot be pickled
+        conn.send((STATUS_ERROR, None, traceback.format_exc()))
+    conn.close()
+
+
+class _Worker(object):
+    # A worker process running one task
+
+    def __init__(self, context, function, index, argument):
+        self.index = index
+        self.argument = argument
+        self.conn, child_conn = context.Pipe(duplex=False)
+        self.process = context.Process(target=_runTask,
+              args=(function, argument, child_conn), daemon=True)
+        self.start_time = time.time()
+        self.process.start()
+        child_conn.close()
+
+    @property
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def receive(self):
+        """
+        Obtains the result of a completed task.
+
+        Returns
+        -------
+        TaskResult
+        """
+        try:
+            status, value, error = self.conn.recv()
+        except EOFError:
+            status = STATUS_ERROR
+            value = None
+            error = "Worker process exited unexpectedly."
+        self.conn.close()
+        self.process.join()
+        return TaskResult(index=self.index, argument=self.argument,
+              status=status, value=value, error=error, elapsed=self.elapsed)
+
+    def kill(self):
+        """
+        Terminates the worker.
+
+        Returns
+        -------
+        TaskResult
+        """
+        elapsed = self.elapsed
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        return TaskResult(index=self.index, argument=self.argument,
+              status=STATUS_TIMEOUT, value=None,
+              error="Exceeded timeout after %2.2f seconds." % elapsed,
+              elapsed=elapsed)
+
+
+def runTasks(function, arguments, num_process=None, timeout=None,
+      is_ordered=False):
+    """
+    Runs function(argument) for each argument in separate processes.
+    The function and its values must be picklable if the multiprocessing
+    start method is not fork.
+
+    Parameters
+    ----------
+    function: Function
+        argument: object
+        returns: object
+    arguments: iterable-object
+    num_process: int (maximum number of concurrent workers; default is CPUs)
+    timeout: float (seconds a task may run before it is killed)
+    is_ordered: bool (yield results in the order of the arguments)
+
+    Returns
+    -------
+    generator of TaskResult
+    """
+    context = multiprocessing.get_context()
+    num_process = getNumProcess(num_process)
+    argument_iter = iter(enumerate(arguments))
+    is_exhausted = False
+    workers = []
+    done_dct = {}  # key: index, value: TaskResult (for ordered results)
+    next_index = 0
+    try:
+        while True:
+            # Start workers
+            while (not is_exhausted) and (len(workers) < num_process):
+                try:
+                    index, argument = next(argument_iter)
+                except StopIteration:
+                    is_exhausted = True
+                    break
+                workers.append(_Worker(context, function, index, argument))
+            if len(workers) == 0:
+                break
+            # Wait for results
+            wait_time = POLL_INTERVAL
+            if timeout is None:
+                wait_time = None
+            ready_conns = mp_connection.wait([w.conn for w in workers],
+                  timeout=wait_time)
+            results = []
+            for worker in list(workers):
+                if worker.conn in ready_conns:
+                    results.append(worker.receive())
+                    workers.remove(worker)
+                elif (timeout is not None) and (worker.elapsed > timeout):
+                    results.append(worker.kill())
+                    workers.remove(worker)
+            # Provide the results
+            for result in results:
+                if not is_ordered:
+                    yield result
+                else:
+                    done_dct[result.index] = result
+            while next_index in done_dct:
+                yield done_dct.pop(next_index)
+                next_index += 1
+    finally:
+        # Generator closed early or failed
+        for worker in workers:
+            worker.process.kill()
+            worker.process.join()
+            worker.conn.close()
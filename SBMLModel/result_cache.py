@@ -0,0 +1,181 @@
+"""
+Cache of simulation results.
+
+Entries are keyed by a hash of the structure of the model, the values of its
+parameters and initial state, and the arguments of the simulation. Since the
+values are part of the key, changing a value (e.g., with Model.set) means
+that earlier entries no longer match. Entries are kept in memory with least
+recently used eviction when the total size exceeds a bound. Optionally,
+entries are also saved in a directory so that they persist across processes.
+
+Usage:
+    cache = ResultCache(max_size=1e8)
+    model.result_cache = cache
+    ts = model.simulate(0, 10, 100)  # Simulates
+    ts = model.simulate(0, 10, 100)  # From the cache
+"""
+
+import SBMLModel.constants as cn
+from SBMLModel.timeseries import Timeseries
+
+import collections
+import copy
+import hashlib
+import numpy as np
+import os
+import pickle
+import tempfile
+import threading
+
+FILE_EXTENSION = ".result"
+
+
+def makeKey(*pargs):
+    """
+    Constructs a key from strings, numbers, and arrays.
+
+    Parameters
+    ----------
+    pargs: list-(str/float/np.ndarray/list/tuple)
+
+    Returns
+    -------
+    str
+    """
+    hasher = hashlib.sha256()
+    for arg in pargs:
+        if isinstance(arg, np.ndarray):
+            hasher.update(np.ascontiguousarray(arg, dtype=float).tobytes())
+        else:
+            hasher.update(repr(arg).encode())
+        hasher.update(b"|")
+    return hasher.hexdigest()
+
+
+class ResultCache(object):
+
+    def __init__(self, max_size=cn.RESULT_CACHE_MAX_SIZE, directory=None):
+        """
+        Parameters
+        ----------
+        max_size: int (maximum number of bytes of entries in memory)
+        directory: str (directory in which entries are saved; None is memory only)
+        """
+        self.max_size = max_size
+        self.directory = directory
+        self.num_hit = 0
+        self.num_miss = 0
+        self.size = 0
+        # key: str, value: (entry, size)
+        self._entry_dct = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entry_dct)
+
+    def __repr__(self):
+        return "ResultCache(size=%d, hit=%d, miss=%d)" % (self.size,
+              self.num_hit, self.num_miss)
+
+    @staticmethod
+    def _getSize(entry):
+        """
+        Estimates the bytes used by an entry.
+
+        Parameters
+        ----------
+        entry: tuple (Timeseries, RoadrunnerState)
+
+        Returns
+        -------
+        int
+        """
+        ts, state = entry
+        return int(ts.memory_usage(deep=True).sum()) + state.size
+
+    def _makePath(self, key):
+        return os.path.join(self.directory, key + FILE_EXTENSION)
+
+    def _add(self, key, entry):
+        size = self._getSize(entry)
+        if size > self.max_size:
+            return
+        if key in self._entry_dct:
+            self.size -= self._entry_dct.pop(key)[1]
+        self._entry_dct[key] = (entry, size)
+        self.size += size
+        while self.size > self.max_size:
+            _, (_, old_size) = self._entry_dct.popitem(last=False)
+            self.size -= old_size
+
+    def get(self, key):
+        """
+        Finds the entry for a key.
+
+        Parameters
+        ----------
+        key: str
+
+        Returns
+        -------
+        tuple (None if there is no entry)
+            Timeseries: copy of the simulation result
+            RoadrunnerState: state at the end of the simulation
+        """
+        with self._lock:
+            entry = None
+            if key in self._entry_dct:
+                self._entry_dct.move_to_end(key)
+                entry = self._entry_dct[key][0]
+            elif self.directory is not None:
+                try:
+                    with open(self._makePath(key), "rb") as fd:
+                        entry = pickle.load(fd)
+                    self._add(key, entry)
+                except (OSError, EOFError, pickle.UnpicklingError):
+                    entry = None
+            if entry is None:
+                self.num_miss += 1
+                return None
+            self.num_hit += 1
+        ts, state = entry
+        return Timeseries(ts.copy()), state
+
+    def put(self, key, ts, state):
+        """
+        Adds an entry.
+
+        Parameters
+        ----------
+        key: str
+        ts: Timeseries (simulation result)
+        state: RoadrunnerState (state at the end of the simulation)
+        """
+        entry = (Timeseries(ts.copy()), copy.deepcopy(state))
+        with self._lock:
+            self._add(key, entry)
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as tmp_fd:
+                    pickle.dump(entry, tmp_fd)
+                os.replace(tmp_path, self._makePath(key))
+            except Exception:
+                if os.path.isfile(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def clear(self):
+        """
+        Deletes all entries, including those in the directory.
+        """
+        with self._lock:
+            self._entry_dct.clear()
+            self.size = 0
+            self.num_hit = 0
+            self.num_miss = 0
+        if (self.directory is not None) and os.path.isdir(self.directory):
+            for ffile in os.listdir(self.directory):
+                if ffile.endswith(FILE_EXTENSION):
+                    os.remove(os.path.join(self.directory, ffile))
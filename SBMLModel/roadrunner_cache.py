@@ -0,0 +1,280 @@
+"""
+On-disk cache of compiled roadrunner models.
+
+Compiling a model (parsing Antimony/SBML and JIT compilation) is the dominant
+cost of creating a roadrunner. The cache stores the saved state of a compiled
+roadrunner in a directory. Entries are content addressed by a hash of the
+normalized model text, the roadrunner version, and the integrator. So, a
+different process that loads the same model restores the saved state instead
+of compiling.
+
+The size of the directory is bounded. When the bound is exceeded, the
+least recently used entries are deleted. The cache is best effort: if
+the directory cannot be read or written, a warning is issued and the
+roadrunner is compiled as if there were no cache.
+
+Usage:
+    cache = RoadrunnerCache(directory=path)
+    key = cache.makeKey(model_str, kind="ant")
+    roadrunner = cache.get(key)
+    if roadrunner is None:
+        roadrunner = te.loada(model_str)
+        cache.put(key, roadrunner)
+"""
+
+import SBMLModel.constants as cn
+
+import hashlib
+import os
+import tempfile
+import warnings
+
+FILE_EXTENSION = ".rrstate"
+
+
+def normalizeModelString(model_str):
+    """
+    Normalizes the text of a model so that differences in line endings,
+    trailing white space, and blank lines do not change the cache key.
+
+    Parameters
+    ----------
+    model_str: str
+
+    Returns
+    -------
+    str
+    """
+    lines = model_str.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    lines = [l.rstrip() for l in lines]
+    lines = [l for l in lines if len(l) > 0]
+    return "\n".join(lines)
+
+
+class RoadrunnerCache(object):
+
+    def __init__(self, directory=cn.ROADRUNNER_CACHE_DIR,
+          max_size=cn.ROADRUNNER_CACHE_MAX_SIZE,
+          is_enabled=cn.IS_ROADRUNNER_CACHE,
+          integrator=cn.ROADRUNNER_CACHE_INTEGRATOR):
+        """
+        Parameters
+        ----------
+        directory: str (directory in which entries are saved)
+        max_size: int (maximum number of bytes in the directory)
+        is_enabled: bool (False means that get and put do nothing)
+        integrator: str (name of the integrator of cached roadrunners)
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.is_enabled = is_enabled
+        self.integrator = integrator
+        self.num_hit = 0
+        self.num_miss = 0
+
+    def __repr__(self):
+        return "RoadrunnerCache(%s, hit=%d, miss=%d)" % (self.directory,
+              self.num_hit, self.num_miss)
+
+    @staticmethod
+    def _getRoadrunnerVersion():
+        import roadrunner
+        return roadrunner.__version__
+
+    def makeKey(self, model_str, kind=""):
+        """
+        Constructs the key for the text of a model.
+
+        Parameters
+        ----------
+        model_str: str (Antimony or SBML)
+        kind: str (type of the model text, such as "ant" or "xml")
+
+        Returns
+        -------
+        str
+        """
+        parts = [kind, self._getRoadrunnerVersion(), self.integrator,
+              normalizeModelString(model_str)]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def _warn(self, error):
+        warnings.warn("Roadrunner cache in %s is not used: %s"
+              % (self.directory, str(error)))
+
+    def _makePath(self, key):
+        return os.path.join(self.directory, key + FILE_EXTENSION)
+
+    def _getEntries(self):
+        """
+        Finds the entries in the cache directory.
+
+        Returns
+        -------
+        list-tuple
+            str: path
+            float: time of last use
+            int: size in bytes
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for ffile in os.listdir(self.directory):
+            if not ffile.endswith(FILE_EXTENSION):
+                continue
+            path = os.path.join(self.directory, ffile)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # Deleted by another process
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    @property
+    def size(self):
+        """
+        Number of bytes used by the cache.
+
+        Returns
+        -------
+        int
+        """
+        return sum([e[2] for e in self._getEntries()])
+
+    def get(self, key):
+        """
+        Restores a roadrunner from the cache.
+
+        Parameters
+        ----------
+        key: str
+
+        Returns
+        -------
+        ExtendedRoadrunner (None if there is no entry)
+        """
+        if not self.is_enabled:
+            return None
+        # tellurium replaces RoadRunner with ExtendedRoadRunner
+        import tellurium
+        import roadrunner
+        path = self._makePath(key)
+        try:
+            with open(path, "rb") as fd:
+                state = fd.read()
+        except FileNotFoundError:
+            self.num_miss += 1
+            return None
+        except OSError as error:
+            self._warn(error)
+            self.num_miss += 1
+            return None
+        try:
+            rr = roadrunner.RoadRunner()
+            rr.loadStateS(state)
+        except Exception:
+            # Entry is corrupted or incompatible
+            self.remove(key)
+            self.num_miss += 1
+            return None
+        # Record the use for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.num_hit += 1
+        return rr
+
+    def put(self, key, roadrunner):
+        """
+        Saves the state of a roadrunner in the cache. The roadrunner
+        should not have been simulated.
+
+        Parameters
+        ----------
+        key: str
+        roadrunner: ExtendedRoadrunner
+        """
+        if not self.is_enabled:
+            return
+        if roadrunner.getIntegrator().getName() != self.integrator:
+            return
+        state = roadrunner.saveStateS()
+        if len(state) > self.max_size:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file so that other processes never see
+            # a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError as error:
+            self._warn(error)
+            return
+        try:
+            with os.fdopen(fd, "wb") as tmp_fd:
+                tmp_fd.write(state)
+            os.replace(tmp_path, self._makePath(key))
+        except OSError as error:
+            self._warn(error)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def remove(self, key):
+        """
+        Deletes an entry if it is present.
+
+        Parameters
+        ----------
+        key: str
+        """
+        path = self._makePath(key)
+        if os.path.isfile(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def evict(self):
+        """
+        Deletes the least recently used entries until the cache
+        is within its size bound.
+        """
+        try:
+            entries = self._getEntries()
+        except OSError as error:
+            self._warn(error)
+            return
+        total_size = sum([e[2] for e in entries])
+        entries.sort(key=lambda e: e[1])
+        for path, _, size in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as error:
+                self._warn(error)
+                return
+            total_size -= size
+
+    def clear(self):
+        """
+        Deletes all entries and resets the counters.
+        """
+        for path, _, _ in self._getEntries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.num_hit = 0
+        self.num_miss = 0
+
+
+# Cache used by makeRoadrunner if none is specified
+DEFAULT_CACHE = RoadrunnerCache()
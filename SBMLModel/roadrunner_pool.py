@@ -0,0 +1,130 @@
+"""
+In-process pool of compiled roadrunner models.
+
+The pool keeps the saved state of a template roadrunner for each model
+reference. A checkout creates an independent roadrunner from the template
+state without compiling the model. The number of templates is bounded;
+the least recently used template is evicted when the bound is exceeded.
+
+Usage:
+    pool = RoadrunnerPool()
+    roadrunner = pool.checkout(model_reference)
+"""
+
+import SBMLModel.constants as cn
+from SBMLModel.make_roadrunner import makeRoadrunner, cloneRoadrunner
+
+import collections
+import os
+import threading
+
+
+class RoadrunnerPool(object):
+
+    def __init__(self, max_size=cn.ROADRUNNER_POOL_MAX_SIZE,
+          is_enabled=cn.IS_ROADRUNNER_POOL):
+        """
+        Parameters
+        ----------
+        max_size: int (maximum number of templates)
+        is_enabled: bool (False means that checkout always makes a roadrunner)
+        """
+        self.max_size = max_size
+        self.is_enabled = is_enabled
+        self.num_hit = 0
+        self.num_miss = 0
+        # key: pool key, value: saved state of the template roadrunner
+        self._template_dct = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "RoadrunnerPool(size=%d, hit=%d, miss=%d)" % (len(self),
+              self.num_hit, self.num_miss)
+
+    def __len__(self):
+        return len(self._template_dct)
+
+    def __contains__(self, model_reference):
+        return self._makeKey(model_reference) in self._template_dct
+
+    @staticmethod
+    def _makeKey(model_reference):
+        """
+        Constructs the pool key for a model reference. Files are keyed
+        by their modification time as well so that a changed file
+        is not served from a stale template.
+
+        Parameters
+        ----------
+        model_reference: str/ExtendedRoadrunner
+
+        Returns
+        -------
+        str (None if the reference cannot be pooled)
+        """
+        if not isinstance(model_reference, str):
+            return None
+        if os.path.isfile(model_reference):
+            return "%s:%f" % (os.path.abspath(model_reference),
+                  os.path.getmtime(model_reference))
+        return model_reference
+
+    def checkout(self, model_reference):
+        """
+        Provides a roadrunner for the model reference that is independent
+        of all other roadrunners provided.
+
+        Parameters
+        ----------
+        model_reference: str/ExtendedRoadrunner (see makeRoadrunner)
+
+        Returns
+        -------
+        ExtendedRoadrunner
+        """
+        key = self._makeKey(model_reference)
+        if (not self.is_enabled) or (key is None):
+            return makeRoadrunner(model_reference)
+        with self._lock:
+            state = self._template_dct.get(key)
+            if state is not None:
+                self._template_dct.move_to_end(key)
+                self.num_hit += 1
+        if state is not None:
+            return cloneRoadrunner(None, state=state)
+        # Create the template outside the lock since compilation is slow
+        roadrunner = makeRoadrunner(model_reference)
+        state = roadrunner.saveStateS()
+        with self._lock:
+            self.num_miss += 1
+            self._template_dct[key] = state
+            self._template_dct.move_to_end(key)
+            while len(self._template_dct) > self.max_size:
+                self._template_dct.popitem(last=False)
+        return roadrunner
+
+    def remove(self, model_reference):
+        """
+        Deletes the template for a model reference if it is present.
+
+        Parameters
+        ----------
+        model_reference: str
+        """
+        key = self._makeKey(model_reference)
+        with self._lock:
+            if key in self._template_dct:
+                del self._template_dct[key]
+
+    def clear(self):
+        """
+        Deletes all templates and resets the counters.
+        """
+        with self._lock:
+            self._template_dct.clear()
+            self.num_hit = 0
+            self.num_miss = 0
+
+
+# Pool used by Model if none is specified
+DEFAULT_POOL = RoadrunnerPool()
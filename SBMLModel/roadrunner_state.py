@@ -0,0 +1,148 @@
+"""
+Snapshot of the simulation state of a roadrunner.
+
+Saving and loading the full roadrunner state (saveStateS, loadStateS) is exact
+but can take longer than the simulation it replaces. A RoadrunnerState
+instead records the values that determine future simulation results: the
+time and the values of floating species, boundary species, global parameters,
+and compartments that are not defined by assignment rules. Restoring these
+values is fast. Models with events use the full saved state because the
+state of event triggers cannot be set from python.
+
+Usage:
+    index_dct = RoadrunnerState.makeIndexDct(roadrunner)
+    state = RoadrunnerState.capture(roadrunner, index_dct=index_dct)
+    ...
+    state.restore(roadrunner)
+"""
+
+import numpy as np
+
+# Kinds of values
+FLOATING = "floating"
+BOUNDARY = "boundary"
+PARAMETER = "parameter"
+COMPARTMENT = "compartment"
+# Functions of ExecutableModel used for each kind of value
+GETTER_DCT = {
+      FLOATING: "getFloatingSpeciesAmounts",
+      BOUNDARY: "getBoundarySpeciesAmounts",
+      PARAMETER: "getGlobalParameterValues",
+      COMPARTMENT: "getCompartmentVolumes",
+      }
+SETTER_DCT = {
+      FLOATING: "setFloatingSpeciesAmounts",
+      BOUNDARY: "setBoundarySpeciesAmounts",
+      PARAMETER: "setGlobalParameterValues",
+      COMPARTMENT: "setCompartmentVolumes",
+      }
+
+
+class RoadrunnerState(object):
+
+    def __init__(self, time, value_dct=None, saved_state=None):
+        """
+        Parameters
+        ----------
+        time: float (simulation time)
+        value_dct: dict
+            key: kind of value
+            value: (np.ndarray-int, np.ndarray-float) indices and values
+        saved_state: bytes (full saved state of the roadrunner)
+        """
+        self.time = time
+        self.value_dct = value_dct
+        self.saved_state = saved_state
+
+    def __repr__(self):
+        return "RoadrunnerState(time=%s)" % str(self.time)
+
+    @property
+    def size(self):
+        """
+        Approximate number of bytes used by the state.
+
+        Returns
+        -------
+        int
+        """
+        if self.saved_state is not None:
+            return len(self.saved_state)
+        return sum([i.nbytes + v.nbytes for i, v in self.value_dct.values()])
+
+    @staticmethod
+    def makeIndexDct(roadrunner):
+        """
+        Finds the indices of the values that can be set for each kind.
+        The result depends only on the structure of the model.
+
+        Parameters
+        ----------
+        roadrunner: ExtendedRoadrunner
+
+        Returns
+        -------
+        dict (None if the full saved state must be used)
+            key: kind of value
+            value: np.ndarray-int
+        """
+        model = roadrunner.model
+        if model.getNumEvents() > 0:
+            return None
+        excludes = set(roadrunner.getAssignmentRuleIds())
+        if roadrunner.conservedMoietyAnalysis:
+            excludes = excludes.union(roadrunner.getDependentFloatingSpeciesIds())
+        ids_dct = {
+              FLOATING: model.getFloatingSpeciesIds(),
+              BOUNDARY: model.getBoundarySpeciesIds(),
+              PARAMETER: model.getGlobalParameterIds(),
+              COMPARTMENT: model.getCompartmentIds(),
+              }
+        index_dct = {}
+        for kind, ids in ids_dct.items():
+            indices = [i for i, n in enumerate(ids) if not n in excludes]
+            index_dct[kind] = np.array(indices, dtype=np.int32)
+        return index_dct
+
+    @classmethod
+    def capture(cls, roadrunner, index_dct=None):
+        """
+        Records the current state of a roadrunner.
+
+        Parameters
+        ----------
+        roadrunner: ExtendedRoadrunner
+        index_dct: dict (from makeIndexDct; calculated if None)
+
+        Returns
+        -------
+        RoadrunnerState
+        """
+        if index_dct is None:
+            index_dct = cls.makeIndexDct(roadrunner)
+        time = roadrunner.model.getTime()
+        if index_dct is None:
+            return cls(time, saved_state=roadrunner.saveStateS())
+        value_dct = {}
+        for kind, indices in index_dct.items():
+            if len(indices) == 0:
+                continue
+            getter = getattr(roadrunner.model, GETTER_DCT[kind])
+            value_dct[kind] = (indices, np.array(getter(indices)))
+        return cls(time, value_dct=value_dct)
+
+    def restore(self, roadrunner):
+        """
+        Sets the roadrunner to this state.
+
+        Parameters
+        ----------
+        roadrunner: ExtendedRoadrunner (same model as the captured roadrunner)
+        """
+        if self.saved_state is not None:
+            roadrunner.loadStateS(self.saved_state)
+        else:
+            for kind, (indices, values) in self.value_dct.items():
+                setter = getattr(roadrunner.model, SETTER_DCT[kind])
+                setter(indices, values)
+        roadrunner.model.setTime(self.time)
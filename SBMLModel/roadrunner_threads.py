@@ -0,0 +1,123 @@
+"""
+Roadrunners for the threads that use one model.
+
+A roadrunner cannot be used by more than one thread at a time. RoadrunnerThreads
+provides each thread with its own roadrunner, cloned from the saved state of a
+template roadrunner so that the model is not compiled again. Values set
+through RoadrunnerThreads are applied to the template, and the latest value
+of each name is kept with the version in which it was set; the roadrunner of
+a thread applies the names set since the version it has seen the next time
+that thread accesses it. So, a thread never changes the roadrunner of another
+thread. Each thread also has its own CheckpointStore, which is cleared when
+new values are applied.
+
+Usage:
+    threads = RoadrunnerThreads(roadrunner)
+    roadrunner = threads.getRoadrunner()  # roadrunner of the calling thread
+    threads.set({"k1": 2})  # applied to all roadrunners
+"""
+
+from SBMLModel.checkpoint import CheckpointStore
+from SBMLModel.make_roadrunner import cloneRoadrunner
+from SBMLModel import util
+
+import threading
+
+
+class RoadrunnerThreads(object):
+
+    def __init__(self, roadrunner):
+        """
+        Parameters
+        ----------
+        roadrunner: ExtendedRoadrunner (template; only changed by set)
+        """
+        self.template = roadrunner
+        self.num_clone = 0
+        self._state = None  # saved state of the template
+        self.version = 0  # incremented by each set
+        self._value_dct = {}  # latest value of each name
+        self._version_dct = {}  # version in which each name was last set
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __repr__(self):
+        return "RoadrunnerThreads(clone=%d, version=%d)" % (self.num_clone,
+              self.version)
+
+    def _getLocal(self):
+        """
+        Provides the data of the calling thread, creating its roadrunner
+        if needed and applying values that it has not seen.
+
+        Returns
+        -------
+        threading.local
+            roadrunner: ExtendedRoadrunner
+            checkpoint_store: CheckpointStore
+            version: int (version of the values applied)
+        """
+        local = self._local
+        if not hasattr(local, "roadrunner"):
+            with self._lock:
+                if self._state is None:
+                    self._state = self.template.saveStateS()
+                state = self._state
+                time = self.template.model.getTime()
+                version = self.version
+                self.num_clone += 1
+            roadrunner = cloneRoadrunner(None, state=state)
+            roadrunner.model.setTime(time)
+            local.roadrunner = roadrunner
+            local.checkpoint_store = CheckpointStore()
+            local.version = version
+        elif local.version < self.version:
+            with self._lock:
+                # Names in the order they were last set
+                names = sorted([n for n, v in self._version_dct.items()
+                      if v > local.version], key=self._version_dct.get)
+                name_dct = {n: self._value_dct[n] for n in names}
+                version = self.version
+            util.setRoadrunnerValue(local.roadrunner, name_dct)
+            local.version = version
+            # Checkpoints were simulated with the old values
+            local.checkpoint_store.clear()
+        return local
+
+    def getRoadrunner(self):
+        """
+        Provides the roadrunner of the calling thread.
+
+        Returns
+        -------
+        ExtendedRoadrunner
+        """
+        return self._getLocal().roadrunner
+
+    def getCheckpointStore(self):
+        """
+        Provides the checkpoints of the calling thread.
+
+        Returns
+        -------
+        CheckpointStore
+        """
+        return self._getLocal().checkpoint_store
+
+    def set(self, name_dct):
+        """
+        Sets values in the roadrunners of all threads.
+
+        Parameters
+        ----------
+        name_dct: dict
+            key: str
+            value: value
+        """
+        with self._lock:
+            util.setRoadrunnerValue(self.template, name_dct)
+            self._state = None
+            self.version += 1
+            for name, value in name_dct.items():
+                self._value_dct[name] = value
+                self._version_dct[name] = self.version
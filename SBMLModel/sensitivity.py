@@ -0,0 +1,208 @@
+"""
+Local sensitivities of simulated values to parameters.
+
+Sensitivities are the derivatives of variables with respect to parameters
+at each simulation time, in an array of shape (num_time, num_variable,
+num_parameter). They are calculated either by the sensitivity solver of
+roadrunner or by finite differences. Finite differences simulate all
+perturbed parameter sets as one batch (see batch.py), which reuses the
+compiled model and may be divided among processes. The step for a parameter
+is the larger of relative_step times its value and absolute_step.
+
+The roadrunner solver calculates sensitivities of species amounts. So,
+METHOD_AUTO uses it only if the variables are floating species and all
+compartments have unit volume, so that amounts are concentrations.
+
+Usage:
+    values, method = calculateSensitivities(roadrunner, ["k1", "k2"], times,
+          ["[A]", "[B]"])
+    values  # (num_time, num_variable, num_parameter)
+"""
+
+import SBMLModel.constants as cn
+from SBMLModel import batch
+from SBMLModel.make_roadrunner import cloneRoadrunner
+
+import collections
+import numpy as np
+
+METHOD_AUTO = "auto"
+METHOD_ROADRUNNER = "roadrunner"
+METHOD_FINITE_DIFFERENCE = "finite_difference"
+METHODS = [METHOD_AUTO, METHOD_ROADRUNNER, METHOD_FINITE_DIFFERENCE]
+
+SensitivityResult = collections.namedtuple("SensitivityResult",
+      ["values", "times", "names", "parameter_names", "method"])
+SensitivityResult.__doc__ = """
+Local sensitivities.
+
+values: np.ndarray (num_time, num_variable, num_parameter)
+times: np.ndarray (simulation times)
+names: list-str (variable names)
+parameter_names: list-str
+method: str (METHOD_ROADRUNNER or METHOD_FINITE_DIFFERENCE)
+"""
+
+
+def makeSteps(parameter_values, relative_step=cn.SENSITIVITY_RELATIVE_STEP,
+      absolute_step=cn.SENSITIVITY_ABSOLUTE_STEP):
+    """
+    Calculates the finite difference step of each parameter.
+
+    Parameters
+    ----------
+    parameter_values: np.ndarray
+    relative_step: float (fraction of the parameter value)
+    absolute_step: float (minimum step)
+
+    Returns
+    -------
+    np.ndarray
+    """
+    parameter_values = np.asarray(parameter_values, dtype=float)
+    return np.maximum(relative_step*np.abs(parameter_values), absolute_step)
+
+def _getSpeciesNames(selections):
+    # Species names of concentration selections; None if not all are species
+    names = []
+    for selection in selections:
+        if not (selection.startswith("[") and selection.endswith("]")):
+            return None
+        names.append(selection[1:-1])
+    return names
+
+def isRoadrunnerSupported(roadrunner, selections):
+    """
+    Determines if the roadrunner sensitivity solver provides the
+    sensitivities of the selections.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    selections: list-str (roadrunner selections)
+
+    Returns
+    -------
+    bool
+    """
+    species_names = _getSpeciesNames(selections)
+    if species_names is None:
+        return False
+    floating_names = set(roadrunner.model.getFloatingSpeciesIds())
+    if not set(species_names).issubset(floating_names):
+        return False
+    return bool(np.all(np.array(roadrunner.model.getCompartmentVolumes()) == 1))
+
+def calculateRoadrunnerSensitivities(roadrunner, parameter_names, times,
+      selections):
+    """
+    Calculates sensitivities of species amounts with the roadrunner
+    sensitivity solver. Times must be evenly spaced. The roadrunner
+    is not changed.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    parameter_names: list-str
+    times: np.ndarray (times of the results; first is the start time)
+    selections: list-str (concentration selections of floating species)
+
+    Returns
+    -------
+    np.ndarray (num_time, num_variable, num_parameter)
+    """
+    species_names = _getSpeciesNames(selections)
+    if species_names is None:
+        raise ValueError("Selections must be species concentrations.")
+    # The solver keeps state between calls
+    clone = cloneRoadrunner(roadrunner)
+    clone.reset()
+    _, sensitivity_arr, _, _ = clone.timeSeriesSensitivities(times[0],
+          times[-1], len(times), list(parameter_names), species_names)
+    # Order the dimensions as (time, variable, parameter)
+    return np.transpose(np.array(sensitivity_arr), (0, 2, 1))
+
+def calculateFiniteDifferences(roadrunner, parameter_names, times, selections,
+      relative_step=cn.SENSITIVITY_RELATIVE_STEP,
+      absolute_step=cn.SENSITIVITY_ABSOLUTE_STEP, is_central=True,
+      num_process=1):
+    """
+    Calculates sensitivities by finite differences. The roadrunner is
+    not changed.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    parameter_names: list-str (global parameters)
+    times: np.ndarray (times of the results; first is the start time)
+    selections: list-str (roadrunner selections, excluding time)
+    relative_step: float (fraction of the parameter value)
+    absolute_step: float (minimum step)
+    is_central: bool (central differences; otherwise, forward differences)
+    num_process: int (number of processes; None is the number of CPUs)
+
+    Returns
+    -------
+    np.ndarray (num_time, num_variable, num_parameter)
+    """
+    parameter_values = np.array([roadrunner[n] for n in parameter_names],
+          dtype=float)
+    steps = makeSteps(parameter_values, relative_step=relative_step,
+          absolute_step=absolute_step)
+    num_parameter = len(parameter_names)
+    step_mat = np.diag(steps)
+    # Rows of perturbed parameter values
+    if is_central:
+        parameter_mat = np.vstack([parameter_values + step_mat,
+              parameter_values - step_mat])
+    else:
+        parameter_mat = np.vstack([parameter_values + step_mat,
+              parameter_values])
+    values, _ = batch.simulateBatch(roadrunner, list(parameter_names),
+          parameter_mat, times, selections, num_process=num_process)
+    upper_arr = values[:num_parameter]
+    if is_central:
+        differences = (upper_arr - values[num_parameter:])/(2*steps[:, None, None])
+    else:
+        differences = (upper_arr - values[num_parameter])/steps[:, None, None]
+    # Order the dimensions as (time, variable, parameter)
+    return np.transpose(differences, (1, 2, 0))
+
+def calculateSensitivities(roadrunner, parameter_names, times, selections,
+      method=METHOD_AUTO, **kwargs):
+    """
+    Calculates local sensitivities. The roadrunner is not changed.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    parameter_names: list-str (global parameters)
+    times: np.ndarray (evenly spaced times; first is the start time)
+    selections: list-str (roadrunner selections, excluding time)
+    method: str (in METHODS)
+    kwargs: dict (keyword arguments of calculateFiniteDifferences)
+
+    Returns
+    -------
+    np.ndarray (num_time, num_variable, num_parameter)
+    str (method used)
+    """
+    if not method in METHODS:
+        raise ValueError("method must be one of %s" % str(METHODS))
+    times = np.array(times, dtype=float)
+    if method == METHOD_AUTO:
+        if isRoadrunnerSupported(roadrunner, selections):
+            try:
+                values = calculateRoadrunnerSensitivities(roadrunner,
+                      parameter_names, times, selections)
+                return values, METHOD_ROADRUNNER
+            except RuntimeError:
+                pass
+        method = METHOD_FINITE_DIFFERENCE
+    if method == METHOD_ROADRUNNER:
+        values = calculateRoadrunnerSensitivities(roadrunner, parameter_names,
+              times, selections)
+    else:
+        values = calculateFiniteDifferences(roadrunner, parameter_names, times,
+              selections, **kwargs)
+    return values, method
@@ -0,0 +1,170 @@
+"""
+Lightweight result of a simulation.
+
+A SimulationResult holds a float64 array of values (num_time, num_column),
+a vector of times in seconds, and a map from column names to indices. It
+has none of the overheads of a DataFrame, and so is suited to workloads
+with many simulations. Construction from the NamedArray of a roadrunner
+simulation does not copy the values; the values are a strided view of the
+simulation array without its time column, and so are not C-contiguous.
+Use is_contiguous=True to copy them into a C-contiguous array. Conversions
+to and from Timeseries also share the values where pandas allows.
+
+Usage:
+    result = SimulationResult.fromNamedArray(roadrunner.simulate(0, 10, 100))
+    arr = result["S1"]  # np.ndarray view of a column
+    ts = result.toTimeseries()
+"""
+
+import SBMLModel.constants as cn
+from SBMLModel.timeseries import Timeseries
+
+import numpy as np
+import pandas as pd
+
+
+class SimulationResult(object):
+
+    __slots__ = ["values", "times", "columns", "_index_dct"]
+
+    def __init__(self, values, times, columns):
+        """
+        Parameters
+        ----------
+        values: np.ndarray (num_time, num_column)
+        times: np.ndarray (num_time; seconds)
+        columns: list-str
+        """
+        self.values = np.asarray(values, dtype=float)
+        self.times = np.asarray(times, dtype=float)
+        self.columns = list(columns)
+        if self.values.shape != (len(self.times), len(self.columns)):
+            raise ValueError("values has shape %s for %d times and %d columns."
+                  % (str(self.values.shape), len(self.times),
+                  len(self.columns)))
+        self._index_dct = {c: i for i, c in enumerate(self.columns)}
+
+    def __repr__(self):
+        return "SimulationResult(times=%d, columns=%s)" % (len(self.times),
+              str(self.columns))
+
+    def __len__(self):
+        return len(self.times)
+
+    def __contains__(self, column):
+        return column in self._index_dct
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def __getitem__(self, key):
+        """
+        Selects columns.
+
+        Parameters
+        ----------
+        key: str/list-str
+
+        Returns
+        -------
+        np.ndarray (view of the column) if key is a str
+        SimulationResult if key is a list
+        """
+        if isinstance(key, str):
+            return self.values[:, self._index_dct[key]]
+        indices = [self._index_dct[k] for k in key]
+        return SimulationResult(self.values[:, indices], self.times, key)
+
+    def copy(self):
+        """
+        Creates a result with its own arrays.
+
+        Returns
+        -------
+        SimulationResult
+        """
+        return SimulationResult(self.values.copy(), self.times.copy(),
+              self.columns)
+
+    @classmethod
+    def fromNamedArray(cls, data, columns=None, is_contiguous=False):
+        """
+        Constructs a result from the NamedArray of a simulation. Brackets
+        are removed from concentration names. The values are a strided
+        view of data unless is_contiguous is True.
+
+        Parameters
+        ----------
+        data: NamedArray (must have a time column)
+        columns: list-str (names of the columns other than time)
+        is_contiguous: bool (copy the values into a C-contiguous array)
+
+        Returns
+        -------
+        SimulationResult
+        """
+        colnames = list(data.colnames)
+        if not cn.TIME in colnames:
+            raise ValueError("No time information found.")
+        time_idx = colnames.index(cn.TIME)
+        arr = np.asarray(data)
+        times = arr[:, time_idx]
+        if time_idx == 0:
+            values = arr[:, 1:]
+        else:
+            values = np.delete(arr, time_idx, axis=1)
+        if is_contiguous:
+            values = np.ascontiguousarray(values)
+        if columns is None:
+            columns = [c[1:-1] if c[0:1] == "[" else c
+                  for i, c in enumerate(colnames) if i != time_idx]
+        return cls(values, times, columns)
+
+    def toNamedArray(self):
+        """
+        Constructs a NamedArray with a time column. The values are copied
+        since the time column is added.
+
+        Returns
+        -------
+        NamedArray
+        """
+        import roadrunner
+        named_array_class = roadrunner._roadrunner.NamedArray
+        arr = np.empty((len(self.times), len(self.columns) + 1))
+        arr[:, 0] = self.times
+        arr[:, 1:] = self.values
+        named_array = arr.view(named_array_class)
+        named_array.colnames = [cn.TIME] + self.columns
+        return named_array
+
+    @classmethod
+    def fromTimeseries(cls, ts):
+        """
+        Constructs a result from a Timeseries.
+
+        Parameters
+        ----------
+        ts: Timeseries
+
+        Returns
+        -------
+        SimulationResult
+        """
+        return cls(ts.to_numpy(dtype=float, copy=False), ts.times,
+              list(ts.columns))
+
+    def toTimeseries(self):
+        """
+        Constructs a Timeseries.
+
+        Returns
+        -------
+        Timeseries
+        """
+        index = pd.Index(Timeseries._convertTime(self.times),
+              name=cn.TIMESERIES_INDEX_NAME)
+        df = pd.DataFrame(self.values, index=index, columns=self.columns,
+              copy=False)
+        return Timeseries(df)
@@ -0,0 +1,163 @@
+"""
+Steady states of a model for many sets of parameter values.
+
+Parameter sets are solved in an order in which each set is near the previous
+one (greedy nearest neighbor in parameter space scaled by the range of each
+parameter). The solver starts from the floating species of the previous
+steady state, which usually requires fewer iterations than starting from
+the initial values. A warm start is used only if the initial values of
+the floating species are the same as for the previous set, since
+otherwise parameters that set initial values (and so conserved totals)
+would be overridden. If the solver fails or does not reach the tolerance,
+the model is simulated from its initial values for a long time instead.
+For models with multiple steady states, a warm start may find a different
+steady state than a start from the initial values.
+
+Usage:
+    result = solveSteadyStates(roadrunner, parameter_indices, parameter_mat,
+          selections)
+"""
+
+import SBMLModel.constants as cn
+from SBMLModel.roadrunner_state import RoadrunnerState, FLOATING
+
+import collections
+import numpy as np
+
+# How a steady state is found
+METHOD_SOLVER = "solver"
+METHOD_INTEGRATION = "integration"
+METHOD_NONE = "none"
+
+SteadyStateResult = collections.namedtuple("SteadyStateResult",
+      ["values", "is_converged", "residuals", "methods", "order", "names",
+      "parameter_names"])
+SteadyStateResult.__doc__ = """
+Steady states of parameter sets.
+
+values: np.ndarray (num_parameter_set, num_variable); nan if not converged
+is_converged: np.ndarray-bool (num_parameter_set)
+residuals: np.ndarray (num_parameter_set; norm of rates of change)
+methods: np.ndarray-str (num_parameter_set; METHOD_SOLVER, METHOD_INTEGRATION,
+    METHOD_NONE)
+order: np.ndarray-int (indices of parameter sets in the order solved)
+names: list-str (variable names)
+parameter_names: list-str
+"""
+
+
+def orderParameterSets(parameter_mat):
+    """
+    Orders parameter sets so that each is near the previous one. Starts
+    with the first set and repeatedly chooses the nearest set not yet chosen.
+
+    Parameters
+    ----------
+    parameter_mat: np.ndarray (num_parameter_set, num_parameter)
+
+    Returns
+    -------
+    np.ndarray-int
+    """
+    parameter_mat = np.asarray(parameter_mat, dtype=float)
+    num_set = parameter_mat.shape[0]
+    if num_set == 0:
+        return np.array([], dtype=int)
+    ranges = np.ptp(parameter_mat, axis=0)
+    ranges[ranges == 0] = 1.0
+    scaled_mat = parameter_mat/ranges
+    order = np.empty(num_set, dtype=int)
+    is_chosen = np.repeat(False, num_set)
+    idx = 0
+    for position in range(num_set):
+        order[position] = idx
+        is_chosen[idx] = True
+        if position == num_set - 1:
+            break
+        distances = np.sum((scaled_mat - scaled_mat[idx])**2, axis=1)
+        distances[is_chosen] = np.inf
+        idx = int(np.argmin(distances))
+    return order
+
+def _calculateResidual(roadrunner):
+    # Norm of the rates of change of floating species
+    return float(np.linalg.norm(roadrunner.getRatesOfChange()))
+
+def solveSteadyStates(roadrunner, parameter_indices, parameter_mat, selections,
+      is_warm_start=True, tolerance=cn.STEADY_STATE_TOLERANCE,
+      integration_time=cn.STEADY_STATE_INTEGRATION_TIME):
+    """
+    Finds the steady state for each row of parameter values. Parameters
+    and the state of the roadrunner are changed.
+
+    Parameters
+    ----------
+    roadrunner: ExtendedRoadrunner
+    parameter_indices: np.ndarray-int (indices of global parameters)
+    parameter_mat: np.ndarray (num_parameter_set, num_parameter)
+    selections: list-str (roadrunner selections)
+    is_warm_start: bool (start from the previous steady state if initial
+        values are unchanged)
+    tolerance: float (maximum norm of rates of change at a steady state)
+    integration_time: float (simulation time if the solver fails)
+
+    Returns
+    -------
+    np.ndarray (num_parameter_set, num_selection)
+    np.ndarray-bool (is_converged)
+    np.ndarray (residuals)
+    np.ndarray-str (methods)
+    np.ndarray-int (order)
+    """
+    parameter_mat = np.asarray(parameter_mat, dtype=float)
+    num_set = parameter_mat.shape[0]
+    values = np.repeat(np.nan, num_set*len(selections)).reshape(
+          num_set, len(selections))
+    is_converged = np.repeat(False, num_set)
+    residuals = np.repeat(np.nan, num_set)
+    methods = np.repeat(METHOD_NONE, num_set).astype(object)
+    order = orderParameterSets(parameter_mat)
+    # Floating species that can be set for a warm start
+    warm_indices = None
+    index_dct = RoadrunnerState.makeIndexDct(roadrunner)
+    if is_warm_start and (index_dct is not None):
+        warm_indices = index_dct[FLOATING]
+    warm_amounts = None
+    warm_initial_amounts = None
+    for idx in order:
+        roadrunner.model.setGlobalParameterValues(parameter_indices,
+              parameter_mat[idx, :])
+        roadrunner.reset()
+        if warm_indices is not None:
+            initial_amounts = np.array(
+                  roadrunner.model.getFloatingSpeciesAmounts(warm_indices))
+            if (warm_amounts is not None)  \
+                  and np.array_equal(initial_amounts, warm_initial_amounts):
+                roadrunner.model.setFloatingSpeciesAmounts(warm_indices,
+                      warm_amounts)
+        try:
+            roadrunner.steadyState()
+            residual = _calculateResidual(roadrunner)
+            if residual <= tolerance:
+                methods[idx] = METHOD_SOLVER
+        except RuntimeError:
+            pass
+        if methods[idx] == METHOD_NONE:
+            # The failed solver may leave invalid values
+            roadrunner.reset()
+            try:
+                roadrunner.simulate(0, integration_time, 2)
+                residual = _calculateResidual(roadrunner)
+                if residual <= tolerance:
+                    methods[idx] = METHOD_INTEGRATION
+            except RuntimeError:
+                residual = np.nan
+        residuals[idx] = residual
+        if methods[idx] != METHOD_NONE:
+            is_converged[idx] = True
+            values[idx, :] = [roadrunner[s] for s in selections]
+            if warm_indices is not None:
+                warm_amounts = np.array(
+                      roadrunner.model.getFloatingSpeciesAmounts(warm_indices))
+                warm_initial_amounts = initial_amounts
+    return values, is_converged, residuals, methods, order
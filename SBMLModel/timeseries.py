@@ -12,10 +12,12 @@ Alternatively, if a pandas object is returned from an operation,
 then use Timeseries or TimeseriesSer to reconstruct the object.
 """
 
+from SBMLModel import interpolation
 from SBMLModel import util
 import SBMLModel.constants as cn
 
 import numpy as np
+import os
 import pandas as pd
 
 ############# FUNCTIONS ###############
@@ -32,9 +34,47 @@ def findCommonIndices(index1, index2):
     -------
     sorted list
     """
-    indices = list(set(index1).intersection(index2))
-    indices.sort()
-    return(indices)
+    return findCommonPositions(index1, index2)[0].tolist()
+
+def _isUnique(index):
+    # pandas caches uniqueness of an index
+    if isinstance(index, pd.Index):
+        return index.is_unique
+    return len(np.unique(index)) == len(index)
+
+def findCommonPositions(index1, index2):
+    """
+    Finds the indices common to both and their positions. If an index
+    has duplicates, the positions are for all of its rows with a common
+    index, in order of the common indices.
+
+    Parameters
+    ----------
+    index1: list/index
+    index2: list/index
+
+    Returns
+    -------
+    np.ndarray (sorted common indices)
+    np.ndarray-int (positions in index1)
+    np.ndarray-int (positions in index2)
+    """
+    arr1 = np.asarray(index1)
+    arr2 = np.asarray(index2)
+    if _isUnique(index1) and _isUnique(index2):
+        return np.intersect1d(arr1, arr2, assume_unique=True,
+              return_indices=True)
+    common_arr = np.intersect1d(arr1, arr2)
+    positions = []
+    for arr in [arr1, arr2]:
+        # Stable sort keeps duplicates in their original order
+        order = np.argsort(arr, kind="stable")
+        sorted_arr = arr[order]
+        starts = np.searchsorted(sorted_arr, common_arr, side="left")
+        ends = np.searchsorted(sorted_arr, common_arr, side="right")
+        positions.append(np.concatenate([order[b:e]
+              for b, e in zip(starts, ends)] + [np.array([], dtype=int)]))
+    return common_arr, positions[0], positions[1]
 
 def align(ts1, ts2):
     """
@@ -49,12 +89,59 @@ def align(ts1, ts2):
     -------
     Timeseries/TimeseriesSer, Timeseries/Timeseries/Ser
     """
-    common_indices = findCommonIndices(ts1.index, ts2.index)
-    new_ts1 = ts1.loc[common_indices, :]
-    new_ts2 = ts2.loc[common_indices, :]
-    return new_ts1, new_ts2
+    _, positions1, positions2 = findCommonPositions(ts1.index, ts2.index)
+    return ts1.iloc[positions1], ts2.iloc[positions2]
+
 
 ############# CLASSES ###############
+class Aligner(object):
+    """
+    Aligns objects repeatedly. The positions of the common indices are
+    kept and reused while the indices of the objects are unchanged.
+
+    Usage:
+        aligner = Aligner()
+        for ...:
+            simulated_ts, observed_ts = aligner.align(simulated_ts, observed_ts)
+    """
+
+    def __init__(self):
+        self._index1 = None
+        self._index2 = None
+        self._positions1 = None
+        self._positions2 = None
+        self.num_hit = 0
+        self.num_miss = 0
+
+    def __repr__(self):
+        return "Aligner(hit=%d, miss=%d)" % (self.num_hit, self.num_miss)
+
+    def align(self, ts1, ts2):
+        """
+        Returns objects with the same indices.
+
+        Parameters
+        ----------
+        ts1: Timeseries/TimeseriesSer
+        ts2: Timeseries/TimeseriesSer
+
+        Returns
+        -------
+        Timeseries/TimeseriesSer, Timeseries/Timeseries/Ser
+        """
+        if (self._index1 is not None) and ts1.index.equals(self._index1)  \
+              and ts2.index.equals(self._index2):
+            self.num_hit += 1
+        else:
+            self.num_miss += 1
+            _, self._positions1, self._positions2 = findCommonPositions(
+                  ts1.index, ts2.index)
+            self._index1 = ts1.index
+            self._index2 = ts2.index
+        return ts1.iloc[self._positions1],  \
+              ts2.iloc[self._positions2]
+
+
 class TimeseriesSer(pd.Series):
 
     def __init__(self, ser, times=None):
@@ -83,13 +170,7 @@ class TimeseriesSer(pd.Series):
         -------
         Timeseries/TimeseriesSer, Timeseries/Timeseries/Ser
         """
-        common_indices = findCommonIndices(self.index, other.index)
-        new_ts1 = self.loc[common_indices]
-        if isinstance(other, Timeseries):
-            new_ts2 = other.loc[common_indices, :]
-        else:
-            new_ts2 = other.loc[common_indices]
-        return new_ts1, new_ts2
+        return align(self, other)
 
 
 class Timeseries(pd.DataFrame):
@@ -144,13 +225,7 @@ class Timeseries(pd.DataFrame):
                 mat_columns = list(data.colnames)
             else:
                 mat_columns = columns
-            df = pd.DataFrame(data, columns=mat_columns)
-            if times is None:
-                if cn.TIME in data.colnames:
-                    times = df[cn.TIME]
-                    del df[cn.TIME]
-                else:
-                    raise ValueError("No time information found.")
+            df, times = self._viewNamedArray(data, mat_columns, times)
         #
         elif isinstance(data, np.ndarray):
             if columns is None:
@@ -164,11 +239,13 @@ class Timeseries(pd.DataFrame):
             df = pd.DataFrame(data)
             times = np.array(df.index)/cn.MS_IN_SEC
         #
-        df.index = self._convertTime(times)
+        if times is not None:
+            df.index = self._convertTime(times)
         # Fix the columns if needed
-        new_columns = [str(c)[1:-1] 
-              if str(c)[0] == "[" else c for c in df.columns]
-        df.columns = new_columns
+        if any([str(c)[0:1] == "[" for c in df.columns]):
+            new_columns = [str(c)[1:-1]
+                  if str(c)[0] == "[" else c for c in df.columns]
+            df.columns = new_columns
         super().__init__(df)
         self.index.name = cn.TIMESERIES_INDEX_NAME
 
@@ -197,10 +274,44 @@ class Timeseries(pd.DataFrame):
         else:
             return self.__class__(item, times=item.index)
                
+    @classmethod
+    def _viewNamedArray(cls, data, columns, times=None):
+        """
+        Constructs a DataFrame whose values are a view of the buffer of
+        a NamedArray. The time column, if any, is the index.
+
+        Parameters
+        ----------
+        data: NamedArray
+        columns: list-str (names of all columns of data)
+        times: list-float (time in seconds; None uses the time column)
+
+        Returns
+        -------
+        DataFrame
+        list-float (times to assign to the index; None if assigned)
+        """
+        arr = np.asarray(data)
+        columns = list(columns)
+        if times is not None:
+            return pd.DataFrame(arr, columns=columns, copy=False), times
+        if not cn.TIME in columns:
+            raise ValueError("No time information found.")
+        time_idx = columns.index(cn.TIME)
+        if time_idx == 0:
+            values = arr[:, 1:]
+        else:
+            values = np.delete(arr, time_idx, axis=1)
+        del columns[time_idx]
+        index = pd.Index(cls._convertTime(arr[:, time_idx]),
+              name=cn.TIMESERIES_INDEX_NAME)
+        return pd.DataFrame(values, index=index, columns=columns,
+              copy=False), None
+
     @staticmethod
     def _convertTime(times):
         """
-        Converts float seconds to int ms.
+        Converts float seconds to int ms, rounding to the nearest ms.
 
         Parameters
         ----------
@@ -208,15 +319,18 @@ class Timeseries(pd.DataFrame):
         
         Returns
         -------
-        list-int
+        list-int/Index (an integer Index in ms is returned unchanged)
         """
         # Check if this is an index in the correct units
         if "pandas.core.indexes" in str(type(times)):
             if times.name == cn.TIMESERIES_INDEX_NAME:
+                if pd.api.types.is_integer_dtype(times.dtype):
+                    # Index is immutable and so need not be copied
+                    return times
                 return list(times)
         # Must convert
         arr = np.array(times).astype(float)
-        new_arr = arr*cn.MS_IN_SEC
+        new_arr = np.round(arr*cn.MS_IN_SEC)
         new_arr = new_arr.astype(int)
         return new_arr
 
@@ -236,13 +350,112 @@ class Timeseries(pd.DataFrame):
         -------
         Timeseries/TimeseriesSer, Timeseries/Timeseries/Ser
         """
-        common_indices = findCommonIndices(self.index, other.index)
-        new_self = self.loc[common_indices, :]
-        if isinstance(other, pd.DataFrame):
-            new_other = other.loc[common_indices, :]
-        else:  # Series
-            new_other = other.loc[common_indices]
-        return new_self, new_other
+        return align(self, other)
+
+    def resample(self, times, method=interpolation.METHOD_LINEAR):
+        """
+        Interpolates all columns at new times. Times outside the range
+        of the Timeseries have nan values.
+
+        Parameters
+        ----------
+        times: list-float (time in seconds)
+        method: str (in interpolation.METHODS)
+
+        Returns
+        -------
+        Timeseries
+        """
+        times = np.array(times, dtype=float)
+        values = interpolation.interpolate(self.times, self.values, times,
+              method=method)
+        return Timeseries(values, times=times, columns=list(self.columns))
+
+    @staticmethod
+    def resampleBatch(tss, times, method=interpolation.METHOD_LINEAR):
+        """
+        Interpolates a collection of Timeseries with the same index and
+        columns at new times in one vectorized call.
+
+        Parameters
+        ----------
+        tss: list-Timeseries
+        times: list-float (time in seconds)
+        method: str (in interpolation.METHODS)
+
+        Returns
+        -------
+        list-Timeseries
+        """
+        if len(tss) == 0:
+            return []
+        first_ts = tss[0]
+        for ts in tss[1:]:
+            if (not first_ts.index.equals(ts.index))  \
+                  or (not first_ts.columns.equals(ts.columns)):
+                raise ValueError("Timeseries must have the same index and columns.")
+        times = np.array(times, dtype=float)
+        values_arr = np.stack([ts.to_numpy(dtype=float) for ts in tss])
+        new_values_arr = interpolation.interpolate(first_ts.times, values_arr,
+              times, method=method)
+        columns = list(first_ts.columns)
+        return [Timeseries(v, times=times, columns=columns)
+              for v in new_values_arr]
+
+    def save(self, path):
+        """
+        Saves the Timeseries in a directory of .npy files: the ms index,
+        the column names, and the values stored by column so that
+        each column is contiguous in the file.
+
+        Parameters
+        ----------
+        path: str (directory; created if it does not exist)
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, cn.TIMESERIES_INDEX_FILE),
+              np.array(self.index, dtype=np.int64))
+        np.save(os.path.join(path, cn.TIMESERIES_COLUMNS_FILE),
+              np.array([str(c) for c in self.columns], dtype=str))
+        np.save(os.path.join(path, cn.TIMESERIES_VALUES_FILE),
+              np.asfortranarray(self.to_numpy(dtype=float)))
+
+    @classmethod
+    def load(cls, path, columns=None, is_memmap=True):
+        """
+        Loads a Timeseries saved by save. With memory mapping, values are
+        read from the file when accessed, and changes to the values are
+        not written to the file. Only the pages of the selected
+        columns are read.
+
+        Parameters
+        ----------
+        path: str (directory written by save)
+        columns: list-str (columns to load; None is all columns)
+        is_memmap: bool (memory map the values)
+
+        Returns
+        -------
+        Timeseries
+        """
+        index_arr = np.load(os.path.join(path, cn.TIMESERIES_INDEX_FILE))
+        all_columns = list(np.load(os.path.join(path,
+              cn.TIMESERIES_COLUMNS_FILE)))
+        mmap_mode = "c" if is_memmap else None
+        values = np.load(os.path.join(path, cn.TIMESERIES_VALUES_FILE),
+              mmap_mode=mmap_mode)
+        if columns is not None:
+            missing_columns = set(columns).difference(all_columns)
+            if len(missing_columns) > 0:
+                raise ValueError("Columns not found: %s"
+                      % str(sorted(missing_columns)))
+            positions = [all_columns.index(c) for c in columns]
+            values = np.asfortranarray(values[:, positions])
+            all_columns = list(columns)
+        index = pd.Index(index_arr, name=cn.TIMESERIES_INDEX_NAME)
+        df = pd.DataFrame(values, index=index, columns=all_columns,
+              copy=False)
+        return cls(df)
 
     @staticmethod
     def mat2TS(mat, column_names=None, row_names=None):
@@ -0,0 +1,61 @@
+"""
+Benchmarks for Model.
+
+Usage:
+    PYTHONPATH=. python benchmarks/benchmark_model.py
+"""
+
+import SBMLModel.constants as cn
+from SBMLModel.model import Model
+
+import os
+import time
+
+EGFR_PATH = os.path.join(cn.DATA_DIR, "egfr_model.ant")
+NUM_REPEAT = 5
+
+
+def timeFunction(function, num_repeat=NUM_REPEAT):
+    """
+    Measures the average execution time of a function.
+
+    Parameters
+    ----------
+    function: Function (no arguments)
+    num_repeat: int
+
+    Returns
+    -------
+    float (seconds)
+    """
+    start_time = time.time()
+    for _ in range(num_repeat):
+        function()
+    return (time.time() - start_time)/num_repeat
+
+def benchmarkCopy(model_reference=EGFR_PATH, end_time=100):
+    """
+    Compares Model.copy with copying by serialization.
+
+    Parameters
+    ----------
+    model_reference: str
+    end_time: float (time of the model when it is copied)
+
+    Returns
+    -------
+    dict
+    """
+    model = Model(model_reference)
+    model.setTime(end_time)
+    clone_time = timeFunction(model.copy)
+    serialize_time = timeFunction(model._copySerialized)
+    return {"clone": clone_time, "serialize": serialize_time,
+          "speedup": serialize_time/clone_time}
+
+
+if __name__ == '__main__':
+    result_dct = benchmarkCopy()
+    print("Model.copy: %2.4f sec" % result_dct["clone"])
+    print("Copy by serialization: %2.4f sec" % result_dct["serialize"])
+    print("Speedup: %2.1f" % result_dct["speedup"])
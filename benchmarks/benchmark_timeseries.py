@@ -0,0 +1,149 @@
+"""
+Benchmarks for Timeseries.
+
+Measures the bytes allocated to construct a Timeseries from the NamedArray
+of a large simulation, and compares with the construction that copies the
+data into a DataFrame before removing the time column. Also compares the
+time to save and load a Timeseries in CSV and in the binary format of
+Timeseries.save.
+
+Usage:
+    PYTHONPATH=. python benchmarks/benchmark_timeseries.py
+"""
+
+import SBMLModel.constants as cn
+from SBMLModel.timeseries import Timeseries
+
+import numpy as np
+import os
+import pandas as pd
+import shutil
+import tellurium as te
+import tempfile
+import time
+import tracemalloc
+
+NUM_SPECIES = 50
+NUM_POINT = 100000
+
+
+def makeModel(num_species=NUM_SPECIES):
+    """
+    Constructs the antimony of a chain of reactions.
+
+    Parameters
+    ----------
+    num_species: int
+
+    Returns
+    -------
+    str
+    """
+    lines = ["J%d: S%d -> S%d; k*S%d" % (n, n, n + 1, n)
+          for n in range(num_species - 1)]
+    lines.append("k = 0.1")
+    lines.append("S0 = 100")
+    return "\n".join(lines)
+
+def measureAllocation(function):
+    """
+    Measures the peak bytes allocated by a function.
+
+    Parameters
+    ----------
+    function: Function (no arguments)
+
+    Returns
+    -------
+    int (bytes)
+    object (value of the function)
+    """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    value = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, value
+
+def _copyNamedArray(data):
+    # Construction that copies the data before removing the time column
+    df = pd.DataFrame(data, columns=list(data.colnames))
+    times = df[cn.TIME]
+    del df[cn.TIME]
+    df.index = Timeseries._convertTime(times)
+    return Timeseries(df)
+
+def benchmarkConstruction(num_species=NUM_SPECIES, num_point=NUM_POINT):
+    """
+    Compares bytes allocated to construct a Timeseries from a NamedArray.
+
+    Parameters
+    ----------
+    num_species: int
+    num_point: int
+
+    Returns
+    -------
+    dict
+    """
+    roadrunner = te.loada(makeModel(num_species))
+    data = roadrunner.simulate(0, 100, num_point)
+    view_bytes, ts = measureAllocation(lambda: Timeseries(data))
+    copy_bytes, _ = measureAllocation(lambda: _copyNamedArray(data))
+    return {"data": data.nbytes, "view": view_bytes, "copy": copy_bytes,
+          "is_shared": np.shares_memory(ts.values, data)}
+
+def _measureTime(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def benchmarkStorage(num_species=NUM_SPECIES, num_point=NUM_POINT):
+    """
+    Compares the seconds to save and load a Timeseries as CSV and
+    with Timeseries.save.
+
+    Parameters
+    ----------
+    num_species: int
+    num_point: int
+
+    Returns
+    -------
+    dict
+    """
+    roadrunner = te.loada(makeModel(num_species))
+    ts = Timeseries(roadrunner.simulate(0, 100, num_point))
+    directory = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(directory, "ts.csv")
+        binary_path = os.path.join(directory, "ts")
+        df = ts.df
+        df.insert(0, cn.TIME, ts.times)
+        result_dct = {
+              "csv_save": _measureTime(lambda: df.to_csv(csv_path,
+                    index=False)),
+              "csv_load": _measureTime(lambda: Timeseries(csv_path)),
+              "binary_save": _measureTime(lambda: ts.save(binary_path)),
+              "binary_load": _measureTime(lambda: Timeseries.load(binary_path)),
+              "binary_load_column": _measureTime(lambda: Timeseries.load(
+                    binary_path, columns=["S1"])),
+              # Loading should take less time than rebuilding the index
+              "index_rebuild": _measureTime(lambda: pd.Index(list(ts.index))),
+              }
+    finally:
+        shutil.rmtree(directory)
+    return result_dct
+
+
+if __name__ == '__main__':
+    result_dct = benchmarkConstruction()
+    print("Simulation data: %d bytes" % result_dct["data"])
+    print("Timeseries(NamedArray): %d bytes" % result_dct["view"])
+    print("Copy through DataFrame: %d bytes" % result_dct["copy"])
+    print("Values shared with NamedArray: %s" % str(result_dct["is_shared"]))
+    result_dct = benchmarkStorage()
+    for key, value in result_dct.items():
+        print("%s: %2.4f sec" % (key, value))
+    print("Load is faster than an index rebuild: %s"
+          % str(result_dct["binary_load"] < result_dct["index_rebuild"]))
@@ -24,6 +24,7 @@ INSTALL_REQUIREMENTS = [
     "pandas",
     "pip",
     "pylint",
+    "scipy>=1.7",
     "seaborn",
     "tellurium",
     "tk",
@@ -57,7 +58,7 @@ def doSetup(install_requires):
         long_description=open('README.md').read(),
         long_description_content_type='text/markdown',
         package_dir={'analyzeSBML': 'analyzeSBML'},
-        python_requires='>=3.6',
+        python_requires='>=3.7',
         install_requires=install_requires,
         classifiers=[
             'Development Status :: 3 - Alpha',
@@ -0,0 +1,18 @@
+"""
+Configuration of tests run with pytest.
+
+Compiled roadrunners are cached in a temporary directory so that tests do
+not write to the cache in the home directory of the user. The environment
+variable is set before SBMLModel is imported by the test modules.
+"""
+
+import os
+import shutil
+import tempfile
+
+CACHE_DIR = tempfile.mkdtemp(prefix="SBMLModel_cache_")
+os.environ["SBMLMODEL_CACHE_DIR"] = CACHE_DIR
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
@@ -0,0 +1,173 @@
+from SBMLModel.async_simulation import AsyncSimulator
+import SBMLModel as anl
+
+import asyncio
+import numpy as np
+import threading
+import time
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: A->B; k1*A; 
+J2: B->A; k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+"""
+
+
+def add(value1, value2=0):
+    return value1 + value2
+
+def sleep(duration):
+    time.sleep(duration)
+    return duration
+
+
+#############################
+# Tests
+#############################
+class TestAsyncSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.simulator = AsyncSimulator(max_concurrency=2)
+        self.model = anl.Model(MODEL)
+
+    def tearDown(self):
+        self.simulator.shutdown()
+
+    def testRun(self):
+        if IGNORE_TEST:
+            return
+        async def main():
+            return await self.simulator.run(add, 1, value2=2)
+        #
+        self.assertEqual(asyncio.run(main()), 3)
+
+    def testConcurrency(self):
+        if IGNORE_TEST:
+            return
+        duration = 0.2
+        async def main():
+            tasks = [self.simulator.run(sleep, duration) for _ in range(4)]
+            return await asyncio.gather(*tasks)
+        #
+        start_time = time.time()
+        _ = asyncio.run(main())
+        elapsed = time.time() - start_time
+        # Two runs at a time
+        self.assertGreaterEqual(elapsed, 2*duration)
+        self.assertLess(elapsed, 4*duration)
+
+    def testCancel(self):
+        if IGNORE_TEST:
+            return
+        async def main():
+            task = asyncio.ensure_future(self.simulator.run(sleep, 0.5))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+            return False
+        #
+        self.assertTrue(asyncio.run(main()))
+
+    def testAsimulate(self):
+        if IGNORE_TEST:
+            return
+        async def main():
+            tasks = [self.model.asimulate(0, 5, 11, simulator=self.simulator)
+                  for _ in range(3)]
+            return await asyncio.gather(*tasks)
+        #
+        tss = asyncio.run(main())
+        expected_ts = self.model.simulate(0, 5, 11)
+        for ts in tss:
+            self.assertTrue(ts.equals(expected_ts))
+
+    def testAsimulateCopyInExecutor(self):
+        if IGNORE_TEST:
+            return
+        copy_threads = []
+        original_copy = self.model.copy
+        def copy():
+            copy_threads.append(threading.current_thread())
+            return original_copy()
+        self.model.copy = copy
+        async def main():
+            ts = await self.model.asimulate(0, 5, 11, simulator=self.simulator)
+            result = await self.model.asimulateBatch(np.array([[1, 1]]),
+                  np.linspace(0, 5, 11), simulator=self.simulator)
+            return ts, result
+        #
+        ts, result = asyncio.run(main())
+        # The event loop did not copy, and the batch was not copied
+        self.assertEqual(len(copy_threads), 1)
+        self.assertFalse(copy_threads[0] is threading.main_thread())
+        self.assertEqual(len(ts), 11)
+        self.assertEqual(result.values.shape, (1, 11, 2))
+
+    def testAsimulateThreadSafe(self):
+        if IGNORE_TEST:
+            return
+        self.model.is_thread_safe = True
+        self.model.set({"k1": 2})
+        async def main():
+            tasks = [self.model.asimulate(0, 5, 11, simulator=self.simulator)
+                  for _ in range(3)]
+            return await asyncio.gather(*tasks)
+        #
+        tss = asyncio.run(main())
+        expected_ts = self.model.simulate(0, 5, 11)
+        for ts in tss:
+            self.assertTrue(ts.equals(expected_ts))
+
+    def testAsimulateProcess(self):
+        if IGNORE_TEST:
+            return
+        simulator = AsyncSimulator(max_concurrency=2, is_process=True)
+        async def main():
+            return await self.model.asimulate(0, 5, 11, simulator=simulator)
+        #
+        try:
+            ts = asyncio.run(main())
+        finally:
+            simulator.shutdown()
+        self.assertTrue(ts.equals(self.model.simulate(0, 5, 11)))
+        self.assertEqual(self.model.getTime(), 5)
+
+    def testAsimulateProcessThreadSafe(self):
+        if IGNORE_TEST:
+            return
+        simulator = AsyncSimulator(max_concurrency=2, is_process=True)
+        self.model.is_thread_safe = True
+        self.model.set({"k1": 2})
+        async def main():
+            return await self.model.asimulate(0, 5, 11, simulator=simulator)
+        #
+        try:
+            ts = asyncio.run(main())
+        finally:
+            simulator.shutdown()
+        self.assertTrue(ts.equals(self.model.simulate(0, 5, 11)))
+        self.assertTrue(self.model.is_thread_safe)
+
+    def testAsimulateBatch(self):
+        if IGNORE_TEST:
+            return
+        async def main():
+            return await self.model.asimulateBatch(np.array([[1, 1], [2, 1]]),
+                  np.linspace(0, 5, 11), simulator=self.simulator)
+        #
+        result = asyncio.run(main())
+        self.assertEqual(result.values.shape, (2, 11, 2))
+        self.assertEqual(self.model.getTime(), 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
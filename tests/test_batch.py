@@ -0,0 +1,79 @@
+from SBMLModel import batch
+
+import numpy as np
+import unittest
+import tellurium as te
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: A->B; k1*A; 
+J2: B->A; k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+"""
+TIMES = np.linspace(0, 5, 11)
+SELECTIONS = ["[A]", "[B]"]
+PARAMETER_MAT = np.array([[1, 1], [2, 1], [1, 3]])
+
+
+#############################
+# Tests
+#############################
+class TestFunctions(unittest.TestCase):
+
+    def setUp(self):
+        self.roadrunner = te.loada(MODEL)
+
+    def testGetParameterIndices(self):
+        if IGNORE_TEST:
+            return
+        indices = batch.getParameterIndices(self.roadrunner, ["k2", "k1"])
+        self.assertEqual(list(indices), [1, 0])
+        with self.assertRaises(ValueError):
+            _ = batch.getParameterIndices(self.roadrunner, ["k3"])
+
+    def check(self, values, is_failed):
+        self.assertEqual(values.shape, (3, len(TIMES), 2))
+        self.assertFalse(any(is_failed))
+        for idx, (k1, k2) in enumerate(PARAMETER_MAT):
+            roadrunner = te.loada(MODEL)
+            roadrunner["k1"] = float(k1)
+            roadrunner["k2"] = float(k2)
+            data = roadrunner.simulate(times=TIMES)
+            self.assertTrue(np.allclose(values[idx], data[:, 1:]))
+
+    def testSimulateParameterSets(self):
+        if IGNORE_TEST:
+            return
+        indices = batch.getParameterIndices(self.roadrunner, ["k1", "k2"])
+        values, is_failed = batch.simulateParameterSets(self.roadrunner,
+              indices, PARAMETER_MAT, TIMES, SELECTIONS)
+        self.check(values, is_failed)
+
+    def testSimulateBatch(self):
+        if IGNORE_TEST:
+            return
+        for num_process in [1, 2]:
+            values, is_failed = batch.simulateBatch(self.roadrunner,
+                  ["k1", "k2"], PARAMETER_MAT, TIMES, SELECTIONS,
+                  num_process=num_process)
+            self.check(values, is_failed)
+        # The roadrunner is not changed
+        self.assertEqual(self.roadrunner["k1"], 1)
+        self.assertEqual(self.roadrunner.model.getTime(), 0)
+
+    def testSimulateBatchFailure(self):
+        if IGNORE_TEST:
+            return
+        parameter_mat = np.array([[1, 1], [1e20, -1e20]])
+        values, is_failed = batch.simulateBatch(self.roadrunner,
+              ["k1", "k2"], parameter_mat, TIMES, SELECTIONS)
+        self.assertEqual(list(is_failed), [False, True])
+        self.assertTrue(np.all(np.isnan(values[1])))
+
+
+if __name__ == '__main__':
+  unittest.main()
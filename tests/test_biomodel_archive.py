@@ -0,0 +1,76 @@
+from SBMLModel.biomodel_archive import BiomodelArchive
+from SBMLModel import biomodel_archive as ba
+
+import os
+import pandas as pd
+import unittest
+import zipfile
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+DIR = os.path.dirname(os.path.abspath(__file__))
+XML_FILE_56 = os.path.join(DIR, "BIOMD0000000056.xml")
+ARCHIVE_PATH = os.path.join(DIR, "test_biomodel_archive.zip")
+EXCLUDE_PATH = os.path.join(DIR, "test_biomodel_archive.csv")
+FILES = [ARCHIVE_PATH, EXCLUDE_PATH]
+EXCLUDED_NUM = 57
+
+
+#############################
+# Tests
+#############################
+class TestBiomodelArchive(unittest.TestCase):
+
+    def setUp(self):
+        self._remove()
+        with zipfile.ZipFile(ARCHIVE_PATH, "w") as myzip:
+            myzip.write(XML_FILE_56, ba.PREFIX % 56)
+            myzip.write(XML_FILE_56, ba.PREFIX % EXCLUDED_NUM)
+            myzip.writestr("README.txt", "not a model")
+        df = pd.DataFrame({"model_num": [EXCLUDED_NUM], "reason": ["test"]})
+        df.to_csv(EXCLUDE_PATH, index=False)
+        self.archive = BiomodelArchive(archive_path=ARCHIVE_PATH,
+              exclude_path=EXCLUDE_PATH)
+
+    def tearDown(self):
+        self.archive.close()
+        self._remove()
+
+    def _remove(self):
+        for ffile in FILES:
+            if os.path.isfile(ffile):
+                os.remove(ffile)
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(self.archive.exclude_set, set([EXCLUDED_NUM]))
+        self.assertIsNone(self.archive._zipfile)
+
+    def testModelNums(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(self.archive.model_nums, [56, EXCLUDED_NUM])
+
+    def testGetModelString(self):
+        if IGNORE_TEST:
+            return
+        with open(XML_FILE_56, "r") as fd:
+            expected = fd.read()
+        self.assertEqual(self.archive.getModelString(56), expected)
+        self.assertIsNone(self.archive.getModelString(EXCLUDED_NUM))
+        self.assertIsNone(self.archive.getModelBytes(1))
+
+    def testClose(self):
+        if IGNORE_TEST:
+            return
+        _ = self.archive.getModelBytes(56)
+        self.archive.close()
+        self.assertIsNone(self.archive._zipfile)
+        # Reopens as needed
+        self.assertIsNotNone(self.archive.getModelBytes(56))
+
+
+if __name__ == '__main__':
+  unittest.main()
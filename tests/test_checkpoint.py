@@ -0,0 +1,67 @@
+from SBMLModel.checkpoint import CheckpointStore
+from SBMLModel.roadrunner_state import RoadrunnerState
+
+import numpy as np
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+
+
+def makeState(time):
+    value_dct = {"floating": (np.array([0], dtype=np.int32),
+          np.array([time]))}
+    return RoadrunnerState(time, value_dct=value_dct)
+
+
+#############################
+# Tests
+#############################
+class TestCheckpointStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = CheckpointStore(max_count=3)
+
+    def testAddFind(self):
+        if IGNORE_TEST:
+            return
+        for time in [5, 1, 3]:
+            self.store.add(makeState(time))
+        self.assertEqual(self.store.times, [1, 3, 5])
+        self.assertIsNone(self.store.find(0.5))
+        self.assertEqual(self.store.find(1).time, 1)
+        self.assertEqual(self.store.find(4.9).time, 3)
+        self.assertEqual(self.store.find(100).time, 5)
+        # Replace a checkpoint
+        self.store.add(makeState(3))
+        self.assertEqual(len(self.store), 3)
+
+    def testEviction(self):
+        if IGNORE_TEST:
+            return
+        for time in [1, 2, 3]:
+            self.store.add(makeState(time))
+        _ = self.store.find(1)
+        self.store.add(makeState(4))
+        self.assertEqual(self.store.times, [1, 3, 4])
+        #
+        state_size = makeState(1).size
+        store = CheckpointStore(max_size=2*state_size)
+        for time in [1, 2, 3]:
+            store.add(makeState(time))
+        self.assertEqual(store.times, [2, 3])
+        self.assertEqual(store.size, 2*state_size)
+
+    def testClear(self):
+        if IGNORE_TEST:
+            return
+        self.store.add(makeState(1))
+        self.store.clear()
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(self.store.size, 0)
+        self.assertIsNone(self.store.find(2))
+
+
+if __name__ == '__main__':
+  unittest.main()
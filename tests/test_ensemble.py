@@ -0,0 +1,94 @@
+from SBMLModel import ensemble
+from SBMLModel.ensemble import EnsembleStatistics
+
+import numpy as np
+import tellurium as te
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: A->B; k1*A; 
+J2: B->A; k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+"""
+TIMES = np.linspace(0, 5, 11)
+SELECTIONS = ["[A]", "[B]"]
+
+
+#############################
+# Tests
+#############################
+class TestEnsembleStatistics(unittest.TestCase):
+
+    def setUp(self):
+        self.values = np.random.default_rng(0).random((50, 4, 3))
+
+    def testAdd(self):
+        if IGNORE_TEST:
+            return
+        statistics = EnsembleStatistics(probabilities=[0.1, 0.5], max_sample=50)
+        for idx in range(0, 50, 7):
+            statistics.add(self.values[idx:idx+7])
+        self.assertEqual(statistics.num_trajectory, 50)
+        self.assertTrue(np.allclose(statistics.mean, self.values.mean(axis=0)))
+        self.assertTrue(np.allclose(statistics.variance,
+              self.values.var(axis=0, ddof=1)))
+        self.assertTrue(np.allclose(statistics.quantiles,
+              np.quantile(self.values, [0.1, 0.5], axis=0)))
+
+    def testSample(self):
+        if IGNORE_TEST:
+            return
+        statistics = EnsembleStatistics(max_sample=10, rng=1)
+        statistics.add(self.values)
+        self.assertEqual(statistics.quantiles.shape, (3, 4, 3))
+        self.assertTrue(np.all(statistics.quantiles <= self.values.max(axis=0)))
+
+
+class TestEnsemble(unittest.TestCase):
+
+    def setUp(self):
+        self.roadrunner = te.loada(MODEL)
+
+    def testMakeSeeds(self):
+        if IGNORE_TEST:
+            return
+        seeds = ensemble.makeSeeds(5, seed=1)
+        self.assertEqual(len(set(seeds)), 5)
+        self.assertTrue(np.array_equal(seeds, ensemble.makeSeeds(5, seed=1)))
+        self.assertFalse(np.array_equal(seeds, ensemble.makeSeeds(5, seed=2)))
+
+    def testSimulateTrajectories(self):
+        if IGNORE_TEST:
+            return
+        values = ensemble.simulateTrajectories(self.roadrunner, [1, 2, 1],
+              TIMES, SELECTIONS)
+        self.assertEqual(values.shape, (3, 11, 2))
+        self.assertTrue(np.array_equal(values[0], values[2]))
+        # Amounts are conserved
+        self.assertTrue(np.allclose(values.sum(axis=2), 10))
+
+    def testSimulateEnsemble(self):
+        if IGNORE_TEST:
+            return
+        result = ensemble.simulateEnsemble(self.roadrunner, 20, TIMES,
+              SELECTIONS, seed=3, chunk_size=6)
+        self.assertEqual(result.values.shape, (20, 11, 2))
+        self.assertTrue(np.allclose(result.mean, result.values.mean(axis=0)))
+        self.assertEqual(result.quantiles.shape, (3, 11, 2))
+        self.assertEqual(self.roadrunner.getIntegrator().getName(), "cvode")
+        # Reproducible regardless of processes
+        other_result = ensemble.simulateEnsemble(self.roadrunner, 20, TIMES,
+              SELECTIONS, seed=3, num_process=2, is_keep=False)
+        self.assertIsNone(other_result.values)
+        self.assertTrue(np.allclose(result.mean, other_result.mean))
+        self.assertTrue(np.allclose(result.variance, other_result.variance))
+        self.assertTrue(np.allclose(result.quantiles, other_result.quantiles))
+
+
+if __name__ == '__main__':
+  unittest.main()
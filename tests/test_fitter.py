@@ -0,0 +1,116 @@
+from SBMLModel import fitter
+from SBMLModel.fitter import Fitter
+import SBMLModel as anl
+
+import lmfit
+import numpy as np
+import pickle
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: A->B; k1*A; 
+J2: B->A; k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+"""
+PARAMETER_DCT = {"k1": (0.1, 10), "k2": (0.1, 10)}
+
+
+class FailingFitter(Fitter):
+    # Fitter whose worker processes fail
+
+    def fitStarts(self, start_mat):
+        raise ValueError("Bad start")
+
+
+#############################
+# Tests
+#############################
+class TestFitter(unittest.TestCase):
+
+    def setUp(self):
+        self.model = anl.Model(MODEL)
+        self.model.set({"k1": 2, "k2": 0.5})
+        # Observations start after time 0 and have a missing value
+        self.observed_ts = anl.Timeseries(self.model.simulate(0, 5, 11).iloc[2:])
+        self.observed_ts.iloc[2, 0] = np.nan
+        self.model.set({"k1": 1, "k2": 1})
+        self.fitter = Fitter(self.model, self.observed_ts, PARAMETER_DCT)
+
+    def testMakeParameters(self):
+        if IGNORE_TEST:
+            return
+        parameters = fitter.makeParameters({"k1": (0, 10), "k2": (0, 3, 5)},
+              self.model)
+        self.assertEqual(parameters["k1"].value, 1)
+        self.assertEqual(parameters["k2"].value, 3)
+        self.assertEqual(parameters["k2"].max, 5)
+        self.assertTrue(isinstance(fitter.makeParameters(parameters,
+              self.model), lmfit.Parameters))
+
+    def testCalculateResiduals(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(self.fitter.times[0], 0)
+        self.assertEqual(self.fitter.num_residual, 17)
+        residuals = self.fitter.calculateResiduals([2, 0.5])
+        self.assertEqual(len(residuals), 17)
+        self.assertLess(np.max(np.abs(residuals)), 1e-2)
+        residuals = self.fitter.calculateResiduals([1, 1])
+        self.assertGreater(np.max(np.abs(residuals)), 1e-1)
+        # The model is not changed
+        self.assertEqual(self.model.get("k1"), 1)
+
+    def testMakeStarts(self):
+        if IGNORE_TEST:
+            return
+        start_mat = self.fitter.makeStarts(num_start=5, seed=1)
+        self.assertEqual(start_mat.shape, (5, 2))
+        self.assertTrue(np.allclose(start_mat[0], [1, 1]))
+        self.assertTrue(np.all(start_mat >= 0.1))
+        self.assertTrue(np.all(start_mat <= 10))
+        self.assertTrue(np.allclose(start_mat,
+              self.fitter.makeStarts(num_start=5, seed=1)))
+
+    def testFit(self):
+        if IGNORE_TEST:
+            return
+        result = self.fitter.fit(num_start=3, seed=1)
+        self.assertTrue(np.isclose(result.parameter_dct["k1"], 2, rtol=1e-2))
+
+    def testFitParallelFail(self):
+        if IGNORE_TEST:
+            return
+        failing_fitter = FailingFitter(self.model, self.observed_ts,
+              PARAMETER_DCT)
+        with self.assertRaisesRegex(RuntimeError, "Bad start"):
+            _ = failing_fitter.fit(num_start=4, num_process=2, seed=1)
+        self.assertTrue(np.isclose(result.parameter_dct["k2"], 0.5, rtol=1e-2))
+        self.assertEqual(result.rssq, np.nanmin(result.rssqs))
+        self.assertEqual(result.parameters["k1"].value,
+              result.parameter_dct["k1"])
+
+    def testFitParallel(self):
+        if IGNORE_TEST:
+            return
+        _ = pickle.dumps(self.fitter)
+        result = self.fitter.fit(num_start=4, num_process=2, seed=1)
+        self.assertEqual(len(result.rssqs), 4)
+        self.assertFalse(any(np.isnan(result.rssqs)))
+        self.assertTrue(np.isclose(result.parameter_dct["k1"], 2, rtol=1e-2))
+
+    def testFitParallelFail(self):
+        if IGNORE_TEST:
+            return
+        failing_fitter = FailingFitter(self.model, self.observed_ts,
+              PARAMETER_DCT)
+        with self.assertRaisesRegex(RuntimeError, "Bad start"):
+            _ = failing_fitter.fit(num_start=4, num_process=2, seed=1)
+
+
+if __name__ == '__main__':
+  unittest.main()
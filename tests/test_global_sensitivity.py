@@ -0,0 +1,101 @@
+from SBMLModel import global_sensitivity as gs
+from SBMLModel.global_sensitivity import GlobalSensitivity
+
+import numpy as np
+import tellurium as te
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+# Steady state of A is k0/k1; k2 has no effect on A
+MODEL = """
+J1: -> A; k0
+J2: A -> ; k1*A
+J3: -> B; k2
+k0 = 1; k1 = 1; k2 = 1
+A = 0; B = 0
+"""
+PARAMETER_DCT = {"k0": (1, 2), "k1": (1, 2), "k2": (1, 2)}
+TIMES = np.linspace(0, 20, 11)
+
+
+def finalA(values):
+    return values[-1, 0]
+
+def linear(values):
+    # B = k2*t, so the final value is 2*k2
+    return values[-1, 1]/10
+
+
+#############################
+# Tests
+#############################
+class TestGlobalSensitivity(unittest.TestCase):
+
+    def setUp(self):
+        self.roadrunner = te.loada(MODEL)
+        self.analyzer = GlobalSensitivity(self.roadrunner, PARAMETER_DCT,
+              TIMES, ["[A]", "[B]"], {"final_A": finalA, "final_B": linear})
+
+    def testEvaluateFeatures(self):
+        if IGNORE_TEST:
+            return
+        feature_mat = gs.evaluateFeatures(self.roadrunner,
+              np.array([0, 1, 2], dtype=np.int32), np.array([[1, 1, 1], [2, 1, 3]]), TIMES,
+              ["[A]", "[B]"], [finalA, linear])
+        self.assertTrue(np.allclose(feature_mat, [[1, 2], [2, 6]], atol=1e-4))
+
+    def testMakeSobolBlocks(self):
+        if IGNORE_TEST:
+            return
+        blocks = list(self.analyzer.makeSobolBlocks(20, block_size=8, seed=1))
+        self.assertEqual([len(b) for b in blocks], [40, 40, 20])
+        design_arr = blocks[0].reshape(8, 5, 3)
+        self.assertTrue(np.all(design_arr >= 1) and np.all(design_arr <= 2))
+        # AB_i is A with column i from B
+        self.assertTrue(np.allclose(design_arr[:, 3, [0, 2]],
+              design_arr[:, 0, [0, 2]]))
+        self.assertTrue(np.allclose(design_arr[:, 3, 1], design_arr[:, 1, 1]))
+
+    def testCalculateSobol(self):
+        if IGNORE_TEST:
+            return
+        result = self.analyzer.calculateSobol(num_sample=256, seed=1,
+              block_size=64)
+        self.assertEqual(result.first_order.shape, (2, 3))
+        self.assertEqual(result.num_sample, 256)
+        # final_A depends on k0 and k1 only; final_B on k2 only
+        self.assertLess(np.abs(result.total_order[0, 2]), 1e-6)
+        self.assertGreater(result.total_order[0, 0], 0.2)
+        self.assertTrue(np.allclose(result.first_order[1], [0, 0, 1], atol=0.05))
+        self.assertTrue(np.allclose(result.total_order[1], [0, 0, 1], atol=0.05))
+        # Same result in multiple processes
+        other_result = self.analyzer.calculateSobol(num_sample=256, seed=1,
+              block_size=64, num_process=2)
+        self.assertTrue(np.allclose(result.first_order,
+              other_result.first_order))
+
+    def testCalculateMorris(self):
+        if IGNORE_TEST:
+            return
+        orders_dct = {}
+        blocks = list(self.analyzer.makeMorrisBlocks(3, 4, orders_dct, seed=1))
+        design_arr = (blocks[0].reshape(3, 4, 3) - 1)
+        steps = np.diff(design_arr, axis=1)
+        self.assertTrue(np.allclose(steps.sum(axis=2), 2/3))
+        self.assertEqual(orders_dct[0].shape, (3, 3))
+        #
+        result = self.analyzer.calculateMorris(num_trajectory=10, seed=1,
+              block_size=4, num_process=2)
+        self.assertEqual(result.num_trajectory, 10)
+        # final_B = k2/10 at time 20 (B = k2*t)
+        self.assertTrue(np.allclose(result.mu[1], [0, 0, 2], atol=1e-3))
+        self.assertTrue(np.allclose(result.sigma[1], 0, atol=1e-3))
+        self.assertGreater(result.mu[0, 0], 0)
+        self.assertLess(result.mu[0, 1], 0)
+        self.assertTrue(np.allclose(result.mu_star[0, 2], 0, atol=1e-6))
+
+
+if __name__ == '__main__':
+  unittest.main()
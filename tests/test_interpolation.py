@@ -0,0 +1,87 @@
+from SBMLModel import interpolation
+
+import numpy as np
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+TIMES = np.array([0.0, 1.0, 2.0, 4.0])
+# Columns are t and t^2
+VALUES = np.transpose(np.array([TIMES, TIMES**2]))
+NEW_TIMES = np.array([0.0, 0.4, 1.5, 3.0, 4.0])
+
+
+#############################
+# Tests
+#############################
+class TestFunctions(unittest.TestCase):
+
+    def testLinear(self):
+        if IGNORE_TEST:
+            return
+        new_values = interpolation.interpolate(TIMES, VALUES, NEW_TIMES)
+        self.assertEqual(new_values.shape, (len(NEW_TIMES), 2))
+        self.assertTrue(np.allclose(new_values[:, 0], NEW_TIMES))
+        expected = [np.interp(NEW_TIMES, TIMES, VALUES[:, 1])]
+        self.assertTrue(np.allclose(new_values[:, 1], expected))
+
+    def testCubic(self):
+        if IGNORE_TEST:
+            return
+        new_values = interpolation.interpolate(TIMES, VALUES, NEW_TIMES,
+              method=interpolation.METHOD_CUBIC)
+        # A not-a-knot spline through 4 points is exact for polynomials
+        self.assertTrue(np.allclose(new_values[:, 0], NEW_TIMES))
+        self.assertTrue(np.allclose(new_values[:, 1], NEW_TIMES**2))
+
+    def testNearestPrevious(self):
+        if IGNORE_TEST:
+            return
+        new_values = interpolation.interpolate(TIMES, VALUES, NEW_TIMES,
+              method=interpolation.METHOD_NEAREST)
+        # Ties are the earlier time
+        self.assertTrue(np.allclose(new_values[:, 0], [0, 0, 1, 2, 4]))
+        new_values = interpolation.interpolate(TIMES, VALUES, [0.9, 3.9],
+              method=interpolation.METHOD_PREVIOUS)
+        self.assertTrue(np.allclose(new_values[:, 0], [0, 2]))
+        new_values = interpolation.interpolate(TIMES, VALUES, [0.9, 3.9],
+              method=interpolation.METHOD_NEAREST)
+        self.assertTrue(np.allclose(new_values[:, 0], [1, 4]))
+
+    def testOutside(self):
+        if IGNORE_TEST:
+            return
+        for method in interpolation.METHODS:
+            new_values = interpolation.interpolate(TIMES, VALUES, [-1, 1, 5],
+                  method=method)
+            self.assertTrue(np.all(np.isnan(new_values[[0, 2], :])))
+            self.assertTrue(np.allclose(new_values[1, :], [1, 1]))
+
+    def testStack(self):
+        if IGNORE_TEST:
+            return
+        values_arr = np.stack([VALUES, 2*VALUES, 3*VALUES])
+        for method in interpolation.METHODS:
+            new_values_arr = interpolation.interpolate(TIMES, values_arr,
+                  NEW_TIMES, method=method)
+            self.assertEqual(new_values_arr.shape, (3, len(NEW_TIMES), 2))
+            for idx in range(3):
+                expected = interpolation.interpolate(TIMES, values_arr[idx],
+                      NEW_TIMES, method=method)
+                self.assertTrue(np.allclose(new_values_arr[idx], expected))
+
+    def testErrors(self):
+        if IGNORE_TEST:
+            return
+        with self.assertRaises(ValueError):
+            _ = interpolation.interpolate(TIMES, VALUES, NEW_TIMES,
+                  method="quadratic")
+        with self.assertRaises(ValueError):
+            _ = interpolation.interpolate(TIMES[::-1], VALUES, NEW_TIMES)
+        with self.assertRaises(ValueError):
+            _ = interpolation.interpolate(TIMES[1:], VALUES, NEW_TIMES)
+
+
+if __name__ == '__main__':
+  unittest.main()
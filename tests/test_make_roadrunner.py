@@ -1,4 +1,5 @@
-from SBMLModel.make_roadrunner import makeRoadrunner
+from SBMLModel.make_roadrunner import makeRoadrunner, cloneRoadrunner,  \
+      callWithClone
 
 import os
 import unittest
@@ -64,6 +65,29 @@ class TestMakeRoadrunner(unittest.TestCase):
         rr = makeRoadrunner(model_str)
         self.assertTrue("RoadRunner" in str(type(rr)))
 
+    def testCloneRoadrunner(self):
+        if IGNORE_TEST:
+            return
+        rr = makeRoadrunner(LINEAR_MDL)
+        rr.simulate(0, 2, 10)
+        new_rr = cloneRoadrunner(rr)
+        self.assertEqual(new_rr.model.getTime(), rr.model.getTime())
+        self.assertEqual(new_rr["S1"], rr["S1"])
+        new_rr["S1"] = 100
+        self.assertNotEqual(new_rr["S1"], rr["S1"])
+
+    def testCallWithClone(self):
+        if IGNORE_TEST:
+            return
+        rr = makeRoadrunner(LINEAR_MDL)
+        def getValue(roadrunner, name=None, scale=1):
+            roadrunner[name] = scale*roadrunner[name]
+            return roadrunner[name]
+        #
+        value = callWithClone("S1", function=getValue, argument_name="name",
+              state=rr.saveStateS(), scale=2)
+        self.assertEqual(value, 2*rr["S1"])
+
 
 
 if __name__ == '__main__':
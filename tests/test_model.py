@@ -1,14 +1,23 @@
 import SBMLModel.constants as cn
 import SBMLModel as anl
 import SBMLModel.model as mdl
+from SBMLModel import biomodel_archive
+from SBMLModel import parallel
+from SBMLModel.result_cache import ResultCache
 from SBMLModel import rpickle
 from SBMLModel import util
 
+import asyncio
+import concurrent.futures
 import os
 import pandas as pd
 import numpy as np
+import roadrunner
+import subprocess
+import sys
 import tellurium as te
 import unittest
+import zipfile
 
 
 IGNORE_TEST = False
@@ -26,7 +35,12 @@ A=10; B=0;
 MODEL_RR = te.loada(MODEL)
 DIR = os.path.dirname(os.path.abspath(__file__))
 TEST_FILE1 = os.path.join(DIR, "test_model_serializer.pcl")
-FILES = [TEST_FILE1]
+ARCHIVE_PATH = os.path.join(DIR, "test_model_archive.zip")
+XML_FILE_56 = os.path.join(DIR, "BIOMD0000000056.xml")
+FILES = [TEST_FILE1, ARCHIVE_PATH]
+
+def getNumSpecies(model):
+    return len(model.species_names)
         
 
 #############################
@@ -56,6 +70,18 @@ class TestModel(unittest.TestCase):
             reaction_name = "J%d" % idx
             self.assertTrue(parameter_name in self.model.kinetic_dct[reaction_name])
 
+    def testLazyMetadata(self):
+        if IGNORE_TEST:
+            return
+        model = anl.Model(self.model_reference)
+        self.assertEqual(len(model._metadata_dct), 0)
+        _ = model.simulate(0, 5, 10)
+        self.assertEqual(len(model._metadata_dct), 0)
+        self.assertEqual(model.species_names, ["A", "B"])
+        self.assertEqual(list(model._metadata_dct.keys()), ["species_names"])
+        self.assertTrue("k1" in model.kinetic_dct["J1"])
+        self.assertTrue(model.antimony is model.antimony)
+
     def testGet(self):
         if IGNORE_TEST:
             return
@@ -80,6 +106,25 @@ class TestModel(unittest.TestCase):
         A_5 = self.model.get("A")
         self.assertGreater(A_0, A_5)
 
+    def testSetTimeCheckpoint(self):
+        if IGNORE_TEST:
+            return
+        model = anl.Model(self.model_reference)
+        model.setTime(2)
+        self.assertEqual(model._checkpoint_store.times, [2])
+        model.setTime(4)
+        self.assertEqual(model._checkpoint_store.times, [2, 4])
+        self.assertEqual(model.getTime(), 4)
+        A_4 = model.get("A")
+        model.setTime(3)
+        self.assertEqual(model.getTime(), 3)
+        new_model = anl.Model(self.model_reference)
+        new_model.setTime(4)
+        self.assertTrue(np.isclose(A_4, new_model.get("A")))
+        # Changing a value invalidates checkpoints
+        model.set({"k1": 2})
+        self.assertEqual(len(model._checkpoint_store), 0)
+
     def testSimulate(self):
         if IGNORE_TEST:
             return
@@ -95,6 +140,238 @@ class TestModel(unittest.TestCase):
         expected = 1/12*1/len(diff_df)
         self.assertLess(np.abs(variance - expected), 0.01)
 
+    def testSimulateVariables(self):
+        if IGNORE_TEST:
+            return
+        ts = self.model.simulate(0, 5, 11, variables=["B", "J1", "k1"])
+        self.assertEqual(list(ts.columns), ["B", "J1", "k1"])
+        self.assertEqual(len(ts), 11)
+        full_ts = self.model.simulate(0, 5, 11)
+        self.assertEqual(list(full_ts.columns), ["A", "B"])
+        self.assertTrue(np.allclose(full_ts["B"].values, ts["B"].values))
+        #
+        result = self.model.simulateReplicates(0, 5, 11, num_replicate=2,
+              variables=["A"])
+        self.assertEqual(result.values.shape, (2, 11, 1))
+
+    def testSimulateResultCache(self):
+        if IGNORE_TEST:
+            return
+        self.model.result_cache = ResultCache()
+        ts1 = self.model.simulate(0, 5, 11)
+        self.model.setTime(0)
+        ts2 = self.model.simulate(0, 5, 11)
+        self.assertEqual(self.model.result_cache.num_hit, 1)
+        self.assertTrue(ts1.equals(ts2))
+        self.assertEqual(self.model.getTime(), 5)
+        self.assertTrue(np.isclose(self.model.get("A"), ts1["A"].values[-1]))
+        # Changed values are simulated
+        self.model.set({"k1": 2})
+        ts3 = self.model.simulate(0, 5, 11)
+        self.assertEqual(self.model.result_cache.num_miss, 2)
+        self.assertFalse(ts1.equals(ts3))
+        # Copies share the cache
+        model = self.model.copy()
+        _ = model.simulate(0, 5, 11)
+        self.assertEqual(self.model.result_cache.num_hit, 2)
+        # Noise is added to cached results
+        noise_ts = self.model.simulate(0, 5, 11, noise_mag=0.1)
+        self.assertEqual(self.model.result_cache.num_hit, 3)
+        self.assertFalse(noise_ts.equals(ts3))
+
+    def testSimulateReplicates(self):
+        if IGNORE_TEST:
+            return
+        num_replicate = 100
+        ts = self.model.simulate(0, 20, 50)
+        result = self.model.simulateReplicates(0, 20, 50,
+              num_replicate=num_replicate, noise_mag=0.1, rng=2)
+        self.assertEqual(result.values.shape, (num_replicate, 50, 2))
+        self.assertEqual(result.names, ["A", "B"])
+        diff_arr = result.values - ts.values
+        self.assertLessEqual(np.max(np.abs(diff_arr)), 0.05)
+        noise_ts = self.model.simulate(0, 20, 50, noise_mag=0.1, rng=2)
+        self.assertTrue(np.allclose(noise_ts.values, result.values[0]))
+
+    def testSimulateContinue(self):
+        if IGNORE_TEST:
+            return
+        self.model.setTime(5)
+        A_5 = self.model.get("A")
+        ts = self.model.simulate(5, 10, 6, is_continue=True)
+        self.assertTrue(np.isclose(ts["A"].values[0], A_5))
+        self.assertEqual(self.model.getTime(), 10)
+
+    def testContinueSimulation(self):
+        if IGNORE_TEST:
+            return
+        ts1 = self.model.continueSimulation(5, 10)
+        self.assertEqual(len(ts1), 10)
+        self.assertEqual(ts1.times[0], 0.5)
+        ts2 = self.model.continueSimulation(5, 10, ts=ts1)
+        self.assertEqual(len(ts2), 20)
+        self.assertTrue(isinstance(ts2, anl.Timeseries))
+        self.assertEqual(ts2.times[-1], 10)
+        full_ts = self.model.simulate(0, 10, 21)
+        self.assertTrue(np.allclose(full_ts.values[1:], ts2.values, atol=1e-4))
+
+    def testIterateSimulation(self):
+        if IGNORE_TEST:
+            return
+        tss = list(self.model.iterateSimulation(12, 5, 10))
+        self.assertEqual([len(t) for t in tss], [10, 10, 4])
+        self.assertEqual(tss[-1].times[-1], 12)
+        self.assertEqual(self.model.getTime(), 12)
+
+    def testIterateSimulationGrid(self):
+        if IGNORE_TEST:
+            return
+        # Continued runs have the index of a single simulation
+        tss = list(self.model.iterateSimulation(1.0, 0.3, 3))
+        index = pd.concat(tss).index
+        full_ts = self.model.simulate(0, 1, 11)
+        self.assertEqual(list(index), list(full_ts.index[1:]))
+        self.model.setTime(0)
+        ts = None
+        for _ in range(10):
+            ts = self.model.continueSimulation(0.1, 1, ts=ts)
+        self.assertEqual(list(ts.index), list(full_ts.index[1:]))
+        aligned_ts, _ = ts.align(full_ts)
+        self.assertEqual(len(aligned_ts), 10)
+
+    def testSimulateBatch(self):
+        if IGNORE_TEST:
+            return
+        parameter_df = pd.DataFrame({"k1": [1, 2, 3]})
+        times = np.linspace(0, 5, 11)
+        result = self.model.simulateBatch(parameter_df, times,
+              selections=["B", "J1"])
+        self.assertEqual(result.values.shape, (3, 11, 2))
+        self.assertEqual(result.names, ["B", "J1"])
+        self.assertFalse(any(result.is_failed))
+        self.model.set({"k1": 3})
+        ts = self.model.simulate(0, 5, 11)
+        self.assertTrue(np.allclose(ts["B"].values, result.values[2, :, 0]))
+        #
+        result = self.model.simulateBatch(np.array([[1, 2], [2, 1]]), times)
+        self.assertEqual(result.names, ["A", "B"])
+        self.assertEqual(result.parameter_names, ["k1", "k2"])
+
+    def testAsimulate(self):
+        if IGNORE_TEST:
+            return
+        async def main():
+            return await asyncio.gather(self.model.asimulate(0, 5, 11),
+                  self.model.asimulate(0, 5, 11, variables=["B"]))
+        #
+        ts1, ts2 = asyncio.run(main())
+        self.assertTrue(ts1.equals(self.model.simulate(0, 5, 11)))
+        self.assertEqual(list(ts2.columns), ["B"])
+
+    def testThreadSafe(self):
+        if IGNORE_TEST:
+            return
+        self.assertFalse(self.model.is_thread_safe)
+        self.model.is_thread_safe = True
+        expected_ts = self.model.simulate(0, 5, 11)
+        def simulate(_):
+            return self.model.simulate(0, 5, 11)
+        #
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            tss = list(executor.map(simulate, range(8)))
+            for ts in tss:
+                self.assertTrue(ts.equals(expected_ts))
+            # Values set are used by all threads
+            self.model.set({"k1": 2})
+            tss = list(executor.map(simulate, range(8)))
+            ks = list(executor.map(lambda _: self.model.get("k1"), range(4)))
+        first_ts = expected_ts
+        expected_ts = self.model.simulate(0, 5, 11)
+        self.assertFalse(expected_ts.equals(first_ts))
+        for ts in tss:
+            self.assertTrue(ts.equals(expected_ts))
+        self.assertEqual(ks, [2]*4)
+        # Times are specific to a thread
+        self.model.setTime(3)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            self.assertEqual(executor.submit(self.model.getTime).result(), 0)
+        self.assertEqual(self.model.getTime(), 3)
+        # Copies are thread safe
+        model = self.model.copy()
+        self.assertTrue(model.is_thread_safe)
+        self.assertEqual(model.get("k1"), 2)
+        self.assertEqual(model.getTime(), 3)
+        #
+        self.model.is_thread_safe = False
+        self.assertEqual(self.model.get("k1"), 2)
+
+    def testSimulateEnsemble(self):
+        if IGNORE_TEST:
+            return
+        result = self.model.simulateEnsemble(0, 5, 11, 10, seed=1,
+              variables=["B"])
+        self.assertEqual(result.values.shape, (10, 11, 1))
+        self.assertEqual(result.names, ["B"])
+        self.assertEqual(result.mean.shape, (11, 1))
+        # Stochastic mean approximates the deterministic result
+        ts = self.model.simulate(0, 5, 11)
+        self.assertLess(np.abs(result.mean[-1, 0] - ts["B"].values[-1]), 3)
+
+    def testFit(self):
+        if IGNORE_TEST:
+            return
+        self.model.set({"k1": 3})
+        observed_ts = self.model.simulate(0, 5, 11)
+        self.model.set({"k1": 1})
+        result = self.model.fit(observed_ts, {"k1": (0.1, 10)})
+        self.assertTrue(np.isclose(result.parameter_dct["k1"], 3, rtol=1e-2))
+        self.assertEqual(self.model.get("k1"), 1)
+
+    def testCalculateSensitivities(self):
+        if IGNORE_TEST:
+            return
+        result = self.model.calculateSensitivities(0, 5, 11,
+              parameter_names=["k1"], variables=["A", "J1"])
+        self.assertEqual(result.values.shape, (11, 2, 1))
+        self.assertEqual(result.names, ["A", "J1"])
+        self.assertEqual(result.method, "finite_difference")
+        self.assertTrue(np.all(result.values[1:, 0, 0] < 0))
+
+    def testMakeGlobalSensitivity(self):
+        if IGNORE_TEST:
+            return
+        analyzer = self.model.makeGlobalSensitivity({"k1": (0.5, 2)},
+              {"final_B": lambda v: v[-1, 0]}, 0, 5, 11, variables=["B"])
+        result = analyzer.calculateMorris(num_trajectory=4, seed=1)
+        self.assertEqual(result.mu.shape, (1, 1))
+        self.assertGreater(result.mu[0, 0], 0)
+
+    def testSteadyStateBatch(self):
+        if IGNORE_TEST:
+            return
+        parameter_df = pd.DataFrame({"k1": [1, 3, 2]})
+        result = self.model.steadyStateBatch(parameter_df)
+        self.assertEqual(result.values.shape, (3, 2))
+        self.assertTrue(all(result.is_converged))
+        self.assertEqual(list(result.order), [0, 2, 1])
+        # A*k1 = B*k2 and A + B = 10
+        self.assertTrue(np.allclose(result.values[1], [2.5, 7.5]))
+        self.assertEqual(self.model.get("k1"), 1)
+
+    def testSimulateSimulationResult(self):
+        if IGNORE_TEST:
+            return
+        ts = self.model.simulate(0, 5, 11)
+        result = self.model.simulate(0, 5, 11, is_simulation_result=True)
+        self.assertTrue(isinstance(result, anl.SimulationResult))
+        self.assertTrue(result.toTimeseries().equals(ts))
+        result = self.model.simulate(0, 5, 11, is_simulation_result=True,
+              variables=["B"])
+        self.assertEqual(result.columns, ["B"])
+        result = self.model.simulate(0, 5, 11, is_simulation_result=True,
+              noise_mag=1, rng=1)
+        self.assertEqual(result.shape, (11, 2))
+
     def testRpSerialize(self):
         if IGNORE_TEST:
             return
@@ -119,6 +396,24 @@ class TestModel(unittest.TestCase):
             return
         model = self.model.copy()
         self.assertTrue(model.isEqual(self.model))
+        #
+        self.model.set({"k1": 2})
+        self.model.setTime(3)
+        model = self.model.copy()
+        self.assertEqual(model.getTime(), self.model.getTime())
+        self.assertEqual(model.get("k1"), 2)
+        self.assertEqual(model.get("A"), self.model.get("A"))
+        # Copies are independent
+        model.set({"k2": 5})
+        self.assertEqual(self.model.get("k2"), 1)
+        self.assertFalse(model.roadrunner is self.model.roadrunner)
+
+    def testCopySerialized(self):
+        if IGNORE_TEST:
+            return
+        self.model.setTime(3)
+        model = self.model._copySerialized()
+        self.assertTrue(model.isEqual(self.model))
 
     def testSerializeDeserialize(self):
         if IGNORE_TEST:
@@ -130,6 +425,55 @@ class TestModel(unittest.TestCase):
             new_model = rpickle.load(fd)
         self.assertTrue(model.isEqual(new_model))
 
+    def testSerializeState(self):
+        if IGNORE_TEST:
+            return
+        self.model.set({"k1": 2})
+        self.model.setTime(3)
+        self.model.is_serialize_state = True
+        dct = dict(self.model.__dict__)
+        self.model.rpSerialize(dct)
+        self.assertTrue(mdl.ROADRUNNER_STATE in dct[mdl.DESERIALIZATION_DCT])
+        with open(TEST_FILE1, "wb") as fd:
+            rpickle.dump(self.model, fd)
+        with open(TEST_FILE1, "rb") as fd:
+            new_model = rpickle.load(fd)
+        self.assertTrue(new_model.isEqual(self.model))
+        self.assertEqual(new_model.get("k1"), 2)
+        self.assertEqual(new_model.get("A"), self.model.get("A"))
+        self.assertFalse(mdl.ROADRUNNER_STATE in new_model.deserialization_dct)
+        # Incompatible state uses the antimony model
+        self.assertIsNone(mdl.Model._restoreRoadrunner(b"bad state",
+              "0.0.0", 3))
+        self.assertIsNone(mdl.Model._restoreRoadrunner(b"bad state",
+              roadrunner.__version__, 3))
+
+    def testSerializeStateNewProcess(self):
+        if IGNORE_TEST:
+            return
+        self.model.is_serialize_state = True
+        with open(TEST_FILE1, "wb") as fd:
+            rpickle.dump(self.model, fd)
+        # Only SBMLModel is imported in the new process
+        program = "\n".join([
+              "from SBMLModel import rpickle",
+              "with open(%s, 'rb') as fd:" % repr(TEST_FILE1),
+              "    model = rpickle.load(fd)",
+              "print(sorted(model.species_names))",
+              "print(sorted(model.kinetic_dct.keys()))",
+              ])
+        project_dir = os.path.dirname(DIR)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join([project_dir,
+              env.get("PYTHONPATH", "")])
+        process = subprocess.run([sys.executable, "-c", program], env=env,
+              capture_output=True, text=True, timeout=300)
+        self.assertEqual(process.returncode, 0, process.stderr)
+        lines = process.stdout.strip().split("\n")
+        self.assertEqual(lines[-2], str(sorted(self.model.species_names)))
+        self.assertEqual(lines[-1],
+              str(sorted(self.model.kinetic_dct.keys())))
+
     def testGetBiomodel(self):
         if IGNORE_TEST:
             return
@@ -152,6 +496,26 @@ class TestModel(unittest.TestCase):
         test(1, 1)
         test(2000, 0)
 
+    def testIterateBiomodelsParallel(self):
+        if IGNORE_TEST:
+            return
+        with zipfile.ZipFile(ARCHIVE_PATH, "w") as myzip:
+            myzip.write(XML_FILE_56, biomodel_archive.PREFIX % 56)
+        default_archive = biomodel_archive._DEFAULT_ARCHIVE
+        biomodel_archive._DEFAULT_ARCHIVE = biomodel_archive.BiomodelArchive(
+              archive_path=ARCHIVE_PATH, exclude_path=None)
+        try:
+            results = list(anl.Model.iterateBiomodelsParallel(start_num=55,
+                  num_model=3, function=getNumSpecies, num_process=2,
+                  is_ordered=True))
+        finally:
+            biomodel_archive._DEFAULT_ARCHIVE.close()
+            biomodel_archive._DEFAULT_ARCHIVE = default_archive
+        self.assertEqual([r.argument for r in results], [55, 56, 57])
+        self.assertEqual(results[0].status, parallel.STATUS_SKIPPED)
+        self.assertEqual(results[1].status, parallel.STATUS_OK)
+        self.assertGreater(results[1].value, 0)
+
     def testCalculateStds(self):
         if IGNORE_TEST:
             return
@@ -0,0 +1,64 @@
+from SBMLModel import noise
+
+import numpy as np
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+NUM_TIME = 50
+NUM_REPLICATE = 200
+VALUES = np.reshape(np.array(range(2*NUM_TIME), dtype=float) + 1, (NUM_TIME, 2))
+
+
+#############################
+# Tests
+#############################
+class TestFunctions(unittest.TestCase):
+
+    def testGetRandomGenerator(self):
+        if IGNORE_TEST:
+            return
+        self.assertTrue(noise.getRandomGenerator() is np.random)
+        generator = np.random.default_rng(3)
+        self.assertTrue(noise.getRandomGenerator(generator) is generator)
+        values1 = noise.getRandomGenerator(3).random(5)
+        values2 = noise.getRandomGenerator(3).random(5)
+        self.assertTrue(np.allclose(values1, values2))
+
+    def testMakeNoisyReplicatesUniform(self):
+        if IGNORE_TEST:
+            return
+        arr = noise.makeNoisyReplicates(VALUES, num_replicate=NUM_REPLICATE,
+              noise_mag=2, std_arr=[1, 10], rng=1)
+        self.assertEqual(arr.shape, (NUM_REPLICATE, NUM_TIME, 2))
+        diff_arr = arr - VALUES
+        self.assertLessEqual(np.max(np.abs(diff_arr[:, :, 0])), 1)
+        self.assertLessEqual(np.max(np.abs(diff_arr[:, :, 1])), 10)
+        self.assertGreater(np.max(np.abs(diff_arr[:, :, 1])), 1)
+        # Reproducible with a seed
+        arr2 = noise.makeNoisyReplicates(VALUES, num_replicate=NUM_REPLICATE,
+              noise_mag=2, std_arr=[1, 10], rng=1)
+        self.assertTrue(np.allclose(arr, arr2))
+
+    def testMakeNoisyReplicatesGaussian(self):
+        if IGNORE_TEST:
+            return
+        arr = noise.makeNoisyReplicates(VALUES, num_replicate=NUM_REPLICATE,
+              noise_mag=0.5, noise_model=noise.NOISE_GAUSSIAN, rng=1)
+        std = np.std(arr - VALUES)
+        self.assertLess(np.abs(std - 0.5), 0.05)
+
+    def testMakeNoisyReplicatesMultiplicative(self):
+        if IGNORE_TEST:
+            return
+        arr = noise.makeNoisyReplicates(VALUES, num_replicate=NUM_REPLICATE,
+              noise_mag=0.1, noise_model=noise.NOISE_MULTIPLICATIVE, rng=1)
+        std = np.std(arr/VALUES)
+        self.assertLess(np.abs(std - 0.1), 0.01)
+        with self.assertRaises(ValueError):
+            _ = noise.makeNoisyReplicates(VALUES, noise_model="bad")
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,73 @@
+from SBMLModel import parallel
+
+import time
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+SLEEP_TIME = 10
+
+
+def square(value):
+    if value < 0:
+        raise ValueError("Negative value.")
+    if value == SLEEP_TIME:
+        time.sleep(SLEEP_TIME)
+    return value*value
+
+def unpicklable(value):
+    return lambda: value
+
+
+#############################
+# Tests
+#############################
+class TestFunctions(unittest.TestCase):
+
+    def testGetNumProcess(self):
+        if IGNORE_TEST:
+            return
+        self.assertGreaterEqual(parallel.getNumProcess(), 1)
+        self.assertEqual(parallel.getNumProcess(0), 1)
+        self.assertEqual(parallel.getNumProcess(3), 3)
+
+    def testRunTasks(self):
+        if IGNORE_TEST:
+            return
+        arguments = list(range(6))
+        results = list(parallel.runTasks(square, arguments, num_process=3))
+        self.assertEqual(len(results), len(arguments))
+        for result in results:
+            self.assertEqual(result.status, parallel.STATUS_OK)
+            self.assertEqual(result.value, result.argument**2)
+
+    def testRunTasksOrdered(self):
+        if IGNORE_TEST:
+            return
+        arguments = [5, 4, 3, 2, 1]
+        results = list(parallel.runTasks(square, arguments, num_process=5,
+              is_ordered=True))
+        self.assertEqual([r.argument for r in results], arguments)
+        self.assertEqual([r.index for r in results], list(range(5)))
+
+    def testRunTasksFailures(self):
+        if IGNORE_TEST:
+            return
+        arguments = [1, -1, SLEEP_TIME]
+        start_time = time.time()
+        results = list(parallel.runTasks(square, arguments, num_process=3,
+              timeout=1, is_ordered=True))
+        self.assertLess(time.time() - start_time, SLEEP_TIME)
+        statuses = [r.status for r in results]
+        self.assertEqual(statuses, [parallel.STATUS_OK, parallel.STATUS_ERROR,
+              parallel.STATUS_TIMEOUT])
+        self.assertTrue("Negative" in results[1].error)
+        self.assertIsNone(results[2].value)
+        #
+        results = list(parallel.runTasks(unpicklable, [1], num_process=1))
+        self.assertEqual(results[0].status, parallel.STATUS_ERROR)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,95 @@
+from SBMLModel.result_cache import ResultCache
+from SBMLModel import result_cache as rc
+from SBMLModel.roadrunner_state import RoadrunnerState
+from SBMLModel.timeseries import Timeseries
+
+import numpy as np
+import os
+import pandas as pd
+import shutil
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(DIR, "test_result_cache")
+SIZE = 10
+TS = Timeseries(pd.DataFrame({"a": range(SIZE)}),
+      times=[1.0*n for n in range(SIZE)])
+STATE = RoadrunnerState(9.0, value_dct={"floating":
+      (np.array([0], dtype=np.int32), np.array([9.0]))})
+
+
+#############################
+# Tests
+#############################
+class TestFunctions(unittest.TestCase):
+
+    def testMakeKey(self):
+        if IGNORE_TEST:
+            return
+        key1 = rc.makeKey("a", 1, np.array([1, 2]))
+        key2 = rc.makeKey("a", 1, np.array([1.0, 2.0]))
+        key3 = rc.makeKey("a", 1, np.array([1, 3]))
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(key1, key3)
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self._remove()
+        self.cache = ResultCache()
+
+    def tearDown(self):
+        self._remove()
+
+    def _remove(self):
+        if os.path.isdir(CACHE_DIR):
+            shutil.rmtree(CACHE_DIR)
+
+    def testGetPut(self):
+        if IGNORE_TEST:
+            return
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.num_miss, 1)
+        self.cache.put("a", TS, STATE)
+        ts, state = self.cache.get("a")
+        self.assertEqual(self.cache.num_hit, 1)
+        self.assertTrue(isinstance(ts, Timeseries))
+        self.assertTrue(ts.equals(TS))
+        self.assertEqual(state.time, STATE.time)
+        # Changes to a result do not change the cache
+        ts["a"] = 0
+        ts, _ = self.cache.get("a")
+        self.assertTrue(ts.equals(TS))
+
+    def testEviction(self):
+        if IGNORE_TEST:
+            return
+        self.cache.put("a", TS, STATE)
+        entry_size = self.cache.size
+        self.cache.max_size = 2*entry_size
+        self.cache.put("b", TS, STATE)
+        _ = self.cache.get("a")
+        self.cache.put("c", TS, STATE)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+
+    def testDirectory(self):
+        if IGNORE_TEST:
+            return
+        cache = ResultCache(directory=CACHE_DIR)
+        cache.put("a", TS, STATE)
+        new_cache = ResultCache(directory=CACHE_DIR)
+        ts, _ = new_cache.get("a")
+        self.assertTrue(ts.equals(TS))
+        self.assertEqual(len(new_cache), 1)
+        new_cache.clear()
+        self.assertEqual(len(os.listdir(CACHE_DIR)), 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
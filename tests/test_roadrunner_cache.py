@@ -0,0 +1,147 @@
+from SBMLModel import roadrunner_cache as rc
+from SBMLModel.make_roadrunner import makeRoadrunner
+
+import os
+import shutil
+import unittest
+import tellurium as te
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(DIR, "test_roadrunner_cache")
+MODEL = """
+J1: A->B; k1*A; 
+J2: B->A; k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+"""
+MODEL_RR = te.loada(MODEL)
+
+
+#############################
+# Tests
+#############################
+class TestFunctions(unittest.TestCase):
+
+    def testNormalizeModelString(self):
+        if IGNORE_TEST:
+            return
+        model_str = "\r\n".join(["  ", "A -> B; k1*A  ", "", "k1 = 1"])
+        self.assertEqual(rc.normalizeModelString(model_str),
+              "A -> B; k1*A\nk1 = 1")
+
+
+class TestRoadrunnerCache(unittest.TestCase):
+
+    def setUp(self):
+        self._remove()
+        self.cache = rc.RoadrunnerCache(directory=CACHE_DIR)
+
+    def tearDown(self):
+        self._remove()
+
+    def _remove(self):
+        if os.path.isdir(CACHE_DIR):
+            shutil.rmtree(CACHE_DIR)
+
+    def testMakeKey(self):
+        if IGNORE_TEST:
+            return
+        key1 = self.cache.makeKey(MODEL, kind="ant")
+        key2 = self.cache.makeKey(MODEL + "\n\n", kind="ant")
+        key3 = self.cache.makeKey(MODEL, kind="xml")
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(key1, key3)
+
+    def testGetPut(self):
+        if IGNORE_TEST:
+            return
+        key = self.cache.makeKey(MODEL)
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self.cache.num_miss, 1)
+        self.cache.put(key, MODEL_RR)
+        rr = self.cache.get(key)
+        self.assertEqual(self.cache.num_hit, 1)
+        self.assertTrue("RoadRunner" in str(type(rr)))
+        self.assertEqual(rr["k1"], MODEL_RR["k1"])
+        self.assertEqual(rr.getFloatingSpeciesIds(),
+              MODEL_RR.getFloatingSpeciesIds())
+
+    def testDisabled(self):
+        if IGNORE_TEST:
+            return
+        cache = rc.RoadrunnerCache(directory=CACHE_DIR, is_enabled=False)
+        key = cache.makeKey(MODEL)
+        cache.put(key, MODEL_RR)
+        self.assertIsNone(cache.get(key))
+        self.assertFalse(os.path.isdir(CACHE_DIR))
+
+    def testEvict(self):
+        if IGNORE_TEST:
+            return
+        keys = [self.cache.makeKey(MODEL + "# %d" % n) for n in range(3)]
+        for key in keys:
+            self.cache.put(key, MODEL_RR)
+        entry_size = self.cache.size/len(keys)
+        # Make the first entry the most recently used
+        os.utime(self.cache._makePath(keys[0]), (0, 0))
+        os.utime(self.cache._makePath(keys[1]), (1, 1))
+        self.cache.max_size = 2*entry_size
+        self.cache.evict()
+        self.assertIsNone(self.cache.get(keys[0]))
+        self.assertIsNotNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+    def testCorruptedEntry(self):
+        if IGNORE_TEST:
+            return
+        key = self.cache.makeKey(MODEL)
+        self.cache.put(key, MODEL_RR)
+        with open(self.cache._makePath(key), "wb") as fd:
+            fd.write(b"not a state")
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(os.path.isfile(self.cache._makePath(key)))
+
+    def testMakeRoadrunner(self):
+        if IGNORE_TEST:
+            return
+        rr1 = makeRoadrunner(MODEL, cache=self.cache)
+        self.assertEqual(self.cache.num_miss, 1)
+        rr2 = makeRoadrunner(MODEL, cache=self.cache)
+        self.assertEqual(self.cache.num_hit, 1)
+        data1 = rr1.simulate(0, 5, 10)
+        data2 = rr2.simulate(0, 5, 10)
+        self.assertTrue((data1 == data2).all())
+
+    def testUnwritableDirectory(self):
+        if IGNORE_TEST:
+            return
+        # The parent of the cache directory is a file
+        os.makedirs(CACHE_DIR)
+        parent_path = os.path.join(CACHE_DIR, "file")
+        with open(parent_path, "w") as fd:
+            fd.write("")
+        cache = rc.RoadrunnerCache(directory=os.path.join(parent_path, "cache"))
+        with self.assertWarns(UserWarning):
+            roadrunner = makeRoadrunner(MODEL, cache=cache)
+        self.assertEqual(roadrunner["k1"], 1)
+        self.assertEqual(roadrunner.simulate(0, 5, 10).shape, (10, 3))
+        with self.assertWarns(UserWarning):
+            self.assertIsNone(cache.get(cache.makeKey(MODEL, kind="ant")))
+        cache.evict()
+
+    def testClear(self):
+        if IGNORE_TEST:
+            return
+        _ = makeRoadrunner(MODEL, cache=self.cache)
+        self.assertGreater(self.cache.size, 0)
+        self.cache.clear()
+        self.assertEqual(self.cache.size, 0)
+        self.assertEqual(self.cache.num_miss, 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,79 @@
+from SBMLModel.roadrunner_pool import RoadrunnerPool
+import SBMLModel as anl
+
+import unittest
+import tellurium as te
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: A->B; k1*A; 
+J2: B->A; k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+"""
+MODEL2 = MODEL + "k3 = 3\n"
+MODEL3 = MODEL + "k4 = 4\n"
+
+
+#############################
+# Tests
+#############################
+class TestRoadrunnerPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = RoadrunnerPool(max_size=2)
+
+    def testCheckout(self):
+        if IGNORE_TEST:
+            return
+        rr1 = self.pool.checkout(MODEL)
+        self.assertEqual(self.pool.num_miss, 1)
+        self.assertTrue(MODEL in self.pool)
+        rr2 = self.pool.checkout(MODEL)
+        self.assertEqual(self.pool.num_hit, 1)
+        self.assertTrue("RoadRunner" in str(type(rr2)))
+        # Checked out roadrunners are independent
+        rr1["k1"] = 5
+        self.assertEqual(rr2["k1"], 1)
+        rr3 = self.pool.checkout(MODEL)
+        self.assertEqual(rr3["k1"], 1)
+        rr2.simulate(0, 5, 10)
+        self.assertEqual(rr3.model.getTime(), 0)
+
+    def testNotPooled(self):
+        if IGNORE_TEST:
+            return
+        rr = te.loada(MODEL)
+        self.assertTrue(self.pool.checkout(rr) is rr)
+        self.assertEqual(len(self.pool), 0)
+        pool = RoadrunnerPool(is_enabled=False)
+        _ = pool.checkout(MODEL)
+        self.assertEqual(len(pool), 0)
+
+    def testEviction(self):
+        if IGNORE_TEST:
+            return
+        for model in [MODEL, MODEL2, MODEL3]:
+            _ = self.pool.checkout(model)
+        self.assertEqual(len(self.pool), 2)
+        self.assertFalse(MODEL in self.pool)
+        self.assertTrue(MODEL3 in self.pool)
+        self.pool.clear()
+        self.assertEqual(len(self.pool), 0)
+
+    def testModel(self):
+        if IGNORE_TEST:
+            return
+        model1 = anl.Model(MODEL, pool=self.pool)
+        model2 = anl.Model(MODEL, pool=self.pool)
+        self.assertEqual(self.pool.num_hit, 1)
+        self.assertTrue(model1.isEqual(model2))
+        model1.set({"k1": 3})
+        self.assertEqual(model2.get("k1"), 1)
+
+
+if __name__ == '__main__':
+  unittest.main()
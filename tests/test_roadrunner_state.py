@@ -0,0 +1,68 @@
+from SBMLModel.roadrunner_state import RoadrunnerState
+from SBMLModel import roadrunner_state as rs
+
+import numpy as np
+import unittest
+import tellurium as te
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: A->B; k1*A; 
+J2: B->A; k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+C := 2*A
+"""
+EVENT_MODEL = """
+J1: A->B; k1*A; 
+k1 = 1
+A=10; B=0;
+E1: at time > 2: k1 = 5
+"""
+
+
+#############################
+# Tests
+#############################
+class TestRoadrunnerState(unittest.TestCase):
+
+    def setUp(self):
+        self.roadrunner = te.loada(MODEL)
+
+    def check(self, roadrunner, time, end_time=5):
+        roadrunner.simulate(0, time)
+        state = RoadrunnerState.capture(roadrunner)
+        self.assertEqual(state.time, time)
+        self.assertGreater(state.size, 0)
+        roadrunner.reset()
+        state.restore(roadrunner)
+        self.assertEqual(roadrunner.model.getTime(), time)
+        data1 = roadrunner.simulate(time, end_time, 3)
+        roadrunner.reset()
+        data2 = roadrunner.simulate(0, end_time, 3)
+        self.assertTrue(np.allclose(data1[-1, :], data2[-1, :], atol=1e-5))
+        return state
+
+    def testMakeIndexDct(self):
+        if IGNORE_TEST:
+            return
+        index_dct = RoadrunnerState.makeIndexDct(self.roadrunner)
+        self.assertEqual(list(index_dct[rs.FLOATING]), [0, 1])
+        # C is defined by an assignment rule
+        self.assertEqual(len(index_dct[rs.PARAMETER]), 2)
+        self.assertIsNone(RoadrunnerState.makeIndexDct(te.loada(EVENT_MODEL)))
+
+    def testCaptureRestore(self):
+        if IGNORE_TEST:
+            return
+        state = self.check(self.roadrunner, 2)
+        self.assertIsNone(state.saved_state)
+        state = self.check(te.loada(EVENT_MODEL), 3)
+        self.assertIsNotNone(state.saved_state)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,88 @@
+from SBMLModel.roadrunner_threads import RoadrunnerThreads
+
+import concurrent.futures
+import numpy as np
+import tellurium as te
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: A->B; k1*A; 
+J2: B->A; k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+"""
+
+
+def runInThread(function):
+    # Runs a function in a new thread and provides its value
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(function).result()
+
+
+#############################
+# Tests
+#############################
+class TestRoadrunnerThreads(unittest.TestCase):
+
+    def setUp(self):
+        self.template = te.loada(MODEL)
+        self.threads = RoadrunnerThreads(self.template)
+
+    def testGetRoadrunner(self):
+        if IGNORE_TEST:
+            return
+        rr1 = self.threads.getRoadrunner()
+        self.assertTrue(rr1 is self.threads.getRoadrunner())
+        self.assertFalse(rr1 is self.template)
+        rr2 = runInThread(self.threads.getRoadrunner)
+        self.assertFalse(rr1 is rr2)
+        self.assertEqual(self.threads.num_clone, 2)
+        # Clones preserve the time of the template
+        self.template.simulate(0, 2)
+        threads = RoadrunnerThreads(self.template)
+        self.assertEqual(threads.getRoadrunner().model.getTime(), 2)
+
+    def testSet(self):
+        if IGNORE_TEST:
+            return
+        rr = self.threads.getRoadrunner()
+        self.threads.getCheckpointStore().max_count = 5
+        self.threads.set({"k1": 3})
+        self.assertEqual(self.template["k1"], 3)
+        # Values are applied when the roadrunner is next used
+        self.assertEqual(rr["k1"], 1)
+        self.assertEqual(self.threads.getRoadrunner()["k1"], 3)
+        self.assertEqual(runInThread(
+              lambda: self.threads.getRoadrunner()["k1"]), 3)
+        # Values are applied in order
+        self.threads.set({"k1": 4})
+        self.threads.set({"k1": 5, "k2": 2})
+        self.assertEqual(self.threads.getRoadrunner()["k1"], 5)
+        self.assertEqual(self.threads.getRoadrunner()["k2"], 2)
+        # Only the latest value of a name is kept
+        self.assertEqual(self.threads.version, 3)
+        self.assertEqual(self.threads._value_dct, {"k1": 5, "k2": 2})
+        self.assertEqual(self.threads._version_dct, {"k1": 3, "k2": 3})
+
+    def testConcurrentSimulate(self):
+        if IGNORE_TEST:
+            return
+        expected_arr = np.array(te.loada(MODEL).simulate(0, 5, 51))
+        def simulate(_):
+            roadrunner = self.threads.getRoadrunner()
+            roadrunner.reset()
+            return np.array(roadrunner.simulate(0, 5, 51))
+        #
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            arrs = list(executor.map(simulate, range(20)))
+        for arr in arrs:
+            self.assertTrue(np.allclose(arr, expected_arr))
+        self.assertLessEqual(self.threads.num_clone, 4)
+
+
+if __name__ == '__main__':
+  unittest.main()
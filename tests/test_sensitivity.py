@@ -0,0 +1,92 @@
+from SBMLModel import sensitivity
+
+import numpy as np
+import tellurium as te
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: A->B; k1*A; 
+J2: B->A; k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+"""
+MODEL_VOLUME = """
+compartment c = 2
+species A in c, B in c
+J1: A->B; c*k1*A; 
+J2: B->A; c*k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+"""
+TIMES = np.linspace(0, 5, 11)
+SELECTIONS = ["[A]", "[B]"]
+PARAMETER_NAMES = ["k1", "k2"]
+
+
+#############################
+# Tests
+#############################
+class TestSensitivity(unittest.TestCase):
+
+    def setUp(self):
+        self.roadrunner = te.loada(MODEL)
+
+    def testMakeSteps(self):
+        if IGNORE_TEST:
+            return
+        steps = sensitivity.makeSteps([0, 1, -100], relative_step=0.01,
+              absolute_step=1e-4)
+        self.assertTrue(np.allclose(steps, [1e-4, 0.01, 1]))
+
+    def testIsRoadrunnerSupported(self):
+        if IGNORE_TEST:
+            return
+        self.assertTrue(sensitivity.isRoadrunnerSupported(self.roadrunner,
+              SELECTIONS))
+        self.assertFalse(sensitivity.isRoadrunnerSupported(self.roadrunner,
+              ["J1"]))
+        self.assertFalse(sensitivity.isRoadrunnerSupported(
+              te.loada(MODEL_VOLUME), SELECTIONS))
+
+    def testCalculateSensitivities(self):
+        if IGNORE_TEST:
+            return
+        rr_arr, method = sensitivity.calculateSensitivities(self.roadrunner,
+              PARAMETER_NAMES, TIMES, SELECTIONS)
+        self.assertEqual(method, sensitivity.METHOD_ROADRUNNER)
+        self.assertEqual(rr_arr.shape, (11, 2, 2))
+        # Repeated calculations are the same
+        other_arr, _ = sensitivity.calculateSensitivities(self.roadrunner,
+              PARAMETER_NAMES, TIMES, SELECTIONS)
+        self.assertTrue(np.allclose(rr_arr, other_arr))
+        for is_central in [True, False]:
+            fd_arr, method = sensitivity.calculateSensitivities(
+                  self.roadrunner, PARAMETER_NAMES, TIMES, SELECTIONS,
+                  method=sensitivity.METHOD_FINITE_DIFFERENCE,
+                  is_central=is_central)
+            self.assertEqual(method, sensitivity.METHOD_FINITE_DIFFERENCE)
+            self.assertTrue(np.allclose(fd_arr, rr_arr, atol=2e-2))
+        # Amounts are conserved
+        self.assertTrue(np.allclose(fd_arr.sum(axis=1), 0, atol=1e-2))
+        self.assertEqual(self.roadrunner["k1"], 1)
+
+    def testCalculateSensitivitiesVolume(self):
+        if IGNORE_TEST:
+            return
+        roadrunner = te.loada(MODEL_VOLUME)
+        fd_arr, method = sensitivity.calculateSensitivities(roadrunner,
+              ["k1"], TIMES, SELECTIONS, num_process=2)
+        self.assertEqual(method, sensitivity.METHOD_FINITE_DIFFERENCE)
+        # Concentrations have the dynamics of the unit volume model
+        expected_arr, _ = sensitivity.calculateSensitivities(self.roadrunner,
+              ["k1"], TIMES, SELECTIONS)
+        self.assertTrue(np.allclose(fd_arr, expected_arr, atol=2e-2))
+
+
+if __name__ == '__main__':
+  unittest.main()
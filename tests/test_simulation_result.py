@@ -0,0 +1,93 @@
+from SBMLModel.simulation_result import SimulationResult
+from SBMLModel.timeseries import Timeseries
+
+import numpy as np
+import tellurium as te
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: A->B; k1*A; 
+J2: B->A; k2*B; 
+k1 = 1
+k2 = 1
+A=10; B=0;
+"""
+
+
+#############################
+# Tests
+#############################
+class TestSimulationResult(unittest.TestCase):
+
+    def setUp(self):
+        self.data = te.loada(MODEL).simulate(0, 5, 11)
+        self.result = SimulationResult.fromNamedArray(self.data)
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(self.result.columns, ["A", "B"])
+        self.assertEqual(self.result.shape, (11, 2))
+        self.assertEqual(len(self.result), 11)
+        self.assertTrue(np.allclose(self.result.times, np.linspace(0, 5, 11)))
+        self.assertFalse(hasattr(self.result, "__dict__"))
+        with self.assertRaises(ValueError):
+            _ = SimulationResult(np.zeros((2, 2)), [0, 1, 2], ["A", "B"])
+
+    def testFromNamedArray(self):
+        if IGNORE_TEST:
+            return
+        # The values are not copied
+        self.assertTrue(np.shares_memory(self.result.values, self.data))
+        self.data[0, 1] = 100
+        self.assertEqual(self.result["A"][0], 100)
+        self.assertFalse(self.result.values.flags.c_contiguous)
+        # Copy into a contiguous array
+        result = SimulationResult.fromNamedArray(self.data, is_contiguous=True)
+        self.assertTrue(result.values.flags.c_contiguous)
+        self.assertFalse(np.shares_memory(result.values, self.data))
+        self.assertTrue(np.array_equal(result.values, self.result.values))
+
+    def testGetitem(self):
+        if IGNORE_TEST:
+            return
+        self.assertTrue(np.allclose(self.result["B"], self.data[:, 2]))
+        result = self.result[["B"]]
+        self.assertEqual(result.columns, ["B"])
+        self.assertTrue("A" in self.result)
+        self.assertFalse("A" in result)
+
+    def testToNamedArray(self):
+        if IGNORE_TEST:
+            return
+        data = self.result.toNamedArray()
+        self.assertEqual(list(data.colnames), ["time", "A", "B"])
+        self.assertTrue(np.allclose(data, self.data))
+        result = SimulationResult.fromNamedArray(data)
+        self.assertTrue(np.allclose(result.values, self.result.values))
+
+    def testTimeseries(self):
+        if IGNORE_TEST:
+            return
+        ts = self.result.toTimeseries()
+        self.assertTrue(isinstance(ts, Timeseries))
+        self.assertTrue(ts.equals(Timeseries(self.data)))
+        self.assertTrue(np.shares_memory(ts.values, self.data))
+        result = SimulationResult.fromTimeseries(ts)
+        self.assertTrue(np.shares_memory(result.values, self.data))
+        self.assertTrue(np.allclose(result.times, self.result.times))
+        self.assertEqual(result.columns, self.result.columns)
+
+    def testCopy(self):
+        if IGNORE_TEST:
+            return
+        result = self.result.copy()
+        self.assertFalse(np.shares_memory(result.values, self.data))
+        self.assertTrue(np.allclose(result.values, self.result.values))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,98 @@
+from SBMLModel import batch
+from SBMLModel import steady_state
+
+import numpy as np
+import tellurium as te
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+MODEL = """
+J1: -> A; k0
+J2: A -> B; k1*A
+J3: B -> ; k2*B
+k0 = 1; k1 = 2; k2 = 4
+A = 0; B = 0
+"""
+# No steady state
+MODEL_UNBOUNDED = """
+J1: -> A; k0
+k0 = 1; A = 0
+"""
+# A parameter sets an initial value and so the conserved total
+MODEL_INITIAL = """
+J1: A -> B; k1*A
+J2: B -> A; k2*B
+k1 = 1; k2 = 1
+A0 = 10
+A = A0; B = 0
+"""
+
+
+#############################
+# Tests
+#############################
+class TestSteadyState(unittest.TestCase):
+
+    def setUp(self):
+        self.roadrunner = te.loada(MODEL)
+        self.parameter_mat = np.array([[1, 2], [4, 2], [1.1, 2], [4, 2.1]])
+        self.parameter_indices = batch.getParameterIndices(self.roadrunner,
+              ["k0", "k1"])
+
+    def testOrderParameterSets(self):
+        if IGNORE_TEST:
+            return
+        order = steady_state.orderParameterSets(self.parameter_mat)
+        self.assertEqual(list(order), [0, 2, 1, 3])
+        self.assertEqual(len(steady_state.orderParameterSets(
+              np.empty((0, 2)))), 0)
+
+    def testSolveSteadyStates(self):
+        if IGNORE_TEST:
+            return
+        for is_warm_start in [True, False]:
+            values, is_converged, residuals, methods, order =  \
+                  steady_state.solveSteadyStates(self.roadrunner,
+                  self.parameter_indices, self.parameter_mat, ["A", "B"],
+                  is_warm_start=is_warm_start)
+            self.assertTrue(all(is_converged))
+            self.assertTrue(all(m == steady_state.METHOD_SOLVER
+                  for m in methods))
+            self.assertTrue(np.all(residuals < 1e-6))
+            # A = k0/k1, B = k0/k2
+            expected_mat = np.array([self.parameter_mat[:, 0]
+                  /self.parameter_mat[:, 1], self.parameter_mat[:, 0]/4]).T
+            self.assertTrue(np.allclose(values, expected_mat))
+
+    def testWarmStartInitialValues(self):
+        if IGNORE_TEST:
+            return
+        roadrunner = te.loada(MODEL_INITIAL)
+        parameter_indices = batch.getParameterIndices(roadrunner, ["A0"])
+        parameter_mat = np.array([[10], [20], [11]])
+        for is_warm_start in [True, False]:
+            values, is_converged, _, _, _ = steady_state.solveSteadyStates(
+                  roadrunner, parameter_indices, parameter_mat, ["A", "B"],
+                  is_warm_start=is_warm_start)
+            self.assertTrue(all(is_converged))
+            expected_mat = np.array([[5, 5], [10, 10], [5.5, 5.5]])
+            self.assertTrue(np.allclose(values, expected_mat))
+
+    def testNotConverged(self):
+        if IGNORE_TEST:
+            return
+        roadrunner = te.loada(MODEL_UNBOUNDED)
+        parameter_indices = batch.getParameterIndices(roadrunner, ["k0"])
+        values, is_converged, residuals, methods, _ =  \
+              steady_state.solveSteadyStates(roadrunner, parameter_indices,
+              np.array([[1], [0]]), ["A"], integration_time=10)
+        self.assertEqual(list(is_converged), [False, True])
+        self.assertTrue(np.isnan(values[0, 0]))
+        self.assertEqual(methods[0], steady_state.METHOD_NONE)
+        self.assertEqual(values[1, 0], 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
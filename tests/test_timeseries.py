@@ -1,9 +1,11 @@
-from SBMLModel.timeseries import Timeseries, TimeseriesSer
+from SBMLModel.timeseries import Timeseries, TimeseriesSer, Aligner
+from SBMLModel import timeseries
 import SBMLModel.constants as cn
 
 import numpy as np
 import os
 import pandas as pd
+import shutil
 import unittest
 import tellurium as te
 
@@ -15,6 +17,7 @@ if IS_PLOT:
     matplotlib.use('TkAgg')
 DIR = os.path.dirname(os.path.abspath(__file__))
 FILE_CSV = os.path.join(DIR, "test_timeseries.csv")
+SAVE_DIR = os.path.join(DIR, "test_timeseries_save")
 EFFECTOR_DCT = {"J0": "E_J0"}
 END_TIME = 5
 COLUMNS = ["[a]", "b"]
@@ -53,6 +56,15 @@ class TestTimeseries(unittest.TestCase):
     def remove(self):
        if os.path.isfile(FILE_CSV):
            os.remove(FILE_CSV)
+       if os.path.isdir(SAVE_DIR):
+           shutil.rmtree(SAVE_DIR)
+
+    def _isMemmap(self, arr):
+        while arr is not None:
+            if isinstance(arr, np.memmap):
+                return True
+            arr = arr.base
+        return False
 
     def _validate(self, ts):
         self.assertGreater(len(ts), 0)
@@ -104,6 +116,19 @@ class TestTimeseries(unittest.TestCase):
         ts.columns = columns
         self._validate(ts)
 
+    def testConstructorNamedArrayView(self):
+        if IGNORE_TEST:
+          return
+        data = te.loada(LINEAR_MDL).simulate(0, 5, 11)
+        ts = Timeseries(data)
+        # Values are a view of the simulation data
+        self.assertTrue(np.shares_memory(ts.values, data))
+        self.assertTrue(np.allclose(ts.values, data[:, 1:]))
+        self.assertTrue(np.allclose(ts.times, data[:, 0]))
+        # Times are provided separately
+        ts = Timeseries(data, times=np.array(data[:, 0]))
+        self.assertEqual(len(ts.columns), len(data.colnames))
+
     def testConstructorDFTimeColumn(self):
         if IGNORE_TEST:
           return
@@ -180,6 +205,102 @@ class TestTimeseries(unittest.TestCase):
         ts2 = TimeseriesSer(TS["a"].drop(index=[2000]))
         test(ts1, ts2)
 
+    def testFindCommonPositions(self):
+        if IGNORE_TEST:
+          return
+        common_arr, positions1, positions2 = timeseries.findCommonPositions(
+              [3, 1, 2, 5], [5, 0, 1, 3])
+        self.assertEqual(list(common_arr), [1, 3, 5])
+        self.assertEqual(list(positions1), [1, 0, 3])
+        self.assertEqual(list(positions2), [2, 3, 0])
+        self.assertEqual(timeseries.findCommonIndices([3, 1, 2], [2, 3]), [2, 3])
+        # Duplicates
+        common_arr, positions1, positions2 = timeseries.findCommonPositions(
+              [1, 2, 1, 3], [3, 1])
+        self.assertEqual(list(common_arr), [1, 3])
+        self.assertEqual(list(positions1), [0, 2, 3])
+        self.assertEqual(list(positions2), [1, 0])
+        _, positions1, _ = timeseries.findCommonPositions([1, 2], [3])
+        self.assertEqual(len(positions1), 0)
+
+    def testAligner(self):
+        if IGNORE_TEST:
+          return
+        aligner = Aligner()
+        ts1 = Timeseries(TS.drop(index=[1000]))
+        ts2 = Timeseries(TS.drop(index=[2000]))
+        expected_ts1, expected_ts2 = ts1.align(ts2)
+        for _ in range(3):
+            new_ts1, new_ts2 = aligner.align(ts1, ts2)
+            self.assertTrue(new_ts1.equals(expected_ts1))
+            self.assertTrue(new_ts2.equals(expected_ts2))
+        self.assertEqual(aligner.num_miss, 1)
+        self.assertEqual(aligner.num_hit, 2)
+        # Different indices
+        new_ts1, _ = aligner.align(TS, ts2)
+        self.assertEqual(len(new_ts1), len(ts2))
+        self.assertEqual(aligner.num_miss, 2)
+
+
+    def testResample(self):
+        if IGNORE_TEST:
+          return
+        ts = Timeseries(NAMED_ARRAY)
+        times = np.linspace(0.05, 4.85, 7)
+        new_ts = ts.resample(times)
+        self.assertTrue(isinstance(new_ts, Timeseries))
+        self.assertEqual(list(new_ts.columns), list(ts.columns))
+        # Index is in integer ms
+        self.assertTrue(np.allclose(new_ts.times, times, atol=1e-3))
+        expected = np.interp(times, ts.times, ts["S1"].values)
+        self.assertTrue(np.allclose(new_ts["S1"].values, expected))
+        # Cubic interpolation is closer to the simulation at the new times
+        data = te.loada(LINEAR_MDL).simulate(0, 5, 101)
+        actual_ts = Timeseries(data).resample(times, method="nearest")
+        errors = [np.abs(ts.resample(times, method=m) - actual_ts).values.max()
+              for m in ["linear", "cubic"]]
+        self.assertLess(errors[1], errors[0])
+
+    def testResampleBatch(self):
+        if IGNORE_TEST:
+          return
+        ts = Timeseries(NAMED_ARRAY)
+        tss = [ts, 2*ts]
+        times = np.linspace(0, 6, 13)
+        new_tss = Timeseries.resampleBatch(tss, times, method="cubic")
+        self.assertEqual(len(new_tss), 2)
+        for old_ts, new_ts in zip(tss, new_tss):
+            expected_ts = Timeseries(old_ts).resample(times, method="cubic")
+            self.assertTrue(new_ts.equals(expected_ts))
+        self.assertTrue(np.all(np.isnan(new_tss[0].values[-1])))
+        with self.assertRaises(ValueError):
+            _ = Timeseries.resampleBatch([ts, TS], times)
+
+    def testSaveLoad(self):
+        if IGNORE_TEST:
+          return
+        ts = Timeseries(NAMED_ARRAY)
+        ts.save(SAVE_DIR)
+        for is_memmap in [True, False]:
+            new_ts = Timeseries.load(SAVE_DIR, is_memmap=is_memmap)
+            self.assertTrue(isinstance(new_ts, Timeseries))
+            self.assertTrue(new_ts.equals(ts))
+            self.assertEqual(new_ts.index.name, cn.TIMESERIES_INDEX_NAME)
+            self.assertEqual(self._isMemmap(new_ts.values), is_memmap)
+        # Changes are not written to the file
+        new_ts = Timeseries.load(SAVE_DIR)
+        new_ts.iloc[0, 0] = -1
+        self.assertTrue(Timeseries.load(SAVE_DIR).equals(ts))
+        # Column subset
+        new_ts = Timeseries.load(SAVE_DIR, columns=["S3", "S1"])
+        self.assertEqual(list(new_ts.columns), ["S3", "S1"])
+        self.assertTrue(new_ts.equals(ts[["S3", "S1"]]))
+        with self.assertRaises(ValueError):
+            _ = Timeseries.load(SAVE_DIR, columns=["S1", "S9"])
+        # The loaded index is not rebuilt from a list
+        new_ts = Timeseries.load(SAVE_DIR)
+        self.assertTrue(Timeseries._convertTime(new_ts.index) is new_ts.index)
+        self.assertEqual(new_ts.index.dtype, np.int64)
 
 if __name__ == '__main__':
   unittest.main()